@@ -0,0 +1,119 @@
+# benchmarks/changed_lines.py
+
+"""
+Diff-scoped check benchmark: a full project scan vs only the links on changed lines.
+
+Commits --files Markdown files with --links-per-file unique links each, then edits
+--changed-files of them the way a typical PR does (one link added, one line rewritten)
+and runs both tools. Every URL check sleeps for --latency to stand in for the network,
+hosts resolve offline, and the status cache is cleared before each call:
+
+  project  - check_markdown_links_project (every link in every file)
+  changed  - check_markdown_links_changed against the commit (links on changed lines)
+
+Usage:
+    PYTHONPATH=src python benchmarks/changed_lines.py --files 2000 --changed-files 3
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from mcp_server import server
+from mcp_server.tools.status_cache import STATUS_CACHE
+
+FILES_PER_DIR = 100
+
+
+def _page(i: int, links_per_file: int, edited: bool = False) -> str:
+    links = [f"- [ref](https://example.com/{i}/{j})" for j in range(links_per_file)]
+    if edited:
+        links[0] = f"- [ref, reworded](https://example.com/{i}/0)"
+        links.append(f"- [new](https://example.com/{i}/new)")
+    return f"# Page {i}\n\n" + "\n".join(links) + "\n"
+
+
+def _build_checkout(root: Path, files: int, links_per_file: int, changed_files: int):
+    for i in range(files):
+        directory = root / "docs" / f"section_{i // FILES_PER_DIR:04d}"
+        if i % FILES_PER_DIR == 0:
+            directory.mkdir(parents=True)
+        (directory / f"page_{i:06d}.md").write_text(_page(i, links_per_file), encoding="utf-8")
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    subprocess.run(["git", "-C", str(root), "add", "-A"], check=True)
+    subprocess.run(["git", "-C", str(root), "-c", "user.name=Bench", "-c", "user.email=bench@example.com",
+                    "commit", "-q", "-m", "docs"], check=True)
+    for i in range(0, files, max(1, files // changed_files))[:changed_files]:
+        path = root / "docs" / f"section_{i // FILES_PER_DIR:04d}" / f"page_{i:06d}.md"
+        path.write_text(_page(i, links_per_file, edited=True), encoding="utf-8")
+
+
+async def _offline_getaddrinfo(host: str) -> list[tuple[int, str]]:
+    return [(socket.AF_INET, "127.0.0.1")]
+
+
+async def _call(root: Path, name: str, arguments: dict, latency: float) -> int:
+    """Runs the tool; returns the number of URL checks it made."""
+    checks = 0
+
+    async def check_status(session, url):
+        nonlocal checks
+        checks += 1
+        await asyncio.sleep(latency)
+        return ("OK", None)
+
+    STATUS_CACHE.clear()
+    with patch.object(server, "PROJECT_ROOT", root), \
+            patch("mcp_server.tools.resolver._system_getaddrinfo", _offline_getaddrinfo), \
+            patch("mcp_server.tools.link_checker._check_link_status", side_effect=check_status):
+        await server.handle_call_tool(name, arguments)
+    return checks
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Diff-scoped check benchmark.")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--links-per-file", type=int, default=5)
+    parser.add_argument("--changed-files", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Seconds each simulated URL check takes.")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", dest="json_out", default=None)
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    report: dict = {"files": args.files, "links_per_file": args.links_per_file,
+                    "changed_files": args.changed_files, "latency": args.latency}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _build_checkout(root, args.files, args.links_per_file, args.changed_files)
+        for name, tool, arguments in (("project", "check_markdown_links_project", {}),
+                                      ("changed", "check_markdown_links_changed", {"base_ref": "HEAD"})):
+            timings, checks = [], 0
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                checks = asyncio.run(_call(root, tool, arguments, args.latency))
+                timings.append(time.perf_counter() - start)
+            report[name] = {"median_seconds": round(statistics.median(timings), 4), "url_checks": checks}
+
+    print(f"{args.files} files, {args.links_per_file} links each, {args.changed_files} edited, "
+          f"{args.latency}s per URL, median of {args.rounds} rounds:")
+    for name in ("project", "changed"):
+        print(f"  {name:<8} {report[name]['median_seconds']:>8.3f} s  {report[name]['url_checks']:>7} URL checks")
+    report["speedup"] = round(report["project"]["median_seconds"] / report["changed"]["median_seconds"], 1)
+    print(f"  speedup  {report['speedup']}x")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
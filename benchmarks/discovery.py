@@ -0,0 +1,91 @@
+# benchmarks/discovery.py
+
+"""
+Project discovery benchmark: walking the tree with .gitignore matching vs `git ls-files`.
+
+Builds a git checkout with --files tracked Markdown files, plus an ignored dependency
+directory (node_modules style) holding --ignored-files more, which the walker still has
+to descend into. Both paths go through server._iter_project_files:
+
+  walk  - rglob + pathspec matching of the root .gitignore (the fallback outside git)
+  git   - git ls-files of tracked and untracked, not ignored, *.md files
+
+Usage:
+    PYTHONPATH=src python benchmarks/discovery.py --files 10000 --ignored-files 50000
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from mcp_server import server
+
+FILES_PER_DIR = 100
+
+
+def _write_files(root: Path, count: int):
+    for i in range(count):
+        directory = root / f"section_{i // FILES_PER_DIR:04d}"
+        if i % FILES_PER_DIR == 0:
+            directory.mkdir(parents=True)
+        (directory / f"page_{i:06d}.md").write_text("# Page\n", encoding="utf-8")
+
+
+def _build_checkout(root: Path, files: int, ignored_files: int):
+    (root / ".gitignore").write_text("node_modules/\n", encoding="utf-8")
+    _write_files(root / "docs", files)
+    _write_files(root / "node_modules", ignored_files)
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    subprocess.run(["git", "-C", str(root), "add", "-A"], check=True)
+
+
+def _timed(discover) -> tuple[float, int]:
+    start = time.perf_counter()
+    found = len(discover())
+    return time.perf_counter() - start, found
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Project discovery benchmark.")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--ignored-files", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", dest="json_out", default=None)
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    report: dict = {"files": args.files, "ignored_files": args.ignored_files}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _build_checkout(root, args.files, args.ignored_files)
+
+        def walk():
+            with patch.object(server, "_git_markdown_files", lambda *a: None):
+                return list(server._iter_project_files(root))
+
+        def git():
+            return list(server._iter_project_files(root))
+
+        for name, discover in (("walk", walk), ("git", git)):
+            runs = [_timed(discover) for _ in range(args.rounds)]
+            assert all(found == args.files for _, found in runs), runs
+            report[name] = {"median_seconds": round(statistics.median(t for t, _ in runs), 4)}
+
+    print(f"{args.files} tracked files, {args.ignored_files} ignored, median of {args.rounds} rounds:")
+    for name in ("walk", "git"):
+        print(f"  {name:<5} {report[name]['median_seconds'] * 1000:>9.1f} ms")
+    report["speedup"] = round(report["walk"]["median_seconds"] / report["git"]["median_seconds"], 1)
+    print(f"  speedup {report['speedup']}x")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/file_loading.py
+
+"""
+File loading benchmark: per-file aiofiles reads vs the batched BulkLoader.
+
+Writes a tree of small Markdown files (plus a few large ones) and loads all of them with
+MAX_CONCURRENT_FILES consumers, the way a project scan does:
+
+  aiofiles  - aiofiles.open(...).read() per file, as _check_single_file did before
+  bulk      - tools/file_loader.BulkLoader, batched blocking reads on its own pool, run
+              as the read stage of tools/pipeline.run_file_pipeline
+
+Only reading and UTF-8 decoding are measured, not link checking. Files are read once
+before timing, so both paths are served from the page cache.
+
+Usage:
+    PYTHONPATH=src python benchmarks/file_loading.py --files 10000 --rounds 3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import aiofiles
+
+from mcp_server.server import MAX_CONCURRENT_FILES
+from mcp_server.tools.file_loader import current_loader
+from mcp_server.tools.pipeline import run_file_pipeline
+
+FILES_PER_DIR = 100
+
+
+def _build_tree(root: Path, file_count: int, file_bytes: int, large_files: int) -> list[Path]:
+    paths = []
+    line = "Some text with a [link](https://example.com/page) in it.\n"
+    body = "# Page\n\n" + line * max(1, file_bytes // len(line))
+    for i in range(file_count):
+        directory = root / f"section_{i // FILES_PER_DIR:04d}"
+        if i % FILES_PER_DIR == 0:
+            directory.mkdir()
+        path = directory / f"page_{i:06d}.md"
+        path.write_text(body, encoding="utf-8")
+        paths.append(path)
+    for i in range(large_files):
+        path = root / f"large_{i}.md"
+        path.write_text(body * 1000, encoding="utf-8")
+        paths.insert(len(paths) * (i + 1) // (large_files + 1), path)
+    return paths
+
+
+async def _consume(paths: list[Path], load) -> int:
+    """Loads paths with MAX_CONCURRENT_FILES workers taking files in order; returns total chars."""
+    pending = iter(paths)
+    total = 0
+
+    async def worker():
+        nonlocal total
+        for path in pending:
+            text = await load(path)
+            total += len(text)
+
+    await asyncio.gather(*(worker() for _ in range(MAX_CONCURRENT_FILES)))
+    return total
+
+
+async def _load_aiofiles(paths: list[Path]) -> int:
+    async def load(path: Path) -> str:
+        async with aiofiles.open(path, encoding="utf-8") as f:
+            return await f.read()
+    return await _consume(paths, load)
+
+
+async def _load_bulk(paths: list[Path]) -> int:
+    total = 0
+
+    async def load(path: Path) -> dict:
+        nonlocal total
+        loaded = current_loader().take(path)
+        if loaded is not None:
+            text = loaded.text()
+        else:  # Deferred large file, read by the "checker" itself
+            async with aiofiles.open(path, encoding="utf-8") as f:
+                text = await f.read()
+        total += len(text)
+        return {}
+
+    await run_file_pipeline(lambda cancelled: paths, load, workers=MAX_CONCURRENT_FILES, preload=True)
+    return total
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="File loading benchmark.")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--file-bytes", type=int, default=2048)
+    parser.add_argument("--large-files", type=int, default=4,
+                        help="Files of ~1000x --file-bytes mixed into the tree.")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", dest="json_out", default=None)
+    args = parser.parse_args(argv)
+
+    report: dict = {"files": args.files, "file_bytes": args.file_bytes, "large_files": args.large_files}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _build_tree(Path(tmp), args.files, args.file_bytes, args.large_files)
+        expected = asyncio.run(_load_aiofiles(paths))  # Warms the page cache
+        for name, load in (("aiofiles", _load_aiofiles), ("bulk", _load_bulk)):
+            timings = []
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                assert asyncio.run(load(paths)) == expected
+                timings.append(time.perf_counter() - start)
+            report[name] = {"median_seconds": round(statistics.median(timings), 4),
+                            "files_per_second": round(len(paths) / statistics.median(timings))}
+
+    print(f"{len(paths)} files ({args.large_files} large), median of {args.rounds} rounds:")
+    for name in ("aiofiles", "bulk"):
+        print(f"  {name:<9} {report[name]['median_seconds']:>8.3f} s  "
+              f"{report[name]['files_per_second']:>8} files/s")
+    report["speedup"] = round(report["aiofiles"]["median_seconds"] / report["bulk"]["median_seconds"], 1)
+    print(f"  speedup   {report['speedup']}x")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# benchmarks/memory_scaling.py
+
+"""
+Memory scaling benchmark for project scans.
+
+Generates synthetic Markdown trees (1k, 10k and 100k files by default) and runs
+`check_markdown_links_project` against each one, recording the tracemalloc peak
+and process RSS for every stage:
+
+  discover    - _iter_project_files (rglob + .gitignore filtering)
+  read_parse  - reading every file and extracting its links, nothing retained
+  scan        - the full tool call, including report formatting
+
+Timings are inflated by tracemalloc; pass --no-tracemalloc to record RSS only
+(recommended for the 100k tree). By default the network (DNS included) is replaced
+with an instant OK so only the scan path is measured; `--network local` checks against a local `http.server` subprocess instead.
+Compare the numbers against the budget in docs/performance/memory_budget.md.
+
+Usage:
+    PYTHONPATH=src python benchmarks/memory_scaling.py --sizes 1000 10000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from mcp_server import server
+from mcp_server.tools import link_checker, resolver
+
+FILES_PER_DIR = 100
+
+# --- Synthetic tree ---
+
+
+def _build_tree(root: Path, file_count: int, links_per_file: int, unique_urls: int, base_url: str):
+    """Writes file_count Markdown files; links are drawn from a shared pool like real docs."""
+    (root / ".gitignore").write_text("ignored/\n", encoding="utf-8")
+    for i in range(file_count):
+        directory = root / "docs" / f"section_{i // FILES_PER_DIR:05d}"
+        if i % FILES_PER_DIR == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        body = [f"# Page {i}", "", "Some introductory text for this page.", ""]
+        for j in range(links_per_file):
+            url_id = (i * links_per_file + j) % unique_urls
+            body.append(f"- See [reference {j}]({base_url}/ref/{url_id}) for details.")
+        (directory / f"page_{i:06d}.md").write_text("\n".join(body) + "\n", encoding="utf-8")
+
+# --- Measurement helpers ---
+
+
+def _read_proc_kb(field: str) -> int | None:
+    """Reads a kB field (VmRSS, VmHWM) from /proc/self/status (Linux only)."""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def _reset_hwm():
+    """Resets the kernel's RSS high-water mark so VmHWM is per stage (best effort)."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="utf-8") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+class _Stage:
+    """Context manager recording tracemalloc peak, RSS high-water mark and wall time."""
+
+    def __init__(self, name: str, results: dict):
+        self.name = name
+        self.results = results
+
+    def __enter__(self):
+        self.base = 0
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self.base, _ = tracemalloc.get_traced_memory()
+        _reset_hwm()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        py_peak_kb = None
+        if tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            py_peak_kb = round((peak - self.base) / 1024)
+        self.results[self.name] = {
+            "seconds": round(time.perf_counter() - self.start, 3),
+            "py_peak_kb": py_peak_kb,
+            "rss_hwm_kb": _read_proc_kb("VmHWM"),
+        }
+        return False
+
+# --- Stages ---
+
+
+async def _read_and_parse_all(files: list[Path]):
+    """Mirrors the scan's per-file working set without checking or retaining anything."""
+    pending = iter(files)
+
+    async def worker():
+        for path in pending:
+            content = path.read_text(encoding="utf-8")
+            link_checker._extract_links(content)
+
+    await asyncio.gather(*(worker() for _ in range(min(server.MAX_CONCURRENT_FILES, len(files)))))
+
+
+async def _measure(root: Path) -> dict:
+    stages: dict = {}
+    server.PROJECT_ROOT = root
+
+    with _Stage("discover", stages):
+        files = list(server._iter_project_files(root))
+    file_count = len(files)
+    del files
+
+    files = list(server._iter_project_files(root))
+    with _Stage("read_parse", stages):
+        await _read_and_parse_all(files)
+    del files
+
+    with _Stage("scan", stages):
+        result = await server.handle_call_tool("check_markdown_links_project", {})
+        report_chars = len(result[0].text)
+        del result
+
+    return {"files": file_count, "report_chars": report_chars, "stages": stages}
+
+
+async def _instant_ok(session, url, **kwargs):
+    return ("OK", None)
+
+
+async def _offline_getaddrinfo(host: str) -> list[tuple[int, str]]:
+    return [(socket.AF_INET, "127.0.0.1")]
+
+
+def _start_local_http() -> tuple[subprocess.Popen, str]:
+    """Starts `python -m http.server` on a free port; every /ref/* path answers 404."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    return proc, f"http://127.0.0.1:{port}"
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Project scan memory scaling benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--links-per-file", type=int, default=5)
+    parser.add_argument("--unique-urls", type=int, default=2000)
+    parser.add_argument("--network", choices=["none", "local"], default="none")
+    parser.add_argument("--no-tracemalloc", action="store_true",
+                        help="Only record RSS; tracemalloc slows parsing ~20x, use this for 100k files.")
+    parser.add_argument("--json", dest="json_out", default=None)
+    args = parser.parse_args(argv)
+
+    # Per-file/per-link logging would dominate both time and memory at these sizes
+    logging.disable(logging.WARNING)
+    http_proc = None
+    base_url = "https://example.com"
+    if args.network == "none":
+        # Hosts are pre-resolved before any check; keep DNS off the network too
+        resolver._system_getaddrinfo = _offline_getaddrinfo
+        link_checker._check_link_status = _instant_ok
+    else:
+        http_proc, base_url = _start_local_http()
+
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+    report = []
+    try:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                root = Path(tmp)
+                _build_tree(root, size, args.links_per_file, args.unique_urls, base_url)
+                entry = asyncio.run(_measure(root))
+                entry["links_per_file"] = args.links_per_file
+                report.append(entry)
+                print(f"{size} files (report {entry['report_chars']} chars):")
+                for name, stage in entry["stages"].items():
+                    print(f"  {name:<11} {stage['seconds']:>8.2f} s  "
+                          f"py_peak={str(stage['py_peak_kb']):>9} kB  rss_hwm={stage['rss_hwm_kb']} kB")
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if http_proc is not None:
+            http_proc.terminate()
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/pipeline_overlap.py
+
+"""
+Pipeline overlap benchmark: a project scan run stage after stage vs the staged pipeline.
+
+Writes a tree of Markdown files with a few unique links each and scans it with
+`check_markdown_links_project`. Every URL check sleeps for --latency to stand in for the
+network:
+
+  discovery  - _iter_project_files alone (walk + .gitignore filtering)
+  checks     - the tool call with discovery already done, so reads and checks only
+  back2back  - discovery, then the checks, one after the other (discovery + checks)
+  pipeline   - the tool call as it runs, with discovery feeding the checks
+
+With overlap, `pipeline` approaches the slower of `discovery` and `checks` rather than
+their sum. Files are read once before timing, so reads are served from the page cache.
+
+Usage:
+    PYTHONPATH=src python benchmarks/pipeline_overlap.py --files 5000 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from mcp_server import server
+from mcp_server.tools.status_cache import STATUS_CACHE
+
+FILES_PER_DIR = 100
+
+
+def _build_tree(root: Path, file_count: int, links_per_file: int):
+    (root / ".gitignore").write_text("ignored/\n", encoding="utf-8")
+    for i in range(file_count):
+        directory = root / "docs" / f"section_{i // FILES_PER_DIR:04d}"
+        if i % FILES_PER_DIR == 0:
+            directory.mkdir(parents=True)
+        links = "\n".join(f"- [ref](https://example.com/{i}/{j})" for j in range(links_per_file))
+        (directory / f"page_{i:06d}.md").write_text(f"# Page {i}\n\n{links}\n", encoding="utf-8")
+
+
+async def _scan(root: Path, latency: float, files: list[Path] | None = None) -> str:
+    async def check_status(session, url):
+        await asyncio.sleep(latency)
+        return ("OK", None)
+
+    STATUS_CACHE.clear()
+    discover = (lambda r, cancelled=None: iter(files)) if files is not None else server._iter_project_files
+    with patch.object(server, "PROJECT_ROOT", root), \
+            patch.object(server, "_iter_project_files", discover), \
+            patch("mcp_server.tools.link_checker._check_link_status", side_effect=check_status):
+        result = await server.handle_call_tool("check_markdown_links_project", {})
+    return result[0].text
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Pipeline overlap benchmark.")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--links-per-file", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Seconds each simulated URL check takes.")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", dest="json_out", default=None)
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    report: dict = {"files": args.files, "links_per_file": args.links_per_file, "latency": args.latency}
+    timings: dict[str, list[float]] = {"discovery": [], "checks": [], "back2back": [], "pipeline": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _build_tree(root, args.files, args.links_per_file)
+        files = list(server._iter_project_files(root))  # Also warms the page cache
+        for _ in range(args.rounds):
+            timings["discovery"].append(_timed(lambda: list(server._iter_project_files(root))))
+            timings["checks"].append(_timed(lambda: asyncio.run(_scan(root, args.latency, files))))
+            timings["back2back"].append(_timed(lambda: asyncio.run(
+                _scan(root, args.latency, list(server._iter_project_files(root))))))
+            timings["pipeline"].append(_timed(lambda: asyncio.run(_scan(root, args.latency))))
+
+    print(f"{args.files} files, {args.links_per_file} links each, {args.latency}s per URL, "
+          f"median of {args.rounds} rounds:")
+    for name, values in timings.items():
+        report[name] = {"median_seconds": round(statistics.median(values), 4)}
+        print(f"  {name:<10} {report[name]['median_seconds']:>8.3f} s")
+    report["speedup"] = round(report["back2back"]["median_seconds"] / report["pipeline"]["median_seconds"], 2)
+    print(f"  speedup    {report['speedup']}x (back2back / pipeline)")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
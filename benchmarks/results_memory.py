@@ -0,0 +1,98 @@
+# benchmarks/results_memory.py
+
+"""
+Retained memory of a project scan's link results: per-file dicts vs ScanResults.
+
+Generates the results check_links_in_content would return for a synthetic project
+(URLs drawn from a pool where a few popular URLs are linked from most files, 5% broken)
+and measures, with tracemalloc, what stays alive until the report is formatted:
+
+  dicts    - one results dict per file, as the server kept them before
+  compact  - the same results added to a ScanResults as each file finishes
+
+Every URL string is built fresh per file, as the Markdown parser produces them. The
+time to render every file back with ScanResults.to_dict is reported as well.
+
+Usage:
+    PYTHONPATH=src python benchmarks/results_memory.py --files 20000 --links-per-file 5
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+from mcp_server.tools.results import ScanResults
+
+
+def _file_results(rng: random.Random, links_per_file: int, unique_urls: int) -> dict:
+    """One file's results; a Pareto draw makes a handful of URLs appear in most files."""
+    results = {"total": links_per_file, "valid": [], "broken": [], "errors": []}
+    for _ in range(links_per_file):
+        url_id = min(int(rng.paretovariate(1.2)) - 1, unique_urls - 1)
+        url = "".join(("https://docs.example.com/reference/section-", str(url_id), "/index.html"))
+        if rng.random() < 0.05:
+            results["broken"].append({"url": url, "reason": "".join(("HTTP Status ", "404"))})
+        else:
+            results["valid"].append(url)
+    return results
+
+
+def _measure(keep_compact: bool, files: int, links_per_file: int, unique_urls: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    tracemalloc.start()
+    start = time.perf_counter()
+    scan = ScanResults()
+    kept = []
+    for _ in range(files):
+        results = _file_results(rng, links_per_file, unique_urls)
+        kept.append(scan.add(results) if keep_compact else results)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    entry = {"retained_kb": retained // 1024, "peak_kb": peak // 1024, "build_seconds": round(elapsed, 3)}
+    if keep_compact:
+        start = time.perf_counter()
+        for file in kept:
+            scan.to_dict(file)
+        entry["render_seconds"] = round(time.perf_counter() - start, 3)
+        entry["unique_urls_interned"] = len(scan.urls)
+    return entry
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Link results memory benchmark.")
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--links-per-file", type=int, default=5)
+    parser.add_argument("--unique-urls", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_out", default=None)
+    args = parser.parse_args(argv)
+
+    report = {
+        "files": args.files,
+        "links": args.files * args.links_per_file,
+        "dicts": _measure(False, args.files, args.links_per_file, args.unique_urls, args.seed),
+        "compact": _measure(True, args.files, args.links_per_file, args.unique_urls, args.seed),
+    }
+    dicts, compact = report["dicts"], report["compact"]
+    report["reduction"] = round(dicts["retained_kb"] / max(compact["retained_kb"], 1), 1)
+
+    print(f"{args.files} files, {report['links']} link occurrences "
+          f"({compact['unique_urls_interned']} distinct URLs):")
+    for name in ("dicts", "compact"):
+        stage = report[name]
+        print(f"  {name:<8} retained={stage['retained_kb']:>8} kB  peak={stage['peak_kb']:>8} kB  "
+              f"build={stage['build_seconds']:.2f} s")
+    print(f"  render   {compact['render_seconds']:.2f} s for every file")
+    print(f"  reduction {report['reduction']}x")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
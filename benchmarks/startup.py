@@ -0,0 +1,122 @@
+# benchmarks/startup.py
+
+"""
+Cold start benchmark for the MCP server.
+
+Launches `python -m mcp_server.server` over and over and measures, for each launch:
+
+  import      - importing mcp_server.server in a fresh interpreter (separate process)
+  initialize  - spawn to the `initialize` response, what an editor window waits for
+  first_call  - the first `tools/call` after the handshake, which now also pays for the
+                link checking imports deferred at startup (a local file with no links)
+
+The run fails (exit code 1) if the median `initialize` time is above --target-ms.
+
+Usage:
+    PYTHONPATH=src python benchmarks/startup.py --runs 10 --target-ms 600
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from stdio_load import REPO_ROOT, StdioClient, _handshake
+
+DEFAULT_TARGET_MS = 600
+
+
+def _server_env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(REPO_ROOT / "src"), env.get("PYTHONPATH")) if p)
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+
+def _import_ms(python: str) -> float:
+    """Time to import mcp_server.server in a fresh interpreter, in ms."""
+    code = ("import time; t = time.perf_counter(); import mcp_server.server; "
+            "print((time.perf_counter() - t) * 1000)")
+    out = subprocess.run([python, "-c", code], env=_server_env(), check=True,
+                         capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+async def _launch(python: str, fixture: Path) -> tuple[float, float]:
+    """One cold start: returns (spawn to initialize response, first tool call) in ms."""
+    start = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        python, "-m", "mcp_server.server",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        env=_server_env(),
+    )
+    client = StdioClient(proc)
+    try:
+        await asyncio.wait_for(_handshake(client), timeout=60)
+        initialize_ms = (time.perf_counter() - start) * 1000
+        t0 = time.perf_counter()
+        response = await asyncio.wait_for(client.request("tools/call", {
+            "name": "check_markdown_link_file", "arguments": {"file_path": str(fixture)}}), timeout=60)
+        first_call_ms = (time.perf_counter() - t0) * 1000
+        if "error" in response:
+            raise RuntimeError(f"tools/call failed: {response['error']}")
+    finally:
+        await client.close()
+        if proc.returncode is None:
+            proc.terminate()
+            await proc.wait()
+    return initialize_ms, first_call_ms
+
+
+def _stats(values: list[float]) -> dict:
+    ordered = sorted(values)
+    return {"median_ms": round(statistics.median(ordered), 1),
+            "min_ms": round(ordered[0], 1), "max_ms": round(ordered[-1], 1)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold start benchmark.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS,
+                        help="Budget for the median spawn to initialize response time.")
+    parser.add_argument("--python", default=sys.executable, help="Interpreter used to launch the server.")
+    parser.add_argument("--json", dest="json_out", default=None)
+    args = parser.parse_args(argv)
+
+    timings: dict[str, list[float]] = {"import": [], "initialize": [], "first_call": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture = Path(tmp) / "startup.md"
+        fixture.write_text("# Startup\n\nNo links here.\n", encoding="utf-8")
+        _import_ms(args.python)  # Warms the bytecode and page caches
+        for _ in range(args.runs):
+            timings["import"].append(_import_ms(args.python))
+            initialize_ms, first_call_ms = asyncio.run(_launch(args.python, fixture))
+            timings["initialize"].append(initialize_ms)
+            timings["first_call"].append(first_call_ms)
+
+    report: dict = {"runs": args.runs, "target_ms": args.target_ms}
+    print(f"Cold start, {args.runs} runs (median / min / max):")
+    for name, values in timings.items():
+        report[name] = _stats(values)
+        print(f"  {name:<11} {report[name]['median_ms']:>8.1f} ms  "
+              f"{report[name]['min_ms']:>8.1f}  {report[name]['max_ms']:>8.1f}")
+    report["within_target"] = report["initialize"]["median_ms"] <= args.target_ms
+    print(f"  target      {args.target_ms:>8.1f} ms  "
+          f"({'met' if report['within_target'] else 'MISSED'})")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0 if report["within_target"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
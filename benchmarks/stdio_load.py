@@ -0,0 +1,331 @@
+# benchmarks/stdio_load.py
+
+"""
+End-to-end stdio load test for the MCP server.
+
+Launches `python -m mcp_server.server` as a subprocess, performs the
+`initialize` / `notifications/initialized` handshake and then fires many
+concurrent `tools/call` requests over the real JSON-RPC stdio framing.
+Reports per-call latency percentiles, throughput and the server's RSS over time.
+
+By default throwaway Markdown files pointing at a local HTTP stub are checked, so
+results are not skewed by internet latency. Every request gets its own file of distinct
+URLs, since the server's status cache would otherwise answer all but the first call:
+
+  cold  - each file checked once, every URL a real request to the stub
+  warm  - the same files checked again, every URL answered from the status cache
+
+Pass --tool/--arguments to target a real tool call instead (one phase, repeated calls).
+
+Usage:
+    PYTHONPATH=src python benchmarks/stdio_load.py --requests 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PROTOCOL_VERSION = "2024-11-05"
+
+# --- Local HTTP stub ---
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    """Answers every HEAD/GET with 200 so only server overhead is measured."""
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self.do_HEAD()
+
+    def log_message(self, format, *args):  # Silence per-request stderr noise
+        pass
+
+
+def _start_stub_server() -> tuple[ThreadingHTTPServer, str]:
+    """Starts the HTTP stub on an ephemeral port, returns (server, base_url)."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+
+def _write_fixtures(directory: Path, base_url: str, link_count: int, count: int) -> list[Path]:
+    """Writes `count` Markdown files with `link_count` links each, no URL shared between files."""
+    fixtures = []
+    for n in range(count):
+        fixture = directory / f"load_fixture_{n}.md"
+        lines = ["# Load test fixture", ""]
+        lines += [f"- [Link {i}]({base_url}/call/{n}/page/{i})" for i in range(link_count)]
+        fixture.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        fixtures.append(fixture)
+    return fixtures
+
+# --- RSS sampling ---
+
+
+def _read_rss_kb(pid: int) -> int | None:
+    """Reads VmRSS for `pid` from /proc (Linux only), in kB."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+async def _sample_rss(pid: int, interval: float, samples: list[tuple[float, int]], start: float):
+    """Appends (elapsed_seconds, rss_kb) tuples until cancelled."""
+    while True:
+        rss = _read_rss_kb(pid)
+        if rss is not None:
+            samples.append((time.perf_counter() - start, rss))
+        await asyncio.sleep(interval)
+
+# --- JSON-RPC client over stdio ---
+
+
+class StdioClient:
+    """Minimal newline-delimited JSON-RPC client for an MCP server subprocess."""
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self._next_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self):
+        assert self.proc.stdout is not None
+        while True:
+            line = await self.proc.stdout.readline()
+            if not line:
+                break
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Not a JSON-RPC frame
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        # Server exited: fail anything still waiting
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Server closed stdout"))
+
+    async def _send(self, message: dict):
+        assert self.proc.stdin is not None
+        self.proc.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self.proc.stdin.drain()
+
+    async def request(self, method: str, params: dict) -> dict:
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        return await future
+
+    async def notify(self, method: str, params: dict | None = None):
+        await self._send({"jsonrpc": "2.0", "method": method, "params": params or {}})
+
+    async def close(self):
+        self._reader_task.cancel()
+
+
+async def _handshake(client: StdioClient) -> float:
+    """Performs initialize/initialized, returns the initialize round trip in seconds."""
+    start = time.perf_counter()
+    response = await client.request("initialize", {
+        "protocolVersion": PROTOCOL_VERSION,
+        "clientInfo": {"name": "stdio-load", "version": "0.1"},
+        "capabilities": {},
+    })
+    elapsed = time.perf_counter() - start
+    if "error" in response:
+        raise RuntimeError(f"initialize failed: {response['error']}")
+    await client.notify("notifications/initialized")
+    return elapsed
+
+# --- Reporting ---
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class _Phase:
+    """Latencies, errors and response sizes of one batch of tool calls."""
+
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.response_bytes: list[int] = []
+        self.errors = 0
+        self.wall = 0.0
+
+
+def _summarize_phase(phase: _Phase) -> dict:
+    latencies, wall = phase.latencies, phase.wall
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + phase.errors,
+        "ok": len(latencies),
+        "errors": phase.errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(ordered, 50) * 1000, 2),
+            "p95": round(_percentile(ordered, 95) * 1000, 2),
+            "p99": round(_percentile(ordered, 99) * 1000, 2),
+            "mean": round(statistics.fmean(ordered) * 1000, 2) if ordered else 0.0,
+            "max": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        },
+        "mean_response_bytes": round(statistics.fmean(phase.response_bytes)) if phase.response_bytes else 0,
+    }
+
+
+def _summarize(phases: dict[str, _Phase], init_s: float, rss: list[tuple[float, int]]) -> dict:
+    return {
+        "initialize_ms": round(init_s * 1000, 2),
+        "phases": {name: _summarize_phase(phase) for name, phase in phases.items()},
+        "rss_kb": {
+            "start": rss[0][1] if rss else None,
+            "peak": max(v for _, v in rss) if rss else None,
+            "end": rss[-1][1] if rss else None,
+            "samples": [[round(t, 2), v] for t, v in rss],
+        },
+    }
+
+
+def _print_summary(summary: dict):
+    rss = summary["rss_kb"]
+    print("MCP stdio load test")
+    print(f"  Initialize round trip: {summary['initialize_ms']} ms")
+    for name, phase in summary["phases"].items():
+        lat = phase["latency_ms"]
+        print(f"  [{name}] Requests: {phase['requests']} (ok={phase['ok']}, errors={phase['errors']})")
+        print(f"  [{name}] Wall time: {phase['wall_seconds']} s, throughput: {phase['throughput_rps']} req/s")
+        print(f"  [{name}] Latency (ms): p50={lat['p50']} p95={lat['p95']} p99={lat['p99']} "
+              f"mean={lat['mean']} max={lat['max']}")
+        print(f"  [{name}] Mean response size: {phase['mean_response_bytes']} bytes")
+    if rss["peak"] is not None:
+        print(f"  RSS (kB): start={rss['start']} peak={rss['peak']} end={rss['end']}")
+        print("  RSS over time (s, kB):")
+        step = max(1, len(rss["samples"]) // 10)
+        for t, v in rss["samples"][::step]:
+            print(f"    {t:>7.2f}  {v}")
+
+# --- Driver ---
+
+
+async def run_load(args: argparse.Namespace) -> dict:
+    stub = None
+    tmp_dir = None
+    if args.tool is None:
+        stub, base_url = _start_stub_server()
+        tmp_dir = tempfile.TemporaryDirectory()
+        fixtures = _write_fixtures(Path(tmp_dir.name), base_url, args.links, args.requests)
+        calls = [("check_markdown_link_file", {"file_path": str(fixture)}) for fixture in fixtures]
+        phases = {"cold": _Phase(), "warm": _Phase()}
+    else:
+        calls = [(args.tool, json.loads(args.arguments))] * args.requests
+        phases = {"tool": _Phase()}
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(REPO_ROOT / "src"), env.get("PYTHONPATH")) if p)
+    env["PYTHONUNBUFFERED"] = "1"
+    proc = await asyncio.create_subprocess_exec(
+        args.python, "-m", "mcp_server.server",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        env=env,
+        limit=64 * 1024 * 1024,  # Large reports arrive as a single line
+    )
+    client = StdioClient(proc)
+    rss_samples: list[tuple[float, int]] = []
+    start = time.perf_counter()
+    sampler = asyncio.create_task(_sample_rss(proc.pid, args.rss_interval, rss_samples, start))
+    try:
+        init_s = await asyncio.wait_for(_handshake(client), timeout=args.timeout)
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one_call(phase: _Phase, tool: str, tool_args: dict):
+            async with semaphore:
+                t0 = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(
+                        client.request("tools/call", {"name": tool, "arguments": tool_args}),
+                        timeout=args.timeout)
+                except (asyncio.TimeoutError, ConnectionError):
+                    phase.errors += 1
+                    return
+                elapsed = time.perf_counter() - t0
+            result = response.get("result") or {}
+            if "error" in response or result.get("isError"):
+                phase.errors += 1
+                return
+            phase.latencies.append(elapsed)
+            phase.response_bytes.append(len(json.dumps(result)))
+
+        for phase in phases.values():  # cold, then warm: the same calls, now cached
+            wall_start = time.perf_counter()
+            await asyncio.gather(*(one_call(phase, tool, tool_args) for tool, tool_args in calls))
+            phase.wall = time.perf_counter() - wall_start
+    finally:
+        sampler.cancel()
+        await client.close()
+        if proc.returncode is None:
+            proc.terminate()
+            await proc.wait()
+        if stub is not None:
+            stub.shutdown()
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    return _summarize(phases, init_s, rss_samples)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--requests", type=int, default=100, help="Tool calls to send per phase.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max in-flight tool calls.")
+    parser.add_argument("--links", type=int, default=50,
+                        help="Links in each generated fixture (ignored with --tool).")
+    parser.add_argument("--tool", default=None, help="Tool name to call instead of the fixture check.")
+    parser.add_argument("--arguments", default="{}", help="JSON arguments for --tool.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--rss-interval", type=float, default=0.1, help="RSS sampling interval in seconds.")
+    parser.add_argument("--python", default=sys.executable, help="Interpreter used to launch the server.")
+    parser.add_argument("--json", dest="json_out", default=None, help="Also write the summary to this JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = _parse_args(argv)
+    summary = asyncio.run(run_load(args))
+    _print_summary(summary)
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+# benchmarks/transport_h2.py
+
+"""
+Compares the aiohttp (HTTP/1.1) and HTTP/2 link check transports against local servers.
+
+Starts two local servers in a background thread: an aiohttp HTTP/1.1 server and a
+minimal HTTP/2 cleartext (h2c, prior knowledge) server built on the `h2` library. Both
+answer every request with 200 after --latency ms, and delay the first request on each
+new connection by --handshake ms to stand in for the TCP + TLS round trips a real
+remote host costs. Then --urls distinct URLs on that single host are checked
+concurrently through `_check_link_status` with each transport, the way one file's links
+are checked by `check_links_in_content`.
+
+Reports wall time, URLs/s, per-URL latency percentiles and how many connections each
+server accepted.
+
+With --files, also times a multi-file scan over HTTP/2: --files files of --urls-per-file
+links each on the h2c host, checked through `check_links_in_content` with up to
+MAX_CONCURRENT_FILES files in flight, like check_markdown_links_project. It runs once
+with a client per file batch and once inside `call_transports()` (one client for the
+whole call, as the server does), reporting wall time and server connections for each.
+
+Requires the optional HTTP/2 dependencies: pip install "mcp_server[http2]"
+
+Usage:
+    PYTHONPATH=src python benchmarks/transport_h2.py --urls 1000 --latency 50 --handshake 100
+    PYTHONPATH=src python benchmarks/transport_h2.py --urls 0 --files 200 --urls-per-file 5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+from aiohttp import web
+
+from mcp_server.server import MAX_CONCURRENT_FILES
+from mcp_server.tools import link_checker
+from mcp_server.tools.status_cache import STATUS_CACHE
+from mcp_server.tools.transport import (
+    AiohttpTransport,
+    Http2Transport,
+    call_transports,
+    http2_available,
+)
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:
+    h2 = None
+
+# --- Local servers ---
+
+
+class _ServerStats:
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+
+
+class _H2Protocol(asyncio.Protocol):
+    """Answers every HTTP/2 request with an empty 200 after the configured delays."""
+
+    def __init__(self, stats: _ServerStats, latency: float, handshake: float):
+        self.stats = stats
+        self.latency = latency
+        self.handshake = handshake
+        self.conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False))
+        self.transport = None
+        self.ready_at = 0.0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.stats.connections += 1
+        self.ready_at = asyncio.get_running_loop().time() + self.handshake
+        self.conn.initiate_connection()
+        transport.write(self.conn.data_to_send())
+
+    def data_received(self, data: bytes):
+        try:
+            events = self.conn.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            self.transport.close()
+            return
+        for event in events:
+            if isinstance(event, h2.events.RequestReceived):
+                self.stats.requests += 1
+                asyncio.ensure_future(self._respond(event.stream_id))
+        self.transport.write(self.conn.data_to_send())
+
+    async def _respond(self, stream_id: int):
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(max(self.ready_at - loop.time(), 0.0) + self.latency)
+        if self.transport.is_closing():
+            return
+        try:
+            self.conn.send_headers(
+                stream_id, [(":status", "200"), ("content-length", "0")], end_stream=True)
+        except h2.exceptions.ProtocolError:
+            return  # Stream was reset by the client
+        self.transport.write(self.conn.data_to_send())
+
+
+def _h1_app(stats: _ServerStats, latency: float, handshake: float) -> web.Application:
+    seen_connections: set[int] = set()
+
+    async def handle(request: web.Request) -> web.Response:
+        stats.requests += 1
+        delay = latency
+        connection_id = id(request.transport)
+        if connection_id not in seen_connections:
+            seen_connections.add(connection_id)
+            stats.connections += 1
+            delay += handshake
+        await asyncio.sleep(delay)
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    return app
+
+
+class _ServerThread:
+    """Runs both servers on their own event loop so they do not compete with the client."""
+
+    def __init__(self, latency: float, handshake: float):
+        self.latency = latency
+        self.handshake = handshake
+        self.h1_stats = _ServerStats()
+        self.h2_stats = _ServerStats()
+        self.h1_port = 0
+        self.h2_port = 0
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+        self._started.set()
+        self._loop.run_forever()
+
+    async def _serve(self):
+        runner = web.AppRunner(_h1_app(self.h1_stats, self.latency, self.handshake))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        self.h1_port = site._server.sockets[0].getsockname()[1]
+        h2_server = await self._loop.create_server(
+            lambda: _H2Protocol(self.h2_stats, self.latency, self.handshake), "127.0.0.1", 0)
+        self.h2_port = h2_server.sockets[0].getsockname()[1]
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+# --- Benchmark ---
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+async def _run_transport(transport, base_url: str, url_count: int) -> dict:
+    latencies: list[float] = []
+
+    async def check(i: int):
+        start = time.perf_counter()
+        result = await link_checker._check_link_status(transport, f"{base_url}/page/{i}")
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    wall_start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(check(i) for i in range(url_count)))
+    finally:
+        await transport.close()
+    wall = time.perf_counter() - wall_start
+    latencies.sort()
+    return {
+        "transport": transport.name,
+        "urls": url_count,
+        "ok": sum(1 for r in results if r[0] == "OK"),
+        "wall_seconds": round(wall, 3),
+        "urls_per_second": round(url_count / wall, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+    }
+
+
+async def _run_scan(servers: _ServerThread, files: int, urls_per_file: int, shared: bool) -> dict:
+    """Checks files' links over HTTP/2, each file batch in its own client unless shared."""
+    base_url = f"http://127.0.0.1:{servers.h2_port}"
+    contents = ["\n".join(f"- [page]({base_url}/file/{i}/page/{j})" for j in range(urls_per_file))
+                for i in range(files)]
+    open_h2c = Http2Transport.open
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILES)
+
+    async def check_file(content: str) -> int:
+        async with semaphore:
+            results = await link_checker.check_links_in_content(content)
+        return len(results["valid"])
+
+    STATUS_CACHE.clear()
+    connections = servers.h2_stats.connections
+    wall_start = time.perf_counter()
+    with patch("mcp_server.tools.transport.TRANSPORT_BACKEND", "http2"), \
+            patch.object(Http2Transport, "open", lambda: open_h2c(prior_knowledge=True)):
+        if shared:
+            async with call_transports():
+                ok = await asyncio.gather(*(check_file(content) for content in contents))
+        else:
+            ok = await asyncio.gather(*(check_file(content) for content in contents))
+    wall = time.perf_counter() - wall_start
+    return {
+        "clients": "per call" if shared else "per file",
+        "files": files,
+        "urls": files * urls_per_file,
+        "ok": sum(ok),
+        "wall_seconds": round(wall, 3),
+        "server_connections": servers.h2_stats.connections - connections,
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> tuple[list[dict], list[dict]]:
+    servers = _ServerThread(args.latency / 1000, args.handshake / 1000)
+    servers.start()
+    try:
+        rows, scan_rows = [], []
+        for _ in range(args.rounds):
+            if args.urls:
+                row = await _run_transport(
+                    AiohttpTransport.open(), f"http://127.0.0.1:{servers.h1_port}", args.urls)
+                rows.append(row)
+                row = await _run_transport(
+                    Http2Transport.open(prior_knowledge=True),
+                    f"http://127.0.0.1:{servers.h2_port}", args.urls)
+                rows.append(row)
+            if args.files:
+                for shared in (False, True):
+                    scan_rows.append(await _run_scan(servers, args.files, args.urls_per_file, shared))
+        if rows:
+            rows[-2]["server_connections"] = servers.h1_stats.connections
+            rows[-1]["server_connections"] = servers.h2_stats.connections - sum(
+                r["server_connections"] for r in scan_rows)
+        return rows, scan_rows
+    finally:
+        servers.stop()
+
+
+def _print_rows(rows: list[dict]):
+    print(f"{'transport':<10} {'urls':>6} {'ok':>6} {'wall s':>8} {'urls/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for r in rows:
+        print(f"{r['transport']:<10} {r['urls']:>6} {r['ok']:>6} {r['wall_seconds']:>8} "
+              f"{r['urls_per_second']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8}")
+    print("Server connections accepted (all rounds): "
+          f"aiohttp={rows[-2].get('server_connections')} http2={rows[-1].get('server_connections')}")
+
+
+def _print_scan_rows(scan_rows: list[dict]):
+    print(f"Multi-file scan over HTTP/2 ({scan_rows[0]['files']} files, {scan_rows[0]['urls']} URLs):")
+    print(f"{'clients':<10} {'ok':>6} {'wall s':>8} {'connections':>12}")
+    for r in scan_rows:
+        print(f"{r['clients']:<10} {r['ok']:>6} {r['wall_seconds']:>8} {r['server_connections']:>12}")
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--urls", type=int, default=1000, help="Distinct URLs on the single test host.")
+    parser.add_argument("--latency", type=float, default=50.0, help="Server response delay per request, ms.")
+    parser.add_argument("--handshake", type=float, default=100.0,
+                        help="Extra delay on each new connection's first request, ms.")
+    parser.add_argument("--files", type=int, default=0,
+                        help="Also time a multi-file HTTP/2 scan of this many files (0: skip).")
+    parser.add_argument("--urls-per-file", type=int, default=5, help="Distinct URLs per file in the scan.")
+    parser.add_argument("--rounds", type=int, default=1, help="Times to repeat both runs.")
+    parser.add_argument("--json", dest="json_out", default=None, help="Also write the rows to this JSON file.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = _parse_args(argv)
+    if h2 is None or not http2_available():
+        sys.exit('HTTP/2 dependencies missing: pip install "mcp_server[http2]"')
+    logging.disable(logging.WARNING)
+    rows, scan_rows = asyncio.run(run_benchmark(args))
+    if rows:
+        _print_rows(rows)
+    if scan_rows:
+        _print_scan_rows(scan_rows)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(rows + scan_rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,102 @@
 # src/mcp_link_checker/server.py
 
 import asyncio
+import contextlib
+import itertools
+import json
 import logging
 import os  # Import os for path manipulation
+import subprocess
 import sys
+import threading
+from collections.abc import Awaitable, Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import aiofiles  # Added for async file reading
 import mcp.server.stdio
 import mcp.types as types
-import pathspec  # Import pathspec
 from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 
-from .tools.link_checker import check_links_in_content
-
-# --- Early File Logging Setup ---
-log_file_path = os.path.join(os.path.dirname(
-    __file__), 'mcp_server_startup.log')
-try:
-    # Configure root logger for file output before anything else runs
-    file_handler = logging.FileHandler(
-        log_file_path, mode='w')  # Overwrite log each time
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(file_formatter)
-
-    root_logger = logging.getLogger()  # Get root logger
-    root_logger.setLevel(logging.DEBUG)  # Capture everything
-    root_logger.addHandler(file_handler)
-
-    root_logger.info(f"--- Script start logging to {log_file_path} ---")
-    root_logger.info(f"Python executable: {sys.executable}")
-    root_logger.info(f"sys.path: {sys.path}")
-    root_logger.info(f"Current working directory: {os.getcwd()}")
-except Exception as e:
-    # If logging setup fails, print to stderr and exit
-    print(
-        f"CRITICAL: Failed to set up file logging to {log_file_path}: {e}", file=sys.stderr)
-    sys.exit(1)  # Exit if we can't even log
-# --- End Early File Logging Setup ---
-
-# import json # Removed unused import
-
-
-# Import the link checking function
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    # Formatted log
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from .tools.anchors import (
+    CHECK_ANCHORS_DEFAULT,
+    start_anchor_checking,
+    stop_anchor_checking,
 )
+from .tools.changed_lines import ChangedLines, changed_markdown_lines
+from .tools.deadline import (
+    DEFAULT_CALL_DEADLINE_SECONDS,
+    NOT_CHECKED_REASON,
+    start_deadline,
+    stop_deadline,
+)
+from .tools.file_loader import current_loader
+from .tools.local_links import resolve_local_links, start_local_index, stop_local_index
+from .tools.metrics import METRICS
+from .tools.pipeline import SKIPPED_FILES_LISTED, run_file_pipeline
+from .tools.prewarm import PREWARM_ENABLED, prewarm_paused, start_prewarm
+from .tools.profiling import capture_profile, stage, start_timing, stop_timing
+from .tools.results import FileResults, ScanResults
+from .tools.streaming import should_stream
+from .tools.tracing import start_tracing, stop_tracing
+
+if TYPE_CHECKING:
+    import pathspec
+
 logger = logging.getLogger(__name__)
 
 SERVER_NAME = "mcp-tools"
 SERVER_VERSION = "0.1.0"
 
+# Project root for path resolution
+PROJECT_ROOT = Path(os.environ.get("MCP_SERVER_PROJECT_ROOT", "/home/danfmaia/_repos/mcp-server"))
+# Max files read/checked at once in project scans; bounds peak memory (see docs/performance)
+MAX_CONCURRENT_FILES = 16
+# Discovered paths matched against .gitignore at once
+DISCOVERY_MATCH_BATCH = 256
+# In git checkouts, project scans also list untracked files that are not ignored
+DISCOVER_UNTRACKED = os.environ.get("MCP_SERVER_DISCOVER_UNTRACKED", "1").lower() not in ("0", "false", "no")
+GIT_LS_FILES_TIMEOUT_SECONDS = 30
+
+# Optional wall-clock budget accepted by every link checking tool
+_TIME_BUDGET_PROPERTY = {
+    "time_budget_seconds": {
+        "type": "number",
+        "exclusiveMinimum": 0,
+        "description": (
+            "Return within about this many seconds. Checks still running are cancelled and "
+            f"unfinished URLs/files are reported as '{NOT_CHECKED_REASON}' (files only up to "
+            f"{SKIPPED_FILES_LISTED}, the rest are counted). "
+            f"Default: {DEFAULT_CALL_DEADLINE_SECONDS:g}."),
+    },
+}
+
+# Optional fragment validation accepted by every link checking tool
+_ANCHOR_PROPERTY = {
+    "check_anchors": {
+        "type": "boolean",
+        "description": (
+            "Also check that #fragments exist on their target pages (each page is downloaded "
+            f"once and indexed). Default: {str(CHECK_ANCHORS_DEFAULT).lower()}."),
+    },
+}
+
+# Optional diagnostics accepted by every link checking tool
+_DIAGNOSTIC_PROPERTIES = {
+    "include_timing": {
+        "type": "boolean",
+        "description": "Append a per-stage timing breakdown (discovery, read, parse, network, format).",
+    },
+    "profile": {
+        "type": "boolean",
+        "description": "Debug: capture a cProfile of this call to a .prof file and report its path.",
+    },
+    "trace": {
+        "type": "boolean",
+        "description": "Debug: record per-file and per-URL spans to a Chrome trace / Perfetto JSON file.",
+    },
+}
+
 # --- Server Initialization ---
 server = Server(SERVER_NAME)
 
@@ -86,10 +126,11 @@ def _format_link_report_details(link_results: dict) -> str:
 # --- Helper Functions for Report Formatting ---
 
 
-def _format_single_file_report(file_path_str, results_list, error_files) -> str:
+def _format_single_file_report(file_path_str, scan: ScanResults, results_list: list[FileResults],
+                               error_files) -> str:
     """Formats the report for a single file processing result."""
     if results_list:  # Only if processing was successful
-        link_results = results_list[0]
+        link_results = scan.to_dict(results_list[0])
         result_text = f"Link Check Report for: {file_path_str}\n"
         result_text += f"Total Links Found: {link_results['total']}\n"
         result_text += _format_link_report_details(link_results)
@@ -102,12 +143,13 @@ def _format_single_file_report(file_path_str, results_list, error_files) -> str:
     return result_text
 
 
-def _format_consolidated_report(report_source_info, results_list, processed_files, error_files) -> str:
+def _format_consolidated_report(report_source_info, scan: ScanResults, results_list: list[FileResults],
+                                processed_files, error_files) -> str:
     """Formats the consolidated report for multiple file processing results."""
-    total_links = sum(r['total'] for r in results_list)
-    total_valid = sum(len(r['valid']) for r in results_list)
-    total_broken = sum(len(r['broken']) for r in results_list)
-    total_errors = sum(len(r['errors']) for r in results_list)
+    total_links = sum(len(r) for r in results_list)
+    total_valid = sum(r.count("OK") for r in results_list)
+    total_broken = sum(r.count("BROKEN") for r in results_list)
+    total_errors = sum(r.count("ERROR") for r in results_list)
 
     result_text = "Consolidated Link Check Report\n"
     result_text += f"{report_source_info}\n"
@@ -131,39 +173,227 @@ def _format_consolidated_report(report_source_info, results_list, processed_file
     result_text += "Details:\n"
 
     for i, pf in enumerate(processed_files):
-        link_results = results_list[i]
-        if link_results['total'] > 0:  # Only add details if links were found
+        if len(results_list[i]) > 0:  # Only add details if links were found
             result_text += f"\nFile: {pf}\n"
-            # Use helper function for details
-            result_text += _format_link_report_details(link_results)
+            # Use helper function for details, rendered one file at a time
+            result_text += _format_link_report_details(scan.to_dict(results_list[i]))
     return result_text
 
+# --- Deferred Imports ---
+# aiohttp and markdown-it take longer to import than the whole MCP handshake, so the link
+# checker is imported by the first tool call that checks a file, not at server startup.
+
+
+async def check_links_in_content(content: str, *, source: Path | None = None,
+                                 changed_lines: ChangedLines | None = None) -> dict:
+    from .tools.link_checker import check_links_in_content as check
+
+    return await check(content, source=source, changed_lines=changed_lines)
+
+
+async def check_links_in_file(path: Path, *, source: Path | None = None) -> dict:
+    from .tools.link_checker import check_links_in_file as check
+
+    return await check(path, source=source)
+
 # --- Helper Function for Single File Check ---
 
 
-async def _check_single_file(file_path: Path) -> dict | str:
-    """Asynchronously checks links in a single file, returns results or error string."""
+async def _read_and_check(file_path: Path, path_to_open: Path | str) -> dict:
+    """
+    Reads a file and checks its links. During project scans the file comes from the call's
+    bulk loader (see tools/file_loader.py); very large files are streamed instead of being
+    read into memory at once (see tools/streaming.py).
+    """
+    file_path_str = str(path_to_open)
+    loader = current_loader()
+    if loader is not None:
+        loaded = loader.take(file_path)
+        if loaded is not None:
+            content = loaded.text()
+            logger.info(f"Read {len(loaded.data)} bytes from {file_path_str}")
+            return await check_links_in_content(content, source=file_path)
+    if should_stream(file_path):
+        logger.info(f"Streaming large file in chunks: {file_path_str}")
+        return await check_links_in_file(file_path, source=file_path)
+    import aiofiles
+
+    with stage("read", file=file_path_str):
+        async with aiofiles.open(path_to_open, encoding='utf-8') as f:
+            content = await f.read()
+    logger.info(f"Read {len(content)} bytes from {file_path_str}")
+    return await check_links_in_content(content, source=file_path)
+
+
+async def _guard_file_check(file_path: Path, check: Awaitable[dict], note: str = "") -> dict | str:
+    """
+    Awaits a file's link check and returns its results, or an error string for the report
+    if the file is missing or the check fails. note is appended to the log and error lines.
+    """
     file_path_str = str(file_path)
     try:
-        logger.info(f"Checking links in file: {file_path_str}")
-        async with aiofiles.open(file_path, encoding='utf-8') as f:
-            content = await f.read()
-        logger.info(f"Read {len(content)} bytes from {file_path_str}")
-        # Perform link checking
-        link_results = await check_links_in_content(content)
+        link_results = await check
         logger.info(
-            f"Link checking completed for {file_path_str}. Results: {link_results}")
+            f"Link checking completed for {file_path_str}. Total links: {link_results['total']}{note}")
         return link_results  # Return results dictionary
     except FileNotFoundError:
         error_msg = f"File not found at {file_path_str}"
-        logger.error(f"Error: {error_msg}")
+        logger.error(f"Error: {error_msg}{note}")
         return error_msg  # Return error string
     except Exception as e:
-        error_msg = f"Error during link check for {file_path_str}: {e.__class__.__name__}"
+        error_msg = f"Error during link check for {file_path_str}: {e.__class__.__name__}{note}"
         logger.exception(
-            f"Error during link check for {file_path_str}")  # Log full traceback
+            f"Error during link check for {file_path_str}{note}")  # Log full traceback
         return error_msg  # Return error string
 
+
+async def _check_single_file(file_path: Path) -> dict | str:
+    """Asynchronously checks links in a single file, returns results or error string."""
+    logger.info(f"Checking links in file: {file_path}")
+    return await _guard_file_check(file_path, _read_and_check(file_path, file_path))
+
+
+async def _check_listed_file(file_path: Path) -> dict | str:
+    """_check_single_file for the file, files and directory tools."""
+    logger.info(f"Checking links in file (central): {file_path}")
+    return await _guard_file_check(
+        file_path, _read_and_check(file_path, str(file_path)), note=" (central)")
+
+
+async def _read_and_check_changed(file_path: Path, changed_lines: ChangedLines) -> dict:
+    """Reads a file and checks only the links on changed_lines."""
+    import aiofiles
+
+    # Read whole even when large: the changed line numbers are those of the whole file
+    with stage("read", file=str(file_path)):
+        async with aiofiles.open(file_path, encoding='utf-8') as f:
+            content = await f.read()
+    return await check_links_in_content(content, source=file_path, changed_lines=changed_lines)
+
+
+async def _check_changed_file(file_path: Path, changed_lines: ChangedLines) -> dict | str:
+    """_check_single_file for the changed lines tool: only the links on changed_lines are checked."""
+    logger.info(f"Checking links on changed lines: {file_path}")
+    return await _guard_file_check(file_path, _read_and_check_changed(file_path, changed_lines))
+
+# --- Helper Functions for Project Scans ---
+
+
+def _iter_markdown_files(root: Path, cancelled: threading.Event | None = None) -> Iterator[Path]:
+    """Recursively yields *.md files under root; stops early once `cancelled` is set."""
+    found = 0
+    for p in root.rglob("*.md"):
+        if cancelled is not None and cancelled.is_set():
+            logger.info(f"Discovery under {root} cancelled after {found} files")
+            return
+        if p.is_file():
+            found += 1
+            yield p
+
+
+def _load_gitignore(project_root: Path) -> "pathspec.PathSpec | None":
+    """Returns the project's .gitignore rules, or None if there are none (or they are unreadable)."""
+    gitignore_path = project_root / ".gitignore"
+    if not gitignore_path.is_file():
+        logger.info("No .gitignore file found at project root.")
+        return None
+    import pathspec
+
+    try:
+        # Read .gitignore content
+        with open(gitignore_path, encoding='utf-8') as f:
+            gitignore_content = f.read()
+        # Create pathspec from .gitignore lines using gitwildmatch style
+        spec = pathspec.PathSpec.from_lines(
+            pathspec.patterns.GitWildMatchPattern, gitignore_content.splitlines()
+        )
+        logger.info(f"Loaded .gitignore rules from: {gitignore_path}")
+        return spec
+    except Exception as e:
+        logger.warning(
+            f"Could not read/parse .gitignore file at {gitignore_path}: {e}", exc_info=True)
+        return None
+
+
+def _git_ls_files(project_root: Path, *options: str) -> list[bytes] | None:
+    """`git ls-files` of the *.md files under project_root, or None if git cannot list them."""
+    command = ["git", "-C", str(project_root), "ls-files", "-z", *options, "--", "*.md"]
+    try:
+        listed = subprocess.run(command, capture_output=True, check=True,
+                                timeout=GIT_LS_FILES_TIMEOUT_SECONDS).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.info(f"No git file list for {project_root} ({e.__class__.__name__}), walking the tree")
+        return None
+    return [relative for relative in listed.split(b"\0") if relative]
+
+
+def _git_markdown_files(project_root: Path, untracked: bool | None = None) -> list[Path] | None:
+    """
+    The *.md files under project_root according to git: tracked files, plus untracked
+    files that are not ignored when `untracked` (default DISCOVER_UNTRACKED). Ignore
+    rules are git's own (.gitignore at any depth, .git/info/exclude, core.excludesFile).
+    Returns None when project_root is not in a git work tree or git cannot be run.
+    """
+    options = ["--cached"]
+    if DISCOVER_UNTRACKED if untracked is None else untracked:
+        options += ["--others", "--exclude-standard"]
+    listed = _git_ls_files(project_root, *options)
+    # Deleted files stay in the index until the deletion is staged; git knows which they are
+    deleted = _git_ls_files(project_root, "--deleted") if listed else []
+    if listed is None or deleted is None:
+        return None
+    deleted_set = set(deleted)
+    # dict.fromkeys: unmerged files are listed once per conflict stage
+    return [project_root / os.fsdecode(relative) for relative in dict.fromkeys(listed)
+            if relative not in deleted_set]
+
+
+def _iter_project_files(project_root: Path, cancelled: threading.Event | None = None
+                        ) -> Iterator[Path]:
+    """
+    Yields the *.md files under project_root that are not ignored by git. In a git work
+    tree they come from `git ls-files`; otherwise the tree is walked and paths are
+    matched against project_root's .gitignore in batches of DISCOVERY_MATCH_BATCH.
+    """
+    git_files = _git_markdown_files(project_root)
+    if git_files is not None:
+        logger.info(f"Found {len(git_files)} Markdown files via git under {project_root}")
+        METRICS.inc("discovery_git")
+        for path in git_files:
+            if cancelled is not None and cancelled.is_set():
+                return
+            yield path
+        return
+
+    METRICS.inc("discovery_walk")
+    spec = _load_gitignore(project_root)
+    logger.info(
+        f"Scanning project root recursively for *.md files: {project_root}")
+    if not spec:
+        # No spec (no .gitignore or failed to parse), process all files
+        logger.info("No .gitignore spec, processing all found files.")
+        yield from _iter_markdown_files(project_root, cancelled)
+        return
+
+    found = ignored = 0
+    batch: list[Path] = []
+    for path in itertools.chain(_iter_markdown_files(project_root, cancelled), [None]):
+        if path is not None:
+            batch.append(path)
+            if len(batch) < DISCOVERY_MATCH_BATCH:
+                continue
+        if not batch:
+            break
+        # Match relative path strings, keeping the original Path objects that are not ignored
+        relative_strs = [str(p.relative_to(project_root)) for p in batch]
+        ignored_files_set = set(spec.match_files(relative_strs))
+        found += len(batch)
+        ignored += len(ignored_files_set)
+        yield from (p for p, rel in zip(batch, relative_strs) if rel not in ignored_files_set)
+        batch = []
+    logger.info(
+        f"Found {found} Markdown files, {ignored} ignored based on .gitignore")
+
 # --- Tool Definitions ---
 
 
@@ -175,21 +405,24 @@ async def handle_list_tools() -> list[types.Tool]:
     tools = [
         types.Tool(
             name="check_markdown_link_file",
-            description="Checks HTTP/HTTPS links in a single Markdown file.",
+            description="Checks the links (URLs, relative paths and #anchors) in a single Markdown file.",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "file_path": {
                         "type": "string",
                         "description": "Path to the single Markdown file.",
-                    }
+                    },
+                    **_TIME_BUDGET_PROPERTY,
+                    **_ANCHOR_PROPERTY,
+                    **_DIAGNOSTIC_PROPERTIES,
                 },
                 "required": ["file_path"],
             },
         ),
         types.Tool(
             name="check_markdown_link_files",
-            description="Checks HTTP/HTTPS links in a list of Markdown files.",
+            description="Checks the links (URLs, relative paths and #anchors) in a list of Markdown files.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -197,34 +430,74 @@ async def handle_list_tools() -> list[types.Tool]:
                         "type": "array",
                         "items": {"type": "string"},
                         "description": "List of paths to specific Markdown files.",
-                    }
+                    },
+                    **_TIME_BUDGET_PROPERTY,
+                    **_ANCHOR_PROPERTY,
+                    **_DIAGNOSTIC_PROPERTIES,
                 },
                 "required": ["file_paths"],
             },
         ),
         types.Tool(
             name="check_markdown_link_directory",
-            description="Checks HTTP/HTTPS links in all *.md files within a directory (recursively).",
+            description="Checks the links (URLs, relative paths and #anchors) in all *.md files within a directory (recursively).",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "directory_path": {
                         "type": "string",
                         "description": "Path to the directory to scan.",
-                    }
+                    },
+                    **_TIME_BUDGET_PROPERTY,
+                    **_ANCHOR_PROPERTY,
+                    **_DIAGNOSTIC_PROPERTIES,
                 },
                 "required": ["directory_path"],
             },
         ),
         types.Tool(
             name="check_markdown_links_project",
-            description="Checks HTTP/HTTPS links in all project *.md files, respecting .gitignore.",
+            description="Checks the links (URLs, relative paths and #anchors) in all project *.md files, respecting .gitignore.",
             inputSchema={
                 "type": "object",
-                "properties": {},
+                "properties": {**_TIME_BUDGET_PROPERTY, **_ANCHOR_PROPERTY, **_DIAGNOSTIC_PROPERTIES},
                 # No arguments required
             },
         ),
+        types.Tool(
+            name="check_markdown_links_changed",
+            description=(
+                "Checks only the links on lines added or changed in project *.md files since a "
+                "git ref, for pre-commit hooks and pull request checks."),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "base_ref": {
+                        "type": "string",
+                        "description": (
+                            "Git ref to compare the work tree with, from where the current branch "
+                            "forked off it (e.g. 'origin/main'). Default: HEAD (uncommitted changes)."),
+                    },
+                    **_TIME_BUDGET_PROPERTY,
+                    **_ANCHOR_PROPERTY,
+                    **_DIAGNOSTIC_PROPERTIES,
+                },
+            },
+        ),
+        types.Tool(
+            name="get_link_checker_stats",
+            description="Reports cumulative link checker metrics (cache hits, latencies, timeouts) for this server process.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "format": {
+                        "type": "string",
+                        "enum": ["json", "prometheus"],
+                        "description": "Output format: JSON (default) or Prometheus text exposition.",
+                    }
+                },
+            },
+        ),
     ]
     return tools
 
@@ -237,15 +510,69 @@ async def handle_call_tool(
 ] | dict:  # Allow dict return for project scan
     """Handle tool execution requests."""
     logger.info(f"Handling call_tool request for tool: {name}")
-
-    # Define project root for path resolution
-    PROJECT_ROOT = Path("/home/danfmaia/_repos/mcp-server")
-
+    arguments = arguments or {}
+    include_timing = bool(arguments.get("include_timing"))
+    time_budget = arguments.get("time_budget_seconds", DEFAULT_CALL_DEADLINE_SECONDS)
+    if isinstance(time_budget, bool) or not isinstance(time_budget, (int, float)) or time_budget <= 0:
+        raise ValueError("Argument 'time_budget_seconds' must be a positive number.")
+
+    with contextlib.ExitStack() as diagnostics:
+        diagnostics.enter_context(prewarm_paused())
+        deadline, deadline_token = start_deadline(time_budget)
+        diagnostics.callback(stop_deadline, deadline_token)
+        _, local_token = start_local_index(PROJECT_ROOT)
+        diagnostics.callback(stop_local_index, local_token)
+        if "check_anchors" in arguments:
+            anchors_token = start_anchor_checking(bool(arguments["check_anchors"]))
+            diagnostics.callback(stop_anchor_checking, anchors_token)
+        profile_info = None
+        if arguments.get("profile"):
+            profile_info = diagnostics.enter_context(capture_profile(name))
+        if include_timing:
+            timer, token = start_timing()
+            diagnostics.callback(stop_timing, timer, token)
+        recorder = None
+        if arguments.get("trace"):
+            recorder, trace_token = start_tracing(name)
+            diagnostics.callback(stop_tracing, trace_token)
+        try:
+            result = await _dispatch_tool(name, arguments)
+        except asyncio.CancelledError:
+            # Client cancelled the request: in-flight checks are cancelled on the way out,
+            # results that already finished stay in the status cache
+            METRICS.inc("calls_cancelled")
+            logger.info(f"Tool call {name} cancelled by the client")
+            raise
+
+    # Notes and diagnostics are appended after the report so result[0] is always the report
+    budget_note = deadline.format_note()
+    if budget_note:
+        result.append(types.TextContent(type="text", text=budget_note))
+    if include_timing:
+        result.append(types.TextContent(type="text", text=timer.format_report()))
+    if profile_info is not None:
+        profile_text = (f"Profile written to: {profile_info['path']}"
+                        if profile_info["path"] else profile_info["note"])
+        result.append(types.TextContent(type="text", text=profile_text))
+    if recorder is not None:
+        try:
+            trace_text = f"Trace written to: {recorder.write()}"
+        except OSError as e:
+            logger.warning(f"Could not write trace for {name}: {e}")
+            trace_text = f"Trace could not be written: {e}"
+        result.append(types.TextContent(type="text", text=trace_text))
+    return result
+
+
+async def _dispatch_tool(
+    name: str, arguments: dict
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Runs the named tool and returns its report content."""
     # Initialize variables used by multiple branches
     paths_to_process = []
     report_source_info = f"Tool: {name}"
 
-    # --- Logic specific to each tool type ---
+    # --- Logic specific to each tool type: what to discover and how to check it ---
 
     if name == "check_markdown_link_file":
         if not arguments or "file_path" not in arguments:
@@ -281,154 +608,153 @@ async def handle_call_tool(
             logger.error(f"Path is not a directory: {scan_dir}")
             raise ValueError(f"Path is not a directory: {directory_path_str}")
         logger.info(f"Scanning directory recursively: {scan_dir}")
-        paths_to_process = [p for p in scan_dir.rglob('*.md') if p.is_file()]
-        logger.info(
-            f"Found {len(paths_to_process)} Markdown files to process.")
         report_source_info = f"Directory Scanned: {directory_path_str}"
-        if not paths_to_process:
-            # Return TextContent list even for no files found in directory
-            return [types.TextContent(type="text", text=f"No Markdown files found in directory: {directory_path_str}")]
 
     elif name == "check_markdown_links_project":
         report_source_info = "Project Scan (using .gitignore)"
-        # Re-introduce placeholders for gitignore handling with pathspec
-        gitignore_path = PROJECT_ROOT / ".gitignore"
-        spec = None
-        if gitignore_path.is_file():
-            try:
-                # Read .gitignore content
-                with open(gitignore_path, encoding='utf-8') as f:
-                    gitignore_content = f.read()
-                # Create pathspec from .gitignore lines using gitwildmatch style
-                spec = pathspec.PathSpec.from_lines(
-                    pathspec.patterns.GitWildMatchPattern, gitignore_content.splitlines()
-                )
-                logger.info(f"Loaded .gitignore rules from: {gitignore_path}")
-            except Exception as e:
-                logger.warning(
-                    f"Could not read/parse .gitignore file at {gitignore_path}: {e}", exc_info=True)
-        else:
-            logger.info("No .gitignore file found at project root.")
 
-        logger.info(
-            f"Scanning project root recursively for *.md files: {PROJECT_ROOT}")
-        all_files_paths = list(PROJECT_ROOT.rglob("*.md"))
-        logger.info(
-            f"Found {len(all_files_paths)} total Markdown files before filtering.")
-
-        # Filter files using pathspec (if available)
-        filtered_files = []
-        if spec:
-            # Convert Path objects to relative strings for matching
-            # Ensure we only check files (rglob might yield dirs)
-            all_file_paths_relative_str = [
-                str(p.relative_to(PROJECT_ROOT))
-                for p in all_files_paths if p.is_file()
-            ]
-            # Get the set of ignored file paths (as relative strings)
-            ignored_files_set = set(
-                spec.match_files(all_file_paths_relative_str))
-            logger.info(
-                f"Found {len(ignored_files_set)} ignored files based on .gitignore")
-            # Iterate through original Path objects, keeping those not in the ignored set
-            for p in all_files_paths:
-                if p.is_file() and str(p.relative_to(PROJECT_ROOT)) not in ignored_files_set:
-                    filtered_files.append(p)
-        else:
-            # No spec (no .gitignore or failed to parse), process all files
-            logger.info("No .gitignore spec, processing all found files.")
-            for p in all_files_paths:
-                if p.is_file():
-                    filtered_files.append(p)
-
-        logger.info(
-            f"Processing {len(filtered_files)} Markdown files after filtering.")
-
-        if not filtered_files:
-            # Use TextContent for consistency
-            return [types.TextContent(type="text", text="No processable Markdown files found.")]
-
-        tasks = [asyncio.create_task(_check_single_file(file))
-                 for file in filtered_files]
-        file_results_list = await asyncio.gather(*tasks)
-
-        results_list = [
-            res for res in file_results_list if isinstance(res, dict)]
-        error_files = {str(file): reason for file, reason in zip(
-            filtered_files, file_results_list) if isinstance(reason, str)}
-        # Use filtered_files (Path objects) for reporting file names
-        processed_files_paths = [f for f, res in zip(
-            filtered_files, file_results_list) if isinstance(res, dict)]
-        # Report relative paths from PROJECT_ROOT for readability
-        processed_files_rel_str = [
-            str(p.relative_to(PROJECT_ROOT)) for p in processed_files_paths]
-
-        report = _format_consolidated_report(
-            report_source_info, results_list, processed_files_rel_str, error_files
-        )
-        # return {"report": report}  # Return dict for project scan
-        # Return the formatted report wrapped in TextContent list for consistency
-        return [types.TextContent(type="text", text=report)]
+    elif name == "check_markdown_links_changed":
+        base_ref = arguments.get("base_ref", "HEAD")
+        if not isinstance(base_ref, str) or not base_ref:
+            raise ValueError("Argument 'base_ref' must be a non-empty string.")
+        with stage("discovery"):
+            changed_files = await asyncio.to_thread(
+                changed_markdown_lines, PROJECT_ROOT, base_ref, DISCOVER_UNTRACKED)
+        report_source_info = f"Lines Changed Since: {base_ref}"
+
+    elif name == "get_link_checker_stats":
+        # The cache, DNS, breaker and timeout gauges register when the link checker is
+        # imported; import it so a call before the first check still reports them
+        from .tools import link_checker  # noqa: F401
+
+        output_format = arguments.get("format", "json")
+        if output_format == "prometheus":
+            return [types.TextContent(type="text", text=METRICS.render_prometheus())]
+        if output_format != "json":
+            raise ValueError(
+                f"Invalid format: {output_format}. Expected 'json' or 'prometheus'.")
+        return [types.TextContent(type="text", text=json.dumps(METRICS.snapshot(), indent=2))]
 
     else:
         logger.error(f"Unknown tool requested: {name}")
         raise ValueError(f"Unknown tool: {name}")
 
-    # --- Centralized Processing for file/files/directory tools ---
-    # This block only runs if paths_to_process was populated above
-    # and the tool wasn't check_markdown_links_project (it exited above)
-    results_list_central = []
-    processed_files_central = []
-    error_files_central = {}
-    for file_path in paths_to_process:
-        # Report the original path if it was a single file check, else the resolved one
-        file_path_str_for_report = arguments.get("file_path", str(
-            file_path)) if name == "check_markdown_link_file" else str(file_path)
-        # Always use resolved for processing
-        file_path_str_for_processing = str(file_path)
-
-        try:
-            logger.info(
-                f"Checking links in file (central): {file_path_str_for_processing}")
-            async with aiofiles.open(file_path_str_for_processing, encoding='utf-8') as f:
-                content = await f.read()
-            logger.info(
-                f"Read {len(content)} bytes from {file_path_str_for_processing} (central)")
-            link_results = await check_links_in_content(content)
-            logger.info(
-                f"Link checking completed for {file_path_str_for_processing}. Results: {link_results} (central)")
-            results_list_central.append(link_results)
-            processed_files_central.append(file_path_str_for_report)
-        except FileNotFoundError:
-            error_msg = f"File not found at {file_path_str_for_processing}"
-            logger.error(f"Error: {error_msg} (central)")
-            # Report error against original path
-            error_files_central[file_path_str_for_report] = error_msg
-        except Exception as e:
-            error_msg = f"Error during link check for {file_path_str_for_processing}: {e.__class__.__name__} (central)"
-            logger.exception(
-                f"Error during link check for {file_path_str_for_processing} (central)")
-            # Report error against original path
-            error_files_central[file_path_str_for_report] = error_msg
-
-    # --- Format Report for file/files/directory tools ---
-    if len(paths_to_process) == 1 and name == "check_markdown_link_file":
-        report = _format_single_file_report(
-            arguments.get("file_path", ""),  # Use original path for report
-            results_list_central, error_files_central)
-    else:
-        # report_source_info already contains the list of original paths for 'files'
-        # or the directory path for 'directory'
-        report = _format_consolidated_report(
-            report_source_info, results_list_central, processed_files_central, error_files_central
-        )
+    # --- Pipeline: discovery, reads and checks overlap (see tools/pipeline.py) ---
+    from .tools.transport import call_transports
+
+    scan = ScanResults()
+    # One HTTP/2 client for all of the call's file batches (see tools/transport.py)
+    async with call_transports():
+        if name == "check_markdown_links_project":
+            outcomes = await run_file_pipeline(
+                lambda cancelled: _iter_project_files(PROJECT_ROOT, cancelled), _check_single_file,
+                workers=MAX_CONCURRENT_FILES, scan=scan, preload=True)
+            if not outcomes:
+                return [types.TextContent(type="text", text="No processable Markdown files found.")]
+        elif name == "check_markdown_links_changed":
+            outcomes = await run_file_pipeline(
+                lambda cancelled: changed_files,
+                lambda file_path: _check_changed_file(file_path, changed_files[file_path]),
+                workers=MAX_CONCURRENT_FILES, scan=scan)
+            if not outcomes:
+                return [types.TextContent(type="text", text=f"No Markdown files changed since {base_ref}.")]
+        elif name == "check_markdown_link_directory":
+            outcomes = await run_file_pipeline(
+                lambda cancelled: _iter_markdown_files(scan_dir, cancelled), _check_listed_file,
+                workers=MAX_CONCURRENT_FILES, scan=scan)
+            logger.info(f"Found {len(outcomes)} Markdown files to process.")
+            if not outcomes:
+                return [types.TextContent(type="text", text=f"No Markdown files found in directory: {directory_path_str}")]
+        else:
+            outcomes = await run_file_pipeline(
+                lambda cancelled: paths_to_process, _check_listed_file,
+                workers=MAX_CONCURRENT_FILES, scan=scan)
+
+    # Relative links are resolved once every file's headings are indexed
+    with stage("local_links"):
+        local_results = await resolve_local_links()
+
+    results_list: list[FileResults] = []
+    processed_files = []
+    error_files = {}
+    for file_path, res in outcomes:
+        if name in ("check_markdown_links_project", "check_markdown_links_changed"):
+            # Report relative paths from PROJECT_ROOT for readability; errors by full path
+            report_name = str(file_path.relative_to(PROJECT_ROOT))
+            error_name = str(file_path)
+        elif name == "check_markdown_link_file":
+            report_name = error_name = arguments.get("file_path", str(file_path))
+        else:
+            report_name = error_name = str(file_path)
+        if isinstance(res, FileResults):
+            scan.extend(res, local_results.get(file_path, ()))
+            results_list.append(res)
+            processed_files.append(report_name)
+        else:
+            error_files[error_name] = res
+    del outcomes
+
+    # --- Report ---
+    with stage("format"):
+        if name == "check_markdown_link_file":
+            report = _format_single_file_report(
+                arguments.get("file_path", ""),  # Use original path for report
+                scan, results_list, error_files)
+        else:
+            # report_source_info already contains the list of original paths for 'files'
+            # or the directory path for 'directory'
+            report = _format_consolidated_report(
+                report_source_info, scan, results_list, processed_files, error_files
+            )
 
     # Return the formatted report wrapped in TextContent list
     return [types.TextContent(type="text", text=report)]
 
 
+# --- Background Pre-warm ---
+
+_prewarm_task: asyncio.Task | None = None
+
+
+async def handle_initialized(notification: types.InitializedNotification):
+    """Starts the background pre-warm (see tools/prewarm.py) once the client is ready."""
+    global _prewarm_task
+    if not PREWARM_ENABLED:
+        return
+    logger.info(f"Starting background pre-warm of {PROJECT_ROOT}")
+    _prewarm_task = start_prewarm(lambda cancelled: _iter_project_files(PROJECT_ROOT, cancelled))
+
+
+server.notification_handlers[types.InitializedNotification] = handle_initialized
+
 # --- Main Server Loop ---
 
+# Overwritten on every start; set MCP_SERVER_LOG_FILE to log elsewhere
+LOG_FILE = os.environ.get(
+    "MCP_SERVER_LOG_FILE", os.path.join(os.path.dirname(__file__), "mcp_server_startup.log"))
+
+
+def _configure_logging():
+    """
+    Sends all logging to LOG_FILE (stdout carries the protocol). Called by run_server, not
+    at import, so importing the module has no side effects.
+    """
+    try:
+        file_handler = logging.FileHandler(LOG_FILE, mode='w')
+    except OSError as e:
+        # If logging setup fails, print to stderr and exit
+        print(f"CRITICAL: Failed to set up file logging to {LOG_FILE}: {e}", file=sys.stderr)
+        sys.exit(1)  # Exit if we can't even log
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG)  # Capture everything
+    root_logger.addHandler(file_handler)
+
+    root_logger.info(f"--- Script start logging to {LOG_FILE} ---")
+    root_logger.debug(f"Python executable: {sys.executable}")
+    root_logger.debug(f"sys.path: {sys.path}")
+    root_logger.debug(f"Current working directory: {os.getcwd()}")
+
 
 async def main():
     logger.info(f"Starting {SERVER_NAME} v{SERVER_VERSION}...")
@@ -464,6 +790,7 @@ async def main():
 
 def run_server():
     """Entry point for uv run."""
+    _configure_logging()
     asyncio.run(main())
 
 
@@ -0,0 +1,202 @@
+# src/mcp_server/tools/adaptive_timeouts.py
+
+"""
+Per-host request timeouts learned from observed latency.
+
+Instead of one fixed 10s total timeout, each request gets separate budgets:
+- connect: TCP connect, plus the TLS handshake for https (aiohttp performs the handshake
+  inside its connect step, so the two are timed and enforced together as sock_connect)
+- first_byte: from sending the request to the response headers (sock_read)
+- total: the whole request; every redirect hop gets its own budget
+
+Until a host has MIN_SAMPLES observations the defaults apply. After that each budget is
+P95_MULTIPLIER times the host's recent p95, clamped to the limits below, so fast hosts
+fail fast and slow but healthy hosts get the time they usually need.
+
+A host slower than the defaults would never answer in time, so it would never be
+sampled. A timeout on a host that is otherwise healthy therefore raises its first-byte
+and total budgets by TIMEOUT_GROWTH, up to the limits. "Healthy" means the host
+accepted the connection or has answered before. The retry, and later requests, get the
+raised budgets until MIN_SAMPLES answers have been sampled. A timeout while connecting
+raises nothing: unreachable hosts are left to the circuit breakers.
+"""
+
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import ClientTimeout
+
+DEFAULT_CONNECT_SECONDS = 5.0
+DEFAULT_TLS_SECONDS = 5.0  # Added to the connect budget for https until learned
+DEFAULT_FIRST_BYTE_SECONDS = 10.0
+DEFAULT_TOTAL_SECONDS = 10.0
+
+# (minimum, maximum) for learned budgets
+CONNECT_LIMITS = (1.0, 10.0)
+FIRST_BYTE_LIMITS = (2.0, 30.0)
+TOTAL_LIMITS = (3.0, 45.0)
+
+P95_MULTIPLIER = 3.0
+TIMEOUT_GROWTH = 2.0  # Budget raise after a timeout on a healthy host
+MIN_SAMPLES = 5
+SAMPLE_WINDOW = 50  # Most recent samples kept per host and measurement
+MAX_TRACKED_HOSTS = 5_000
+
+
+def _p95(samples: deque) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, int(0.95 * len(ordered) + 0.5) - 1)]
+
+
+def _clamp(value: float, limits: tuple[float, float]) -> float:
+    return min(max(value, limits[0]), limits[1])
+
+
+class TimeoutBudget:
+    """Timeout budgets in seconds for one request."""
+
+    __slots__ = ("connect", "first_byte", "total", "learned")
+
+    def __init__(self, connect: float, first_byte: float, total: float, learned: bool):
+        self.connect = connect
+        self.first_byte = first_byte
+        self.total = total
+        self.learned = learned
+
+    def client_timeout(self) -> ClientTimeout:
+        return ClientTimeout(total=self.total, sock_connect=self.connect,
+                             sock_read=self.first_byte)
+
+    def to_dict(self) -> dict:
+        return {
+            "connect": round(self.connect, 3),
+            "first_byte": round(self.first_byte, 3),
+            "total": round(self.total, 3),
+            "learned": self.learned,
+        }
+
+
+class HostSamples:
+    """Recent connect, first-byte and total latencies for one host."""
+
+    __slots__ = ("connect", "first_byte", "total", "scheme", "timeout_floor")
+
+    def __init__(self, scheme: str = "https"):
+        self.connect: deque = deque(maxlen=SAMPLE_WINDOW)
+        self.first_byte: deque = deque(maxlen=SAMPLE_WINDOW)
+        self.total: deque = deque(maxlen=SAMPLE_WINDOW)
+        self.scheme = scheme  # Of the latest request, for snapshot()
+        self.timeout_floor = 0.0  # Minimum first-byte/total budget after timeouts
+
+
+class AdaptiveTimeouts:
+    """Learns per-host timeout budgets from observed request latencies."""
+
+    def __init__(self):
+        self._hosts: dict[str, HostSamples] = {}
+
+    def clear(self):
+        self._hosts.clear()
+
+    def _samples(self, host: str, scheme: str) -> HostSamples:
+        samples = self._hosts.get(host)
+        if samples is None:
+            if len(self._hosts) >= MAX_TRACKED_HOSTS:
+                # Drop the oldest host (dicts keep insertion order)
+                self._hosts.pop(next(iter(self._hosts)))
+            samples = self._hosts[host] = HostSamples()
+        samples.scheme = scheme
+        return samples
+
+    def observe(self, host: str, total: float, first_byte: float, connect: float | None = None,
+                scheme: str = "https"):
+        """Records one request's latencies; connect is None when a pooled connection was reused."""
+        samples = self._samples(host, scheme)
+        samples.total.append(total)
+        samples.first_byte.append(first_byte)
+        if connect is not None:
+            samples.connect.append(connect)
+        if len(samples.total) >= MIN_SAMPLES:
+            samples.timeout_floor = 0.0  # Enough answers to go by
+
+    def observe_timeout(self, host: str, budget: TimeoutBudget, scheme: str = "https",
+                        connected: bool = False):
+        """
+        Records a request that ran out of `budget`. If the host accepted the connection
+        (`connected`) or has answered before, its next budgets are raised.
+        """
+        if not connected and host not in self._hosts:
+            return
+        samples = self._samples(host, scheme)
+        samples.timeout_floor = min(TIMEOUT_GROWTH * max(budget.first_byte, budget.total),
+                                    TOTAL_LIMITS[1])
+
+    def budget_for(self, host: str, scheme: str = "https") -> TimeoutBudget:
+        connect = DEFAULT_CONNECT_SECONDS + (DEFAULT_TLS_SECONDS if scheme == "https" else 0.0)
+        first_byte = DEFAULT_FIRST_BYTE_SECONDS
+        total = DEFAULT_TOTAL_SECONDS
+        samples = self._hosts.get(host)
+        learned = False
+        if samples is not None:
+            if len(samples.connect) >= MIN_SAMPLES:
+                connect = _clamp(P95_MULTIPLIER * _p95(samples.connect), CONNECT_LIMITS)
+                learned = True
+            if len(samples.first_byte) >= MIN_SAMPLES:
+                first_byte = _clamp(P95_MULTIPLIER * _p95(samples.first_byte), FIRST_BYTE_LIMITS)
+                total = _clamp(P95_MULTIPLIER * _p95(samples.total), TOTAL_LIMITS)
+                learned = True
+            if samples.timeout_floor:
+                first_byte = max(first_byte, min(samples.timeout_floor, FIRST_BYTE_LIMITS[1]))
+                total = max(total, samples.timeout_floor)
+                learned = True
+        return TimeoutBudget(connect, first_byte, total, learned)
+
+    def snapshot(self) -> dict[str, dict]:
+        """Returns the current budgets of every host with observations, for its latest scheme."""
+        return {host: self.budget_for(host, self._hosts[host].scheme).to_dict()
+                for host in sorted(self._hosts)}
+
+
+# --- aiohttp hooks measuring connect time and pool waits per request ---
+
+
+async def _on_queued_start(session, ctx: SimpleNamespace, params):
+    ctx.queued_start = time.perf_counter()
+
+
+async def _on_queued_end(session, ctx: SimpleNamespace, params):
+    _add(ctx, "queued", time.perf_counter() - ctx.queued_start)
+
+
+async def _on_create_start(session, ctx: SimpleNamespace, params):
+    ctx.connect_start = time.perf_counter()
+
+
+async def _on_create_end(session, ctx: SimpleNamespace, params):
+    _add(ctx, "connect", time.perf_counter() - ctx.connect_start)
+
+
+def _add(ctx: SimpleNamespace, key: str, seconds: float):
+    # trace_request_ctx is the dict the caller passed to the request
+    timings = ctx.trace_request_ctx
+    if isinstance(timings, dict):
+        timings[key] = timings.get(key, 0.0) + seconds
+
+
+def timing_trace_config() -> aiohttp.TraceConfig:
+    """
+    Returns a TraceConfig that fills the request's trace_request_ctx dict with
+    "connect" (new connection incl. TLS) and "queued" (connection pool wait) seconds.
+    """
+    config = aiohttp.TraceConfig()
+    config.on_connection_queued_start.append(_on_queued_start)
+    config.on_connection_queued_end.append(_on_queued_end)
+    config.on_connection_create_start.append(_on_create_start)
+    config.on_connection_create_end.append(_on_create_end)
+    return config
+
+
+# Shared timeouts for the server process
+ADAPTIVE_TIMEOUTS = AdaptiveTimeouts()
@@ -0,0 +1,232 @@
+# src/mcp_server/tools/anchors.py
+
+"""
+Fragment validation: does https://docs.x/page#section point at an element on the page?
+
+Opt-in per tool call (the `check_anchors` argument, default from MCP_SERVER_CHECK_ANCHORS),
+bound to the call through a ContextVar like the call deadline. Each distinct page is
+fetched once and streamed through an incremental HTML parser that collects its `id` and
+`<a name>` values; every fragment pointing at the page is checked against that set. The
+stdlib html.parser is used directly because BeautifulSoup needs the whole document in
+memory before it parses.
+
+Page indexes are cached for ANCHOR_TTL_SECONDS and then revalidated with the page's ETag
+and Last-Modified, so an unchanged page costs a 304. Bodies are read up to MAX_PAGE_BYTES;
+a fragment not found in a truncated page is reported as unverified, not broken.
+"""
+
+import asyncio
+import codecs
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING
+from urllib.parse import unquote, urlsplit
+
+from .metrics import METRICS
+from .status_cache import ERROR_TTL_SECONDS, OK_TTL_SECONDS
+
+if TYPE_CHECKING:  # The server reads the settings below at startup, before aiohttp is needed
+    from .adaptive_timeouts import TimeoutBudget
+    from .transport import Transport
+
+logger = logging.getLogger(__name__)
+
+CHECK_ANCHORS_DEFAULT = os.environ.get("MCP_SERVER_CHECK_ANCHORS", "").lower() in ("1", "true", "yes")
+MAX_PAGE_BYTES = int(os.environ.get("MCP_SERVER_ANCHOR_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+ANCHOR_TTL_SECONDS = OK_TTL_SECONDS
+MAX_INDEXED_PAGES = 2_000
+# Minimum total time for downloading a page, which takes longer than the HEAD checks
+PAGE_FETCH_SECONDS = 20.0
+
+# Fragments that are not element ids: client-side routes ("#/docs", "#!/docs"), text
+# fragments ("#:~:text=") and line anchors added by script on code hosts ("#L10-L20")
+_UNCHECKABLE_FRAGMENT = re.compile(r"^(?:[/!]|:~:|L\d+(?:-L\d+)?$)")
+# GitHub renders Markdown heading ids with this prefix and resolves the bare fragment in script
+_GITHUB_ID_PREFIX = "user-content-"
+_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+_check_anchors: ContextVar[bool] = ContextVar("check_anchors", default=CHECK_ANCHORS_DEFAULT)
+
+
+def start_anchor_checking(enabled: bool) -> object:
+    """Turns anchor validation on or off for the current tool call, returns the reset token."""
+    return _check_anchors.set(enabled)
+
+
+def stop_anchor_checking(token: object):
+    _check_anchors.reset(token)
+
+
+def anchor_checking_enabled() -> bool:
+    return _check_anchors.get()
+
+
+def checkable_fragment(link: str) -> str | None:
+    """Returns the decoded fragment of link if it should name an element, else None."""
+    fragment = urlsplit(link).fragment
+    if not fragment or fragment.lower() == "top" or _UNCHECKABLE_FRAGMENT.match(fragment):
+        return None  # "#top" always scrolls to the top of the page
+    return unquote(fragment)
+
+
+class _AnchorCollector(HTMLParser):
+    """Collects the values of id attributes and <a name=...> while fed chunk by chunk."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.anchors: set[str] = set()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]):
+        for name, value in attrs:
+            if value and (name == "id" or (name == "name" and tag == "a")):
+                self.anchors.add(value)
+                if value.startswith(_GITHUB_ID_PREFIX):
+                    self.anchors.add(value[len(_GITHUB_ID_PREFIX):])
+
+
+class PageAnchors:
+    """The anchors of one page, or why they could not be collected, plus its validators."""
+
+    __slots__ = ("anchors", "truncated", "failure", "etag", "last_modified", "expires_at")
+
+    def __init__(self, anchors: frozenset[str] | None, truncated: bool = False,
+                 failure: str | None = None, etag: str | None = None,
+                 last_modified: str | None = None):
+        self.anchors = anchors  # None: not an HTML page, fragments are not validated
+        self.truncated = truncated
+        self.failure = failure
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = time.monotonic() + (ERROR_TTL_SECONDS if failure else ANCHOR_TTL_SECONDS)
+
+    def check(self, fragment: str) -> tuple[str, str] | None:
+        """Returns None if fragment is fine (or cannot be judged), else (status, reason)."""
+        if self.failure is not None:
+            return ("ERROR", f"Anchor '#{fragment}' not verified: {self.failure}")
+        if self.anchors is None or fragment in self.anchors:
+            return None
+        if self.truncated:
+            return ("ERROR", f"Anchor '#{fragment}' not verified: page larger than {MAX_PAGE_BYTES} bytes")
+        return ("BROKEN", f"Anchor '#{fragment}' not found on page")
+
+
+class AnchorIndex:
+    """LRU-bounded cache of page URL -> PageAnchors; each page is fetched once at a time."""
+
+    def __init__(self, max_pages: int = MAX_INDEXED_PAGES):
+        self.max_pages = max_pages
+        self._pages: OrderedDict[str, PageAnchors] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def clear(self):
+        self._pages.clear()
+
+    async def page_anchors(self, transport: "Transport", page_url: str,
+                           headers: dict[str, str]) -> PageAnchors:
+        """Returns the anchors of page_url from the cache, revalidating or fetching as needed."""
+        entry = self._pages.get(page_url)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._pages.move_to_end(page_url)
+            METRICS.inc("anchor_index_hits")
+            return entry
+        while (pending := self._inflight.get(page_url)) is not None:
+            page = await asyncio.shield(pending)
+            if page is not None:
+                return page  # None: the fetching call was cancelled, try again
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[page_url] = future
+        try:
+            page = await self._fetch(transport, page_url, headers, entry)
+        except asyncio.CancelledError:
+            future.set_result(None)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so waiter-less failures do not warn
+            raise
+        finally:
+            self._inflight.pop(page_url, None)
+        future.set_result(page)
+        self._pages[page_url] = page
+        self._pages.move_to_end(page_url)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return page
+
+    async def _fetch(self, transport: "Transport", page_url: str, headers: dict[str, str],
+                     stale: PageAnchors | None) -> PageAnchors:
+        from .adaptive_timeouts import ADAPTIVE_TIMEOUTS, TimeoutBudget
+
+        parts = urlsplit(page_url)
+        learned = ADAPTIVE_TIMEOUTS.budget_for(parts.hostname or "", parts.scheme)
+        total = max(learned.total, PAGE_FETCH_SECONDS)
+        budget = TimeoutBudget(learned.connect, learned.first_byte, total, learned.learned)
+        headers = dict(headers)
+        if stale is not None and stale.failure is None:
+            if stale.etag:
+                headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                headers["If-Modified-Since"] = stale.last_modified
+        try:
+            return await asyncio.wait_for(self._read(transport, page_url, budget, headers, stale), total)
+        except asyncio.TimeoutError:
+            return PageAnchors(None, failure="Timeout")
+        except Exception as e:  # Connection errors and the like; the HEAD check already passed
+            logger.warning(f"Could not fetch {page_url} for anchor checks: {type(e).__name__}")
+            return PageAnchors(None, failure=type(e).__name__)
+
+    async def _read(self, transport: "Transport", page_url: str, budget: "TimeoutBudget",
+                    headers: dict[str, str], stale: PageAnchors | None) -> PageAnchors:
+        async with transport.get(page_url, budget=budget, headers=headers) as (response, chunks):
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if response.status == 304 and stale is not None:
+                METRICS.inc("anchor_pages_not_modified")
+                return PageAnchors(stale.anchors, stale.truncated, None,
+                                   etag or stale.etag, last_modified or stale.last_modified)
+            if not 200 <= response.status < 300:
+                return PageAnchors(None, failure=f"{response.status} {response.reason}")
+            content_type = response.headers.get("Content-Type", "")
+            if content_type and "html" not in content_type.lower():
+                return PageAnchors(None, etag=etag, last_modified=last_modified)
+
+            METRICS.inc("anchor_pages_fetched")
+            collector = _AnchorCollector()
+            decoder = codecs.getincrementaldecoder(_charset(content_type))(errors="replace")
+            received = 0
+            truncated = False
+            async for chunk in chunks:
+                received += len(chunk)
+                if received > MAX_PAGE_BYTES:
+                    chunk = chunk[:len(chunk) - (received - MAX_PAGE_BYTES)]
+                    truncated = True
+                collector.feed(decoder.decode(chunk))
+                if truncated:
+                    break  # Leaving the block drops the rest of the body
+            if not truncated:
+                collector.feed(decoder.decode(b"", final=True))
+                collector.close()
+            return PageAnchors(frozenset(collector.anchors), truncated, None, etag, last_modified)
+
+
+def _charset(content_type: str) -> str:
+    match = _CHARSET.search(content_type)
+    if match:
+        try:
+            return codecs.lookup(match.group(1)).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+# Shared page index for the server process
+ANCHOR_INDEX = AnchorIndex()
@@ -0,0 +1,60 @@
+# src/mcp_server/tools/canonical.py
+
+"""
+URL canonicalization for link checking.
+
+Links are reported as written, but deduplicated, cached, coalesced and requested by
+their canonical form, so spellings of the same resource cost one check:
+- scheme and host are lowercased
+- default ports (80 for http, 443 for https) are removed
+- percent-encoding is normalized: unreserved characters are decoded, the remaining
+  escapes use uppercase hex
+- the fragment is dropped; it is never sent to the server
+
+Paths are otherwise kept as written (no dot-segment removal, no trailing slash added), as
+servers are free to treat those spellings differently.
+"""
+
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_PERCENT_ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+# RFC 3986 unreserved characters, which never need escaping
+_UNRESERVED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+
+
+def _normalize_escape(match: re.Match) -> str:
+    char = chr(int(match.group(1), 16))
+    return char if char in _UNRESERVED else "%" + match.group(1).upper()
+
+
+def _normalize_percent_encoding(component: str) -> str:
+    if "%" not in component:
+        return component
+    return _PERCENT_ESCAPE.sub(_normalize_escape, component)
+
+
+def canonicalize(url: str) -> str:
+    """Returns the canonical network key of url; malformed URLs are returned unchanged."""
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    userinfo, at, hostport = parts.netloc.rpartition("@")
+    host = hostport.lower()
+    if port is not None:
+        host = host.rsplit(":", 1)[0]
+        if port != _DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{port}"
+    else:
+        host = host.rstrip(":")  # "example.com:" has an empty port
+    return urlunsplit((
+        scheme,
+        f"{userinfo}{at}{host}",
+        _normalize_percent_encoding(parts.path),
+        _normalize_percent_encoding(parts.query),
+        "",
+    ))
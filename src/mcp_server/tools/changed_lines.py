@@ -0,0 +1,133 @@
+# src/mcp_server/tools/changed_lines.py
+
+"""
+Diff-scoped checks: only the links on lines added or changed since a git ref.
+
+changed_markdown_lines() compares the work tree with the merge base of the ref and HEAD
+(so a branch is compared with the commit it forked from, and `HEAD` gives the uncommitted
+changes) and reads which lines of each changed Markdown file are new from the hunk
+headers of `git diff --unified=0`. The link checker keeps the links whose markdown-it
+token lines overlap those ranges (see link_checker._scan_changed_lines): unchanged files
+are not read, and a PR touching a few paragraphs checks a handful of URLs.
+"""
+
+import codecs
+import logging
+import re
+import subprocess
+from bisect import bisect_right
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+GIT_DIFF_TIMEOUT_SECONDS = 30
+# Hunk header: "@@ -12,3 +14,5 @@" -> old count 3, new start 14, new count 5 (counts default to 1)
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class ChangedLines:
+    """Lines of a file's current content that are not in the base, as 0-based [start, end) ranges."""
+
+    def __init__(self, ranges: list[tuple[int, int]] | None = None):
+        # None: the whole file is new (untracked files)
+        self.ranges = sorted(ranges) if ranges is not None else None
+        self._starts = [start for start, _ in self.ranges or ()]
+
+    @property
+    def whole_file(self) -> bool:
+        return self.ranges is None
+
+    def overlaps(self, first: int, last: int) -> bool:
+        """True if any line from first to last (0-based, inclusive) is changed."""
+        if self.ranges is None:
+            return True
+        i = bisect_right(self._starts, last) - 1
+        return i >= 0 and self.ranges[i][1] > first
+
+    def text(self, content: str) -> str:
+        """The changed lines of content, joined by newlines."""
+        # Lines end at "\n" only, as in git's hunk numbers and markdown-it's token maps;
+        # str.splitlines() would also split at form feeds, "\x85", "\u2028" and more
+        lines = content.split("\n")
+        if self.ranges is None:
+            return "\n".join(lines)
+        return "\n".join(line for start, end in self.ranges for line in lines[start:end])
+
+    def __repr__(self) -> str:
+        return f"ChangedLines({self.ranges!r})"
+
+
+def _unquote_path(path: str) -> str:
+    """Undoes git's C-style quoting of unusual file names ("docs/caf\\303\\251.md")."""
+    if not path.startswith('"'):
+        return path
+    return codecs.escape_decode(path[1:-1].encode())[0].decode("utf-8", "surrogateescape")
+
+
+def parse_diff(diff: str) -> dict[str, list[tuple[int, int]]]:
+    """
+    Changed line ranges of the new side of a `git diff --unified=0 --no-prefix` output, by
+    path. Files with only deletions or renames map to no ranges.
+    """
+    changed: dict[str, list[tuple[int, int]]] = {}
+    ranges: list[tuple[int, int]] | None = None
+    body = 0  # Hunk lines still to skip; they may start with "+++" or "@@" themselves
+    for line in diff.split("\n"):  # Not splitlines(): hunk bodies may hold form feeds
+        if body:
+            body -= not line.startswith("\\")  # "\ No newline at end of file" is not counted
+        elif line.startswith("+++ "):
+            path = line[4:].rstrip("\t")
+            ranges = None if path == "/dev/null" else changed.setdefault(_unquote_path(path), [])
+        elif line.startswith("@@ ") and (match := _HUNK_HEADER.match(line)):
+            old_count, start, count = (int(group) if group is not None else 1 for group in match.groups())
+            body = old_count + count
+            if count and ranges is not None:
+                ranges.append((start - 1, start - 1 + count))
+    return changed
+
+
+def _git(project_root: Path, *args: str) -> str | None:
+    """Output of a git command run in project_root, or None if it fails."""
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(project_root), "-c", "core.quotePath=false", *args],
+            capture_output=True, check=True, timeout=GIT_DIFF_TIMEOUT_SECONDS)
+    except FileNotFoundError:
+        raise ValueError("git is not installed; changed lines cannot be computed")
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.info(f"git {args[0]} failed in {project_root}: {e.__class__.__name__}")
+        return None
+    return completed.stdout.decode("utf-8", "surrogateescape")
+
+
+def changed_markdown_lines(project_root: Path, base_ref: str, untracked: bool = True
+                           ) -> dict[Path, ChangedLines]:
+    """
+    The *.md files under project_root with lines added or changed since base_ref, and
+    those lines. With `untracked`, untracked files that are not ignored count as new in
+    full. Raises ValueError if project_root is not in a git work tree or base_ref is not
+    a commit there.
+    """
+    if base_ref.startswith("-"):
+        raise ValueError(f"Invalid git ref: {base_ref}")
+    if _git(project_root, "rev-parse", "--is-inside-work-tree") is None:
+        raise ValueError(f"Not a git work tree: {project_root}")
+    base = (_git(project_root, "merge-base", base_ref, "HEAD")
+            or _git(project_root, "rev-parse", "--verify", "--quiet", f"{base_ref}^{{commit}}"))
+    if not base:
+        raise ValueError(f"Unknown git ref: {base_ref}")
+    base = base.strip()
+
+    diff = _git(project_root, "diff", "--unified=0", "--no-color", "--no-ext-diff", "--no-prefix",
+                "--find-renames", "--diff-filter=ACMR", "--relative", base, "--", "*.md")
+    if diff is None:
+        raise ValueError(f"Could not diff the work tree against {base_ref}")
+    changed = {project_root / path: ChangedLines(ranges)
+               for path, ranges in parse_diff(diff).items() if ranges}
+    if untracked:
+        others = _git(project_root, "ls-files", "-z", "--others", "--exclude-standard", "--", "*.md")
+        for path in (others or "").split("\0"):
+            if path:
+                changed[project_root / path] = ChangedLines()
+    logger.info(f"{len(changed)} Markdown files changed since {base_ref} ({base[:12]})")
+    return changed
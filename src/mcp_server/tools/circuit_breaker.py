@@ -0,0 +1,112 @@
+# src/mcp_server/tools/circuit_breaker.py
+
+"""
+Per-host circuit breakers, shared by all tool calls.
+
+After FAILURE_THRESHOLD consecutive timeouts or connection errors a host's breaker
+opens, and further URLs on it fail immediately instead of each waiting out the request
+timeout. Once the cooldown has passed a single probe request is let through
+(half-open): success closes the breaker, failure reopens it with a longer cooldown.
+Any HTTP response, even a 404 or 500, counts as success since the host answered.
+"""
+
+import time
+
+from .metrics import METRICS
+
+FAILURE_THRESHOLD = 5
+COOLDOWN_SECONDS = 30.0
+MAX_COOLDOWN_SECONDS = 300.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class HostCircuit:
+    """Breaker state for one host."""
+
+    __slots__ = ("state", "failures", "opened_at", "cooldown", "probe_in_flight")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.cooldown = COOLDOWN_SECONDS
+        self.probe_in_flight = False
+
+
+class CircuitBreakerRegistry:
+    """Tracks consecutive failures per host and decides whether a request may proceed."""
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD):
+        self.threshold = threshold
+        self._circuits: dict[str, HostCircuit] = {}
+
+    def clear(self):
+        self._circuits.clear()
+
+    def open_count(self) -> int:
+        return sum(1 for c in self._circuits.values() if c.state != CLOSED)
+
+    def state(self, host: str) -> str:
+        circuit = self._circuits.get(host)
+        return circuit.state if circuit is not None else CLOSED
+
+    def before_request(self, host: str) -> str | None:
+        """
+        Returns None if a request to host may proceed, or the reason it is refused.
+        When the cooldown has passed, the first caller becomes the half-open probe.
+        """
+        circuit = self._circuits.get(host)
+        if circuit is None or circuit.state == CLOSED:
+            return None
+        if circuit.state == OPEN:
+            remaining = circuit.opened_at + circuit.cooldown - time.monotonic()
+            if remaining > 0:
+                return self._refusal(circuit, f"retry in {remaining:.0f}s")
+            circuit.state = HALF_OPEN
+        if circuit.probe_in_flight:
+            return self._refusal(circuit, "probe in progress")
+        circuit.probe_in_flight = True
+        return None
+
+    def _refusal(self, circuit: HostCircuit, detail: str) -> str:
+        METRICS.inc("circuit_rejections")
+        return (f"Circuit open: host unreachable after {circuit.failures} consecutive "
+                f"failures ({detail})")
+
+    def record_success(self, host: str):
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            return
+        if circuit.state != CLOSED:
+            METRICS.inc("circuits_closed")
+        # Forget the host entirely so the registry only holds failing hosts
+        del self._circuits[host]
+
+    def record_failure(self, host: str):
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = HostCircuit()
+        circuit.failures += 1
+        if circuit.state == HALF_OPEN:
+            # Probe failed: back off further before the next one
+            circuit.probe_in_flight = False
+            circuit.cooldown = min(circuit.cooldown * 2, MAX_COOLDOWN_SECONDS)
+            circuit.state = OPEN
+            circuit.opened_at = time.monotonic()
+        elif circuit.state == CLOSED and circuit.failures >= self.threshold:
+            METRICS.inc("circuits_opened")
+            circuit.state = OPEN
+            circuit.opened_at = time.monotonic()
+
+    def release_probe(self, host: str):
+        """Frees the half-open slot when a probe ends without a verdict (e.g. cancelled)."""
+        circuit = self._circuits.get(host)
+        if circuit is not None:
+            circuit.probe_in_flight = False
+
+
+# Shared breakers for the server process
+CIRCUIT_BREAKERS = CircuitBreakerRegistry()
@@ -0,0 +1,85 @@
+# src/mcp_server/tools/deadline.py
+
+"""
+Whole-call deadline, bound to the current tool call through a ContextVar.
+
+The server starts a deadline for every tool call, from the `time_budget_seconds` argument
+or DEFAULT_CALL_DEADLINE_SECONDS. Anything deep in the scan path can ask how much time
+is left (before retrying, before starting the next file, while waiting on URL checks)
+without a deadline argument being threaded through every helper. Work dropped because
+the budget ran out is counted so the server can say how partial the result is.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+
+# Upper bound for a tool call that does not pass time_budget_seconds
+DEFAULT_CALL_DEADLINE_SECONDS = float(os.environ.get("MCP_SERVER_CALL_DEADLINE_SECONDS", "300"))
+# Reason reported for URLs and files that were not checked before the deadline
+NOT_CHECKED_REASON = "not checked (budget)"
+
+
+class Deadline:
+    """A monotonic expiry time plus counts of the work skipped because it passed."""
+
+    __slots__ = ("seconds", "expires_at", "skipped_urls", "skipped_files", "discovery_stopped")
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.skipped_urls = 0
+        self.skipped_files = 0
+        self.discovery_stopped = False
+
+    def format_note(self) -> str | None:
+        """Describes what was skipped, or None if the call finished within its budget."""
+        if not (self.skipped_urls or self.skipped_files or self.discovery_stopped):
+            return None
+        note = (f"Time budget of {self.seconds:g}s exhausted: results are partial. "
+                f"{self.skipped_urls} URLs and {self.skipped_files} files were "
+                f"{NOT_CHECKED_REASON}.")
+        if self.discovery_stopped:
+            note += " File discovery stopped at the deadline; files not yet found are not counted."
+        return note
+
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar("call_deadline", default=None)
+
+
+def start_deadline(seconds: float | None) -> tuple[Deadline | None, object]:
+    """Binds a deadline `seconds` from now (None for no deadline), returns (deadline, token)."""
+    deadline = None if seconds is None else Deadline(seconds)
+    return deadline, _current_deadline.set(deadline)
+
+
+def stop_deadline(token: object):
+    _current_deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current call's deadline, or None if there is none."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline.expires_at - time.monotonic()
+
+
+def expired() -> bool:
+    time_left = remaining()
+    return time_left is not None and time_left <= 0
+
+
+def note_skipped(urls: int = 0, files: int = 0):
+    """Counts URLs or files dropped because the current call's deadline passed."""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.skipped_urls += urls
+        deadline.skipped_files += files
+
+
+def note_discovery_stopped():
+    """Records that the current call stopped looking for files when its deadline passed."""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.discovery_stopped = True
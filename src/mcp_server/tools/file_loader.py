@@ -0,0 +1,144 @@
+# src/mcp_server/tools/file_loader.py
+
+"""
+Bulk file loading, the read stage of project scans (see pipeline.py).
+
+Reading every file through aiofiles costs several thread pool round trips per file
+(open, read, close), which on thousands of small docs outweighs the I/O itself.
+BulkLoader reads files ahead of the checkers instead: small files in batches of up to
+LOADER_BATCH_FILES with plain blocking reads, one pool job per batch, on a dedicated
+pool of LOADER_THREADS. Larger files are left to the checker's own read so they do not
+hold up a batch, and so are files big enough to be streamed (see streaming.py).
+Contents are kept as bytes and decoded only when the checker takes them, and at most
+LOADER_READ_AHEAD_FILES read files wait to be taken, which bounds memory.
+
+The loader is bound to the tool call through a ContextVar, like the call deadline;
+_check_single_file takes a file from it when one is active.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Protocol
+
+from .deadline import expired
+from .metrics import METRICS
+from .profiling import stage
+from .streaming import STREAM_THRESHOLD_BYTES
+
+LOADER_THREADS = int(os.environ.get("MCP_SERVER_LOADER_THREADS", "4"))
+LOADER_BATCH_FILES = 32
+# Files at least this large are read by the checker itself, not in a batch
+LOADER_LARGE_FILE_BYTES = 256 * 1024
+LOADER_READ_AHEAD_FILES = 128
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Returns the loader's thread pool, created on first use and kept for the process."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=LOADER_THREADS, thread_name_prefix="file-loader")
+    return _executor
+
+
+class LoadedFile:
+    """A file's raw bytes, or the error reading it raised."""
+
+    __slots__ = ("path", "data", "error")
+
+    def __init__(self, path: Path, data: bytes | None = None, error: Exception | None = None):
+        self.path = path
+        self.data = data
+        self.error = error
+
+    def text(self) -> str:
+        """Decodes the contents as UTF-8; raises the read error, as the read itself would."""
+        if self.error is not None:
+            raise self.error
+        return self.data.decode("utf-8")
+
+
+def _read_batch(paths: list[Path]) -> list[LoadedFile | None]:
+    """Reads a batch of files in one pool job; None for files left to the checker."""
+    loaded: list[LoadedFile | None] = []
+    for path in paths:
+        try:
+            if os.stat(path).st_size >= min(LOADER_LARGE_FILE_BYTES, STREAM_THRESHOLD_BYTES):
+                loaded.append(None)
+                continue
+            with open(path, "rb") as f:
+                loaded.append(LoadedFile(path, f.read()))
+        except Exception as e:
+            loaded.append(LoadedFile(path, error=e))
+    return loaded
+
+
+class Source(Protocol):
+    """A stage's input: get() returns the next (index, path), or None once it is exhausted."""
+
+    async def get(self) -> tuple[int, Path] | None: ...
+
+    def get_nowait(self) -> tuple[int, Path] | None: ...
+
+
+class BulkLoader:
+    """Reads the paths of `source` in batches; get() hands them on, in order, once read."""
+
+    def __init__(self, source: Source):
+        self._source = source
+        self._ready: asyncio.Queue = asyncio.Queue(maxsize=LOADER_READ_AHEAD_FILES)
+        self._loaded: dict[Path, LoadedFile] = {}
+
+    async def run(self):
+        """The stage's task: reads batches until source is exhausted, then ends get()."""
+        loop = asyncio.get_running_loop()
+        while (item := await self._source.get()) is not None:
+            batch = [item]
+            while len(batch) < LOADER_BATCH_FILES and (item := self._source.get_nowait()) is not None:
+                batch.append(item)
+            if expired():
+                # Past the deadline the checkers skip every file; do not read them
+                for item in batch:
+                    await self._ready.put(item)
+                continue
+            with stage("read"):
+                loaded = await loop.run_in_executor(
+                    _get_executor(), _read_batch, [path for _, path in batch])
+            METRICS.inc("loader_batches")
+            for item, contents in zip(batch, loaded):
+                if contents is None:
+                    METRICS.inc("loader_files_deferred")
+                else:
+                    self._loaded[item[1]] = contents
+                await self._ready.put(item)
+        await self._ready.put(None)
+
+    async def get(self) -> tuple[int, Path] | None:
+        item = await self._ready.get()
+        if item is None:
+            self._ready.put_nowait(None)  # Every consumer sees the end
+        return item
+
+    def take(self, path: Path) -> LoadedFile | None:
+        """path's contents, once; None for files the checker should read itself."""
+        return self._loaded.pop(path, None)
+
+
+_current_loader: ContextVar[BulkLoader | None] = ContextVar("bulk_loader", default=None)
+
+
+def start_loading(loader: BulkLoader) -> object:
+    """Binds loader to the current tool call, returns the reset token."""
+    return _current_loader.set(loader)
+
+
+def stop_loading(token: object):
+    _current_loader.reset(token)
+
+
+def current_loader() -> BulkLoader | None:
+    return _current_loader.get()
@@ -3,49 +3,111 @@
 import asyncio
 import logging
 import re
+import threading
+import time
+from pathlib import Path
 
 # Import requests later when implementing link checking
 # import requests
 from typing import Any
+from urllib.parse import urlsplit
 
 import aiohttp  # Import async HTTP client
-from aiohttp import ClientTimeout  # Import ClientTimeout
 from markdown_it import MarkdownIt
 
+from .adaptive_timeouts import ADAPTIVE_TIMEOUTS
+from .anchors import ANCHOR_INDEX, anchor_checking_enabled, checkable_fragment
+from .canonical import canonicalize
+from .changed_lines import ChangedLines
+from .circuit_breaker import CIRCUIT_BREAKERS, HALF_OPEN
+from .deadline import NOT_CHECKED_REASON, expired, note_skipped, remaining
+from .local_links import collect_anchors, current_local_index, is_local_link
+from .metrics import METRICS, PARSE_BUCKETS
+from .profiling import stage
+from .resolver import RESOLVER
+from .retry import RETRY_POLICY, TRANSIENT_STATUSES, is_transient_error
+from .status_cache import STATUS_CACHE
+from .streaming import iter_markdown_chunks
+from .tracing import span
+from .transport import Transport, as_transport, open_transport
+
 logger = logging.getLogger(__name__)
 
+METRICS.register_gauge("cache_entries", lambda: len(STATUS_CACHE))
+METRICS.register_gauge("cache_validators", STATUS_CACHE.validator_count)
+METRICS.register_gauge("anchor_index_pages", lambda: len(ANCHOR_INDEX))
+METRICS.register_gauge("dns_cache_entries", lambda: len(RESOLVER))
+METRICS.register_gauge("circuits_open", CIRCUIT_BREAKERS.open_count)
+METRICS.register_host_gauges("host_timeout_seconds", ADAPTIVE_TIMEOUTS.snapshot)
+
 # --- Link Extraction Logic (Using markdown-it-py) ---
 
+_markdown_parser: MarkdownIt | None = None
+
+
+def _get_markdown_parser() -> MarkdownIt:
+    """Returns a shared parser; MarkdownIt keeps no per-parse state, so reuse is safe."""
+    global _markdown_parser
+    if _markdown_parser is None:
+        # Enable linkify to auto-detect bare URLs
+        _markdown_parser = MarkdownIt(options_update={'linkify': True})
+    return _markdown_parser
+
 
 def _extract_links(content: str) -> list[str]:
     """
     Extracts HTTP and HTTPS links from a string containing Markdown using markdown-it-py.
     Handles plain URLs and URLs within Markdown [text](url) syntax.
     """
+    return _scan_markdown(content)[0]
+
+
+def _scan_markdown(content: str, local: bool = False, env: dict | None = None,
+                   headings: dict[str, int] | None = None,
+                   link_lines: dict[str, list[tuple[int, int]]] | None = None
+                   ) -> tuple[list[str], list[str], set[str]]:
+    """
+    Parses content once and returns (HTTP(S) links, relative link hrefs, heading anchors).
+    The HTTP links are deduplicated and sorted; relative hrefs keep document order. The
+    last two are only collected with `local`, for offline relative link checks.
+    `env` and `headings` carry reference definitions and heading counts between the chunks
+    of one file (see check_links_in_file). With `link_lines`, the (first, last) 0-based
+    lines of every occurrence of each link are added to it, from the token line maps.
+    """
     if not content:
-        return []
+        return [], [], set()
 
     links: set[str] = set()
-    # Enable linkify to auto-detect bare URLs
-    md = MarkdownIt(options_update={'linkify': True})
+    local_links: dict[str, None] = {}  # Ordered set
+    md = _get_markdown_parser()
     try:
         # Parse the block tokens first
-        block_tokens = md.parse(content)
+        block_tokens = md.parse(content, env)
     except Exception as e:
         logger.error(f"Markdown parsing failed: {e}", exc_info=True)
-        return []
+        return [], [], set()
 
     # Iterate through block tokens, then process inline content
     for token in block_tokens:
         if token.type == 'inline' and token.children:
+            # Inline tokens carry their block's lines; children only advance through breaks
+            line = token.map[0] if link_lines is not None and token.map else None
+            open_link: tuple[str, int | None] | None = None
             # Process inline tokens within the block
             for child in token.children:
                 if child.type == 'link_open':
                     href = child.attrGet('href')
-                    # logger.debug(f"      Found link_open child, href='{href}'") # Removed debug
                     # Ensure href is a string before calling startswith
                     if isinstance(href, str) and (href.startswith("http://") or href.startswith("https://")):
                         links.add(href)
+                        open_link = (href, line)
+                    elif local and isinstance(href, str) and is_local_link(href):
+                        local_links[href] = None
+                        open_link = (href, line)
+                elif child.type == 'link_close' and open_link is not None:
+                    if line is not None:
+                        link_lines.setdefault(open_link[0], []).append((open_link[1], line))
+                    open_link = None
                 elif child.type == 'text' and child.content:
                     potential_links = re.findall(
                         r"https?://[^\s<>\"\']+", child.content)
@@ -53,50 +115,156 @@ def _extract_links(content: str) -> list[str]:
                         cleaned_link = link.rstrip('.,;!?)')
                         if cleaned_link:
                             links.add(cleaned_link)
+                            if line is not None:
+                                link_lines.setdefault(cleaned_link, []).append((line, line))
+                elif line is not None:
+                    if child.type in ('softbreak', 'hardbreak'):
+                        line += 1
+                    else:
+                        line += child.content.count("\n")  # Inline HTML may span lines
 
-    return sorted(list(links))
+    anchors = collect_anchors(block_tokens, headings) if local else set()
+    return sorted(list(links)), list(local_links), anchors
+
+
+def _scan_changed_lines(content: str, changed: ChangedLines, local: bool = False
+                        ) -> tuple[list[str], list[str], set[str]]:
+    """
+    _scan_markdown keeping only the links on changed lines: those with an occurrence whose
+    token lines overlap them, or that appear in their text (reference definitions have no
+    tokens; an edited definition changes the links that use it). Anchors are kept whole.
+    """
+    link_lines: dict[str, list[tuple[int, int]]] = {}
+    links, local_links, anchors = _scan_markdown(content, local, link_lines=link_lines)
+    if changed.whole_file:
+        return links, local_links, anchors
+    changed_text = changed.text(content)
+
+    def on_changed_lines(link: str) -> bool:
+        return (any(changed.overlaps(first, last) for first, last in link_lines.get(link, ()))
+                or link in changed_text)
+
+    kept = [link for link in links if on_changed_lines(link)]
+    kept_local = [href for href in local_links if on_changed_lines(href)]
+    METRICS.inc("links_outside_changes", len(links) + len(local_links) - len(kept) - len(kept_local))
+    return kept, kept_local, anchors
 
 
 # --- Link Status Checking Logic ---
 
 MAX_REDIRECTS = 5  # Prevent infinite redirect loops
 USER_AGENT = "CareerAgentMCP/0.1 (LinkChecker)"  # Basic user agent
-TIMEOUT_SECONDS = 10  # Request timeout
-TIMEOUT = ClientTimeout(total=TIMEOUT_SECONDS)
+# Request timeouts are per host and learned from latency, see adaptive_timeouts.py
 
 
 async def _check_link_status(
-    session: aiohttp.ClientSession,
+    session: aiohttp.ClientSession | Transport,
     url: str,
     *,  # Force subsequent arguments to be keyword-only
     _redirect_depth: int = 0  # Internal recursion counter
 ) -> tuple[str, str | None]:
     """
-    Checks the status of a single URL using an existing aiohttp session.
-    Handles redirects manually up to MAX_REDIRECTS.
+    Checks the status of a single URL using an open Transport (or a bare aiohttp session).
+    Handles redirects manually up to MAX_REDIRECTS, and retries transient failures
+    per RETRY_POLICY as long as the call's deadline leaves room for another attempt.
+    A URL whose host stays unreachable counts as one failure for the host's circuit
+    breaker, however many attempts it took; a half-open probe is not retried.
     Returns tuple: (status_string, error_string_or_None)
     Status can be "OK", "BROKEN", "ERROR".
     """
     if _redirect_depth > MAX_REDIRECTS:
         logger.warning(f"Link ERROR (Too many redirects): {url}")
         return ("ERROR", "Too many redirects")
+    if _redirect_depth == 0:
+        METRICS.inc("urls_checked")
 
-    try:
-        async with session.head(
-            url,
-            timeout=TIMEOUT,
-            headers={"User-Agent": USER_AGENT},
-            allow_redirects=False  # Handle redirects manually
-        ) as response:
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    attempt = 0
+    result: tuple[str, str | None] | None = None
+    host_failed = False
+    while True:
+        # Fail fast on hosts that keep timing out or refusing connections
+        refusal = CIRCUIT_BREAKERS.before_request(host)
+        if refusal is not None:
+            if result is None:
+                logger.warning(f"Link ERROR ({refusal}): {url}")
+                return ("ERROR", refusal)
+            break  # The breaker opened meanwhile; report this URL's own failure
+        is_probe = CIRCUIT_BREAKERS.state(host) == HALF_OPEN
+        result, transient, host_failed = await _check_once(session, url, _redirect_depth)
+        attempt += 1
+        if not transient or attempt >= RETRY_POLICY.max_attempts:
+            break
+        if is_probe and host_failed:
+            # A failed half-open probe reopens the breaker right away: while it backed off
+            # before a retry, other URLs on the host would be let in as probes too
+            break
+        delay = RETRY_POLICY.backoff(attempt - 1)
+        time_left = remaining()
+        next_budget = ADAPTIVE_TIMEOUTS.budget_for(host, parts.scheme).total
+        if time_left is not None and time_left < delay + next_budget:
+            # Another attempt could run past the call's deadline; keep this result
+            METRICS.inc("retries_skipped_deadline")
+            break
+        METRICS.inc("retries")
+        logger.info(f"Retrying {url} in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{RETRY_POLICY.max_attempts}, {result[1]})")
+        await asyncio.sleep(delay)
+    if host_failed:
+        CIRCUIT_BREAKERS.record_failure(host)
+    return result
+
+
+async def _check_once(
+    session: aiohttp.ClientSession | Transport, url: str, redirect_depth: int
+) -> tuple[tuple[str, str | None], bool, bool]:
+    """
+    Makes one request for url, once the host's circuit breaker has let it through.
+    Returns ((status, reason), is_transient_failure, host_unreachable).
+    """
+    transport = as_transport(session)
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    is_probe = CIRCUIT_BREAKERS.state(host) == HALF_OPEN
+
+    budget = ADAPTIVE_TIMEOUTS.budget_for(host, parts.scheme)
+    # Revalidate URLs seen before: unchanged resources answer with a cheap 304
+    conditional = STATUS_CACHE.conditional_headers(url)
+    timings: dict[str, float] = {}  # Filled with connect/queued seconds by timing_trace_config
+    request_start = time.perf_counter()
+    with span("check_url", "network", url=url, host=host, hop=redirect_depth,
+              transport=transport.name) as span_args:
+        try:
+            response = await transport.head(
+                url, budget=budget, headers={"User-Agent": USER_AGENT, **conditional},
+                timings=timings)
+            # Latency to response headers, per hop
+            latency = time.perf_counter() - request_start
+            METRICS.observe_host_latency(host, latency)
+            connect = timings.get("connect")
+            first_byte = latency - (connect or 0.0) - timings.get("queued", 0.0)
+            ADAPTIVE_TIMEOUTS.observe(host, latency, max(first_byte, 0.0), connect, parts.scheme)
+            CIRCUIT_BREAKERS.record_success(host)
+            span_args["status"] = response.status
             if 200 <= response.status < 300:
                 logger.debug(f"Link OK ({response.status}): {url}")
-                return ("OK", None)
+                STATUS_CACHE.remember_validators(
+                    url, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                return ("OK", None), False, False
+            elif response.status == 304 and conditional:
+                logger.debug(f"Link OK (304 Not Modified): {url}")
+                METRICS.inc("revalidated_not_modified")
+                if "ETag" in response.headers or "Last-Modified" in response.headers:
+                    STATUS_CACHE.remember_validators(
+                        url, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                return ("OK", None), False, False
             elif 300 <= response.status < 400:
                 location = response.headers.get('Location')
                 if not location:
                     reason = f"{response.status} {response.reason} (Redirect without Location)"
                     logger.warning(f"Link BROKEN ({reason}): {url}")
-                    return ("BROKEN", reason)
+                    return ("BROKEN", reason), False, False
 
                 # Resolve relative redirects (basic handling)
                 # TODO: More robust relative URL resolution if needed
@@ -107,41 +275,203 @@ async def _check_link_status(
 
                 logger.debug(
                     f"Redirect ({response.status}) from {url} to {redirect_url}")
-                # Recursively check the new location
+                METRICS.inc("redirects_followed")
+                # Recursively check the new location (with its own retries)
                 return await _check_link_status(
                     session,
                     str(redirect_url),  # Convert back to string
-                    _redirect_depth=_redirect_depth + 1
-                )
+                    _redirect_depth=redirect_depth + 1
+                ), False, False
             else:
                 reason = f"{response.status} {response.reason}"
                 logger.warning(f"Link BROKEN ({reason}): {url}")
-                return ("BROKEN", reason)
-
-    except asyncio.TimeoutError:
-        logger.warning(f"Link ERROR (Timeout): {url}")
-        return ("ERROR", "Timeout")
-    except aiohttp.ClientError as e:
-        err_type = type(e).__name__
-        # Log specific connection errors differently? Maybe later.
-        logger.warning(f"Link ERROR ({err_type}): {url}")
-        return ("ERROR", err_type)
-    except Exception as e:
-        err_type = type(e).__name__
-        # Log full traceback for unexpected
-        logger.exception(f"Unexpected error checking {url}: {e}")
-        return ("ERROR", f"Unexpected: {err_type}")
+                if response.status not in TRANSIENT_STATUSES:
+                    STATUS_CACHE.forget_validators(url)
+                return ("BROKEN", reason), response.status in TRANSIENT_STATUSES, False
+
+        except asyncio.TimeoutError:
+            METRICS.inc("timeouts")
+            # A slow host that did accept the connection gets a longer budget next time
+            ADAPTIVE_TIMEOUTS.observe_timeout(host, budget, parts.scheme, connected="connect" in timings)
+            logger.warning(f"Link ERROR (Timeout, budget {budget.to_dict()}): {url}")
+            return ("ERROR", "Timeout"), True, True
+        except aiohttp.ClientError as e:
+            METRICS.inc("client_errors")
+            err_type = type(e).__name__
+            # Log specific connection errors differently? Maybe later.
+            logger.warning(f"Link ERROR ({err_type}): {url}")
+            return ("ERROR", err_type), is_transient_error(e), isinstance(e, aiohttp.ClientConnectionError)
+        except Exception as e:
+            err_type = type(e).__name__
+            # Log full traceback for unexpected
+            logger.exception(f"Unexpected error checking {url}: {e}")
+            return ("ERROR", f"Unexpected: {err_type}"), False, False
+        finally:
+            if is_probe:
+                # No-op if the probe already closed or reopened the breaker
+                CIRCUIT_BREAKERS.release_probe(host)
 
 
-async def check_links_in_content(content: str) -> dict[str, Any]:
+# --- Singleflight: one request per URL at a time, shared across tool calls ---
+
+# Normalized URL -> future of the check currently running for it
+_INFLIGHT: dict[str, asyncio.Future] = {}
+# Result given to waiters when the leading check was cancelled before finishing
+_ABANDONED = object()
+
+
+def _inflight_key(url: str) -> str:
+    """Coalescing key: the canonical URL, so every spelling of a resource shares one check."""
+    return canonicalize(url)
+
+
+async def _check_link_coalesced(session: aiohttp.ClientSession | Transport, url: str) -> tuple[str, str | None]:
     """
-    Extracts links and checks their status concurrently.
-    Returns a dictionary with results.
+    Runs _check_link_status(session, url) unless a check of the same canonical URL is
+    already running, in this call or a concurrent one, in which case its result is shared.
+    If the leading check is cancelled (its call was cancelled or ran out of time), one of
+    the waiters takes over with its own session.
     """
-    extracted_links = _extract_links(content)
-    if not extracted_links:
-        logger.info("No links found to check.")
-        return {"total": 0, "valid": [], "broken": [], "errors": []}
+    key = _inflight_key(url)
+    while (pending := _INFLIGHT.get(key)) is not None:
+        METRICS.inc("singleflight_shared")
+        # Shield so a waiter's own cancellation does not cancel the shared check
+        result = await asyncio.shield(pending)
+        if result is not _ABANDONED:
+            return result
+
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT[key] = future
+    try:
+        result = await _check_link_status(session, url)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.set_result(_ABANDONED)
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved so waiter-less failures do not warn
+        raise
+    finally:
+        _INFLIGHT.pop(key, None)
+
+
+def _deadline_timeout() -> float | None:
+    """Seconds to wait for before the call's deadline, for asyncio timeouts (None: no deadline)."""
+    time_left = remaining()
+    return None if time_left is None else max(time_left, 0.0)
+
+
+def _cache_when_done(link: str):
+    """Returns a done-callback storing a finished check in STATUS_CACHE right away."""
+    def callback(task: asyncio.Task):
+        if task.cancelled() or task.exception() is not None:
+            return  # Unfinished and failed tasks are not cached
+        result = task.result()
+        if isinstance(result, tuple) and len(result) == 2:
+            STATUS_CACHE.set(link, result[0], result[1])
+    return callback
+
+
+async def _gather_within_deadline(links: list[str], coros: list, *, cache_results: bool = True) -> list:
+    """
+    Like gather(*coros, return_exceptions=True), but stops at the call's deadline:
+    checks still running are cancelled, which releases their connections, and come
+    back as None. With cache_results, each result is cached as soon as its check
+    finishes, so work done before a deadline or a client cancellation is kept.
+    """
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    if cache_results:
+        for link, task in zip(links, tasks):
+            task.add_done_callback(_cache_when_done(link))
+    try:
+        _, not_done = await asyncio.wait(tasks, timeout=_deadline_timeout())
+    except asyncio.CancelledError:
+        # The tool call was cancelled: stop every check instead of leaving them orphaned
+        for task in tasks:
+            task.cancel()
+        raise
+    for task in not_done:
+        task.cancel()
+    if not_done:
+        await asyncio.wait(not_done)
+    return [None if t.cancelled() else (t.exception() or t.result()) for t in tasks]
+
+
+async def _check_anchors(links: list[str], canonical_links: dict[str, str],
+                         link_results: list) -> list:
+    """
+    Validates the fragments of links whose page is OK against each page's anchor index.
+    Returns link_results with missing anchors turned into BROKEN (or ERROR when the page
+    could not be indexed); pages are fetched once per canonical URL.
+    """
+    fragments = [
+        checkable_fragment(link) if isinstance(result, tuple) and result[0] == "OK" else None
+        for link, result in zip(links, link_results)
+    ]
+    pages = list(dict.fromkeys(
+        canonical_links[link] for link, fragment in zip(links, fragments) if fragment is not None))
+    if not pages:
+        return link_results
+
+    indexes: list = [None] * len(pages)  # None: not fetched before the deadline
+    if not expired():
+        with stage("anchors"), span("anchor_index", "network", pages=len(pages)):
+            headers = {"User-Agent": USER_AGENT}
+            async with open_transport() as transport:
+                indexes = await _gather_within_deadline(
+                    pages, [ANCHOR_INDEX.page_anchors(transport, page, headers) for page in pages],
+                    cache_results=False)
+    page_index = dict(zip(pages, indexes))
+
+    checked = list(link_results)
+    skipped = 0
+    for i, (link, fragment) in enumerate(zip(links, fragments)):
+        if fragment is None:
+            continue
+        index = page_index[canonical_links[link]]
+        if index is None:
+            skipped += 1
+            checked[i] = ("ERROR", f"Anchor '#{fragment}' {NOT_CHECKED_REASON}")
+        elif isinstance(index, Exception):
+            checked[i] = ("ERROR", f"Anchor '#{fragment}' not verified: {type(index).__name__}")
+        elif (verdict := index.check(fragment)) is not None:
+            if verdict[0] == "BROKEN":
+                METRICS.inc("anchors_broken")
+                logger.warning(f"Link BROKEN ({verdict[1]}): {link}")
+            checked[i] = verdict
+    METRICS.inc("anchors_checked", sum(1 for f in fragments if f is not None))
+    if skipped:
+        METRICS.inc("urls_skipped_budget", skipped)
+        note_skipped(urls=skipped)
+    return checked
+
+
+async def check_links_in_content(content: str, *, source: Path | None = None,
+                                 changed_lines: ChangedLines | None = None) -> dict[str, Any]:
+    """
+    Extracts links and checks their status concurrently, and their fragments when anchor
+    checking is on for the call. Returns a dictionary with results. URLs still unchecked
+    when the call's deadline passes are listed under "errors" with NOT_CHECKED_REASON.
+
+    With `source` (the file content was read from) and a local link index bound to the
+    call, the file's headings and relative links are added to the index; those links are
+    resolved once the whole scan has been parsed (see local_links.resolve_local_links).
+    With `changed_lines`, only the links on those lines are checked (see changed_lines.py).
+    """
+    local_index = current_local_index() if source is not None else None
+    parse_start = time.perf_counter()
+    with stage("parse"):
+        if changed_lines is not None:
+            extracted_links, local_links, anchors = _scan_changed_lines(
+                content, changed_lines, local=local_index is not None)
+        elif local_index is None:
+            extracted_links = _extract_links(content)
+        else:
+            extracted_links, local_links, anchors = _scan_markdown(content, local=True)
+    METRICS.inc("files_parsed")
+    METRICS.observe("parse_seconds", time.perf_counter() - parse_start, PARSE_BUCKETS)
 
     results: dict[str, Any] = {
         "total": len(extracted_links),
@@ -149,13 +479,90 @@ async def check_links_in_content(content: str) -> dict[str, Any]:
         "broken": [],
         "errors": []
     }
+    if local_index is not None:
+        local_index.add_file(source, anchors, local_links)
+    if not extracted_links:
+        logger.info("No links found to check.")
+        return results
 
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            _check_link_status(session, link) for link in extracted_links
-        ]
-        link_results = await asyncio.gather(*tasks, return_exceptions=True)
+    link_results = await _check_extracted_links(extracted_links)
+    return _collect_results(results, extracted_links, link_results)
 
+
+async def _check_extracted_links(extracted_links: list[str]) -> list:
+    """
+    Checks deduplicated links (cache, DNS, network, then anchors when enabled); returns
+    one ("OK"|"BROKEN"|"ERROR", reason) tuple or exception per link, in input order.
+    """
+    # Links are reported as written but checked and cached by canonical URL
+    canonical_links = {link: canonicalize(link) for link in extracted_links}
+    unique_links = list(dict.fromkeys(canonical_links.values()))
+    if len(unique_links) < len(extracted_links):
+        METRICS.inc("canonical_duplicates", len(extracted_links) - len(unique_links))
+
+    # Serve fresh results from the shared cache, only hit the network for misses
+    outcomes: dict[str, Any] = {}
+    to_check = []
+    with span("cache_lookup", "cache", links=len(unique_links)) as span_args:
+        for link in unique_links:
+            cached = STATUS_CACHE.get(link)
+            if cached is None:
+                to_check.append(link)
+            else:
+                outcomes[link] = cached
+        span_args["hits"] = len(outcomes)
+    METRICS.inc("cache_hits", len(outcomes))
+    METRICS.inc("cache_misses", len(to_check))
+
+    if to_check:
+        # Resolve each host once up front; URLs on hosts that do not exist fail right away
+        with span("dns_prefetch", "network") as span_args:
+            try:
+                unresolvable = await asyncio.wait_for(
+                    RESOLVER.prefetch(urlsplit(link).hostname or "" for link in to_check),
+                    _deadline_timeout())
+            except asyncio.TimeoutError:
+                unresolvable = {}  # Out of time; the URLs are reported as not checked below
+            span_args["failed_hosts"] = len(unresolvable)
+        if unresolvable:
+            resolvable = []
+            for link in to_check:
+                reason = unresolvable.get(urlsplit(link).hostname or "")
+                if reason is None:
+                    resolvable.append(link)
+                else:
+                    STATUS_CACHE.set(link, "ERROR", reason)
+                    outcomes[link] = ("ERROR", reason)
+            METRICS.inc("dns_short_circuited", len(to_check) - len(resolvable))
+            to_check = resolvable
+
+    if to_check:
+        checked: list = [None] * len(to_check)  # None: not checked before the deadline
+        if not expired():
+            with stage("network"):
+                async with open_transport() as transport:
+                    checked = await _gather_within_deadline(
+                        to_check, [_check_link_coalesced(transport, link) for link in to_check])
+        skipped = 0
+        for link, result in zip(to_check, checked):
+            if result is None:
+                # Out of budget: reported, but not cached, so the next call checks it
+                skipped += 1
+                result = ("ERROR", NOT_CHECKED_REASON)
+            outcomes[link] = result
+        if skipped:
+            logger.warning(f"Time budget exhausted: {skipped} URLs not checked")
+            METRICS.inc("urls_skipped_budget", skipped)
+            note_skipped(urls=skipped)
+    link_results = [outcomes[canonical_links[link]] for link in extracted_links]
+    if anchor_checking_enabled():
+        link_results = await _check_anchors(extracted_links, canonical_links, link_results)
+    return link_results
+
+
+def _collect_results(results: dict[str, Any], extracted_links: list[str], link_results: list
+                     ) -> dict[str, Any]:
+    """Sorts each link into results' valid/broken/errors lists by its check result."""
     for i, result in enumerate(link_results):
         link = extracted_links[i]
         if isinstance(result, Exception):
@@ -190,3 +597,121 @@ async def check_links_in_content(content: str) -> dict[str, Any]:
     )
     logger.info(log_msg)
     return results
+
+# --- Streaming: files too large to read into one str ---
+
+# Link batches of one streamed file checked at once; links of later chunks wait and are
+# merged into the next batch, so each batch opens one transport for many chunks
+STREAM_BATCHES_IN_FLIGHT = 2
+
+
+def _scan_chunks(path: Path, local: bool, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue,
+                 cancelled: threading.Event):
+    """
+    Worker thread of check_links_in_file: parses path chunk by chunk, posting
+    (links, relative hrefs, anchors, parse seconds) per chunk, then None (or the exception).
+    """
+    def post(item):
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    env: dict = {}  # Reference definitions, visible to the chunks after theirs
+    headings: dict[str, int] = {}
+    defined: set[str] = set()
+    try:
+        for chunk in iter_markdown_chunks(path):
+            if cancelled.is_set():
+                return
+            start = time.perf_counter()
+            links, local_hrefs, anchors = _scan_markdown(chunk, local, env, headings)
+            # A definition may come after its uses (in an earlier chunk), so check its URL directly
+            for label, reference in env.get("references", {}).items():
+                if label in defined:
+                    continue
+                defined.add(label)
+                href = reference.get("href", "")
+                if href.startswith(("http://", "https://")):
+                    links.append(href)
+                elif local and is_local_link(href):
+                    local_hrefs.append(href)
+            post((links, local_hrefs, anchors, time.perf_counter() - start))
+        post(None)
+    except Exception as e:
+        if not cancelled.is_set():
+            post(e)
+
+
+async def check_links_in_file(path: Path, *, source: Path | None = None) -> dict[str, Any]:
+    """
+    check_links_in_content for files too large to read at once (see streaming.py). The
+    file is memory-mapped and parsed chunk by chunk in a worker thread, and each chunk's
+    new links are checked while the following chunks are parsed. Results match those for
+    the whole content, except that reference definitions are checked even when unused.
+    """
+    local_index = current_local_index() if source is not None else None
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+    producer = asyncio.create_task(asyncio.to_thread(
+        _scan_chunks, path, local_index is not None, loop, queue, cancelled))
+
+    seen: set[str] = set()
+    local_hrefs: dict[str, None] = {}  # Ordered set
+    anchors: set[str] = set()
+    batches: list[tuple[list[str], asyncio.Task]] = []
+    waiting: list[str] = []
+    chunks = 0
+    parse_seconds = 0.0
+
+    def launch():
+        batches.append((waiting[:], asyncio.create_task(_check_extracted_links(waiting[:]))))
+        waiting.clear()
+
+    try:
+        with stage("parse", file=str(path)):
+            while (item := await queue.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                links, hrefs, chunk_anchors, seconds = item
+                chunks += 1
+                parse_seconds += seconds
+                local_hrefs.update(dict.fromkeys(hrefs))
+                anchors |= chunk_anchors
+                for link in links:
+                    if link not in seen:
+                        seen.add(link)
+                        waiting.append(link)
+                if waiting and sum(not task.done() for _, task in batches) < STREAM_BATCHES_IN_FLIGHT:
+                    launch()
+        if waiting:
+            launch()
+        outcome_lists = await asyncio.gather(*(task for _, task in batches))
+    except BaseException:
+        cancelled.set()
+        for _, task in batches:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in batches), return_exceptions=True)
+        raise
+    await producer
+    METRICS.inc("files_parsed")
+    METRICS.inc("files_streamed")
+    METRICS.inc("stream_chunks", chunks)
+    METRICS.observe("parse_seconds", parse_seconds, PARSE_BUCKETS)
+
+    extracted_links = sorted(seen)
+    results: dict[str, Any] = {
+        "total": len(extracted_links),
+        "valid": [],
+        "broken": [],
+        "errors": []
+    }
+    if local_index is not None:
+        local_index.add_file(source, anchors, list(local_hrefs))
+    if not extracted_links:
+        logger.info("No links found to check.")
+        return results
+
+    outcomes: dict[str, Any] = {}
+    for (batch, _), batch_outcomes in zip(batches, outcome_lists):
+        outcomes.update(zip(batch, batch_outcomes))
+    logger.info(f"Streamed {path} in {chunks} chunks, {len(extracted_links)} links")
+    return _collect_results(results, extracted_links, [outcomes[link] for link in extracted_links])
@@ -0,0 +1,182 @@
+# src/mcp_server/tools/local_links.py
+
+"""
+Offline validation of relative links (`./guide.md`, `../README.md#install`, `#usage`).
+
+While a tool call scans its files, every file's path is recorded with the anchors of its
+headings, taken from the markdown-it tokens the link extraction already produces, and its
+relative links are queued. Once all files are parsed the queued links are resolved
+against that index, and the server merges them into each file's results: missing files
+and anchors are BROKEN, found without any network request and without parsing scanned
+files again. Targets outside the scan (or a single
+file check) are looked up on disk, and Markdown targets are parsed at most once per call.
+
+The index is bound to the tool call through a ContextVar, like the call deadline.
+"""
+
+import asyncio
+import logging
+import re
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import unquote, urlsplit
+
+from .metrics import METRICS
+
+if TYPE_CHECKING:  # The index is bound on every tool call; markdown-it is imported when first needed
+    from markdown_it import MarkdownIt
+    from markdown_it.token import Token
+
+logger = logging.getLogger(__name__)
+
+MARKDOWN_SUFFIXES = frozenset({".md", ".markdown"})
+# Heading text characters dropped from slugs (GitHub keeps letters, digits, "-", "_" and spaces)
+_SLUG_DROP = re.compile(r"[^\w\- ]")
+# Explicit anchors in inline or block HTML, e.g. <a name="faq"></a> or <div id="faq">; the
+# attribute must follow whitespace or "<", so data-id="..." or aria-name="..." do not count
+_HTML_ANCHOR = re.compile(r"""(?<=[\s<])(?:id|name)\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+# Line anchors added by code hosts' viewers, not by the document
+_LINE_ANCHOR = re.compile(r"^L\d+(?:-L\d+)?$")
+
+
+def slugify(text: str) -> str:
+    """Heading text -> anchor, as GitHub renders it: lowercased, punctuation dropped, spaces to '-'."""
+    return _SLUG_DROP.sub("", text.strip().lower()).replace(" ", "-")
+
+
+def _inline_text(token: "Token") -> str:
+    return "".join(child.content for child in token.children or ()
+                   if child.type in ("text", "code_inline"))
+
+
+def collect_anchors(tokens: "list[Token]", seen: dict[str, int] | None = None) -> set[str]:
+    """
+    Returns the heading slugs (duplicates numbered "-1", "-2", ...) and HTML ids of a parse.
+    Pass the same `seen` counts for every chunk of a file parsed in pieces.
+    """
+    anchors: set[str] = set()
+    if seen is None:
+        seen = {}
+    for i, token in enumerate(tokens):
+        if token.type == "heading_open" and i + 1 < len(tokens):
+            slug = slugify(_inline_text(tokens[i + 1]))
+            count = seen.get(slug, 0)
+            seen[slug] = count + 1
+            anchors.add(slug if count == 0 else f"{slug}-{count}")
+        elif token.type == "html_block":
+            anchors.update(_HTML_ANCHOR.findall(token.content))
+        elif token.type == "inline":
+            for child in token.children or ():
+                if child.type == "html_inline":
+                    anchors.update(_HTML_ANCHOR.findall(child.content))
+    return anchors
+
+
+def is_local_link(href: str) -> bool:
+    """True for relative paths and same-file anchors; False for URLs with a scheme or host."""
+    if not href or href.startswith("//"):
+        return False
+    return not urlsplit(href).scheme
+
+
+class LocalLinkIndex:
+    """Anchors of every Markdown file seen in one tool call, plus the links waiting on them."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.anchors: dict[Path, frozenset[str]] = {}
+        # (source path as given, resolved source path, hrefs)
+        self.pending: list[tuple[Path, Path, list[str]]] = []
+        self._parser: MarkdownIt | None = None
+
+    def add_file(self, path: Path, anchors: set[str], hrefs: list[str]):
+        resolved = path.resolve()
+        self.anchors[resolved] = frozenset(anchors)
+        if hrefs:
+            self.pending.append((path, resolved, hrefs))
+
+    def resolve_pending(self) -> dict[Path, list[tuple[str, str, str | None]]]:
+        """
+        Resolves all queued links; blocking, as targets outside the index are looked up on
+        disk. Returns {source path as given to add_file: [(href, status, reason), ...]}.
+        """
+        resolved_links: dict[Path, list[tuple[str, str, str | None]]] = {}
+        for source, resolved, hrefs in self.pending:
+            links = resolved_links.setdefault(source, [])
+            for href in hrefs:
+                status, reason = self.resolve(resolved, href)
+                if status != "OK":
+                    logger.warning(f"Link BROKEN ({reason}): {href} in {source}")
+                links.append((href, status, reason))
+        self.pending.clear()
+        return resolved_links
+
+    def resolve(self, source: Path, href: str) -> tuple[str, str | None]:
+        parts = urlsplit(href)
+        path = unquote(parts.path)
+        if not path:
+            target = source
+        elif path.startswith("/"):
+            target = (self.root / path.lstrip("/")).resolve()  # Repository-root relative
+        else:
+            target = (source.parent / path).resolve()
+        if target not in self.anchors and not target.exists():
+            return ("BROKEN", f"File not found: {path}")
+
+        fragment = unquote(parts.fragment)
+        if (not fragment or fragment.lower() == "top" or _LINE_ANCHOR.match(fragment)
+                or target.suffix.lower() not in MARKDOWN_SUFFIXES):
+            return ("OK", None)
+        anchors = self._anchors_of(target)
+        if anchors is None or fragment.lower() in anchors or fragment in anchors:
+            return ("OK", None)
+        return ("BROKEN", f"Anchor '#{fragment}' not found in {path or source.name}")
+
+    def _anchors_of(self, target: Path) -> frozenset[str] | None:
+        anchors = self.anchors.get(target)
+        if anchors is not None:
+            return anchors
+        try:
+            content = target.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not read {target} to check anchors: {e}")
+            return None  # Unverifiable; the file itself exists
+        if self._parser is None:
+            from markdown_it import MarkdownIt
+
+            self._parser = MarkdownIt()
+        anchors = self.anchors[target] = frozenset(collect_anchors(self._parser.parse(content)))
+        return anchors
+
+
+_current_index: ContextVar[LocalLinkIndex | None] = ContextVar("local_link_index", default=None)
+
+
+def start_local_index(root: Path) -> tuple[LocalLinkIndex, object]:
+    """Binds a new index to the current tool call, returns (index, reset_token)."""
+    index = LocalLinkIndex(root)
+    return index, _current_index.set(index)
+
+
+def stop_local_index(token: object):
+    _current_index.reset(token)
+
+
+def current_local_index() -> LocalLinkIndex | None:
+    return _current_index.get()
+
+
+async def resolve_local_links() -> dict[Path, list[tuple[str, str, str | None]]]:
+    """Resolves the current call's queued relative links, by source file (see resolve_pending)."""
+    index = _current_index.get()
+    if index is None or not index.pending:
+        return {}
+    resolved_links = await asyncio.to_thread(index.resolve_pending)
+    # Metrics are updated here, on the event loop, not from the worker thread
+    links = [link for file_links in resolved_links.values() for link in file_links]
+    METRICS.inc("local_links_checked", len(links))
+    broken = sum(1 for _, status, _ in links if status != "OK")
+    if broken:
+        METRICS.inc("local_links_broken", broken)
+    return resolved_links
@@ -0,0 +1,173 @@
+# src/mcp_server/tools/metrics.py
+
+"""
+Process-wide runtime metrics for the link checker.
+
+Counters and histograms accumulate for the lifetime of the server process and are
+exposed through the `get_link_checker_stats` tool as JSON or Prometheus text.
+"""
+
+import math
+from collections.abc import Callable
+
+METRIC_PREFIX = "mcp_link_checker"
+
+# Bucket upper bounds in seconds (Prometheus style, +Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram storing per-bucket counts, total count and sum."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimates a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return None
+        target = q * self.count
+        running = 0
+        for i, bucket_count in enumerate(self.counts):
+            running += bucket_count
+            if running >= target:
+                return self.buckets[i] if i < len(self.buckets) else math.inf
+        return math.inf
+
+    def _quantile_le(self, q: float) -> float | str | None:
+        """quantile() for JSON output: the overflow bucket is "+Inf", not a bare Infinity."""
+        value = self.quantile(q)
+        return value if value != math.inf else "+Inf"
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50_le": self._quantile_le(0.5),
+            "p95_le": self._quantile_le(0.95),
+            "buckets": {
+                **{str(b): c for b, c in zip(self.buckets, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+class LinkCheckerMetrics:
+    """Registry of named counters, histograms, per-host latency histograms and gauges."""
+
+    def __init__(self):
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self.host_latency: dict[str, Histogram] = {}
+        self._gauges: dict[str, Callable[[], float]] = {}
+        self._host_gauges: dict[str, Callable[[], dict[str, dict]]] = {}
+
+    def inc(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(buckets)
+        histogram.observe(value)
+
+    def observe_host_latency(self, host: str, seconds: float):
+        histogram = self.host_latency.get(host)
+        if histogram is None:
+            histogram = self.host_latency[host] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+    def register_gauge(self, name: str, read: Callable[[], float]):
+        """Registers a gauge whose value is read lazily when a snapshot is taken."""
+        self._gauges[name] = read
+
+    def register_host_gauges(self, name: str, read: Callable[[], dict[str, dict]]):
+        """
+        Registers per-host values read lazily as {host: {key: value}}. They appear under
+        `name` in snapshots and as a gauge labelled by host and key in Prometheus output.
+        """
+        self._host_gauges[name] = read
+
+    def reset(self):
+        """Clears all accumulated values; registered gauges are kept."""
+        self.counters.clear()
+        self.histograms.clear()
+        self.host_latency.clear()
+
+    def snapshot(self) -> dict:
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "gauges": {name: read() for name, read in sorted(self._gauges.items())},
+            "histograms": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+            "host_request_seconds": {
+                host: h.to_dict() for host, h in sorted(self.host_latency.items())},
+            **{name: read() for name, read in sorted(self._host_gauges.items())},
+        }
+
+    def render_prometheus(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for name, value in sorted(self.counters.items()):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, read in sorted(self._gauges.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {read()}"]
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            lines += _render_histogram(metric, histogram, "")
+        if self.host_latency:
+            metric = f"{METRIC_PREFIX}_host_request_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for host, histogram in sorted(self.host_latency.items()):
+                lines += _render_histogram(metric, histogram, f'host="{_escape_label(host)}"')
+        for name, read in sorted(self._host_gauges.items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            for host, values in sorted(read().items()):
+                for key, value in values.items():
+                    if isinstance(value, bool):
+                        continue  # Flags are informational, only numbers are exported
+                    lines.append(
+                        f'{metric}{{host="{_escape_label(host)}",key="{key}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(metric: str, histogram: Histogram, labels: str) -> list[str]:
+    sep = "," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{metric}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{labels}{sep}le="+Inf"}} {histogram.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{metric}_sum{suffix} {histogram.sum}")
+    lines.append(f"{metric}_count{suffix} {histogram.count}")
+    return lines
+
+
+# Shared registry for the server process
+METRICS = LinkCheckerMetrics()
@@ -0,0 +1,175 @@
+# src/mcp_server/tools/pipeline.py
+
+"""
+The staged file pipeline shared by every link checking tool:
+
+    discover -> read -> check (parse, then URLs) -> report
+
+Stages run at the same time. Discovery walks the tree in a worker thread and hands over
+each path as soon as it is found, so the first files are read and their URLs checked
+while the walk is still going on, and a scan takes about as long as its slowest stage
+rather than the sum of all of them. Project scans read files in batches ahead of the
+checkers (see file_loader.py); the other tools let each checker read its own file. Up to
+`workers` files are checked at once. Stages are connected by bounded queues, so a fast
+stage waits for a slow one instead of buffering the corpus: at most
+DISCOVERY_QUEUE_FILES discovered paths wait to be read, and LOADER_READ_AHEAD_FILES read
+files wait to be checked. The caller formats the report once the last file is done.
+
+Once the call's deadline passes, discovery is stopped and the files already found are
+skipped: the first SKIPPED_FILES_LISTED are reported as not checked, the rest are only
+counted, so a timed-out scan of a huge tree still returns a short report.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Iterable
+from pathlib import Path
+
+from .deadline import NOT_CHECKED_REASON, expired, note_discovery_stopped, note_skipped
+from .file_loader import BulkLoader, start_loading, stop_loading
+from .profiling import stage
+from .results import FileResults, ScanResults
+
+DISCOVERY_QUEUE_FILES = 1024
+# Files skipped at the deadline that are still listed by name; the others are only counted
+SKIPPED_FILES_LISTED = 20
+
+_END = object()
+
+
+class PathFeed:
+    """
+    Paths handed from the discovery thread to the event loop, numbered in discovery order.
+    The thread blocks while `limit` paths wait to be taken.
+    """
+
+    def __init__(self, limit: int | None = None):
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._slots = threading.Semaphore(limit or DISCOVERY_QUEUE_FILES)
+        self.cancelled = threading.Event()
+        self.count = 0
+        self.dropped = False  # A path was found after the feed was cancelled
+
+    # --- Discovery thread side ---
+
+    def put(self, path: Path) -> bool:
+        """Queues path; returns False (without queueing) once the feed is cancelled."""
+        while not self._slots.acquire(timeout=0.1):
+            if self.cancelled.is_set():
+                self.dropped = True
+                return False
+        if self.cancelled.is_set():
+            self._slots.release()
+            self.dropped = True
+            return False
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (self.count, path))
+        self.count += 1
+        return True
+
+    def close(self, error: BaseException | None = None):
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, error or _END)
+
+    # --- Event loop side ---
+
+    def _taken(self, item):
+        if isinstance(item, BaseException):
+            self._queue.put_nowait(item)
+            raise item
+        if item is _END:
+            self._queue.put_nowait(_END)  # Every consumer sees the end
+            return None
+        self._slots.release()
+        return item
+
+    async def get(self) -> tuple[int, Path] | None:
+        return self._taken(await self._queue.get())
+
+    def get_nowait(self) -> tuple[int, Path] | None:
+        """The next path if one is waiting, else None (also at the end)."""
+        try:
+            return self._taken(self._queue.get_nowait())
+        except asyncio.QueueEmpty:
+            return None
+
+
+def _discover(discover: Callable[[threading.Event], Iterable[Path]], feed: PathFeed):
+    """Runs in the discovery thread: feeds every path discover() yields, then closes the feed."""
+    paths = iter(discover(feed.cancelled))
+    try:
+        for path in paths:
+            if not feed.put(path):
+                break  # Still closes the feed, so consumers see the end
+    except BaseException as e:
+        feed.close(e)
+        raise
+    finally:
+        if hasattr(paths, "close"):
+            paths.close()  # A cancelled walk stops at its current yield
+    feed.close()
+
+
+async def run_file_pipeline(
+    discover: Callable[[threading.Event], Iterable[Path]],
+    check_file: Callable[[Path], Awaitable[dict | str]],
+    *,
+    workers: int,
+    scan: ScanResults | None = None,
+    preload: bool = False,
+) -> list[tuple[Path, dict | FileResults | str]]:
+    """
+    Checks every file discover(cancelled) yields (it runs in a worker thread and should
+    stop once `cancelled` is set) with check_file, which returns results or an error
+    string. Returns (path, result) in discovery order. Once the call's deadline passes,
+    discovery stops and files not started are counted as skipped; the first
+    SKIPPED_FILES_LISTED of them are returned with NOT_CHECKED_REASON. With `scan`,
+    results are compacted into it as each file finishes; with `preload`, files are read in
+    batches by a BulkLoader first.
+    """
+    feed = PathFeed()
+    outcomes: dict[int, tuple[Path, dict | FileResults | str]] = {}
+    listed_skipped = 0
+
+    async def discovery():
+        with stage("discovery"):
+            await asyncio.to_thread(_discover, discover, feed)
+
+    async def worker(source):
+        nonlocal listed_skipped
+        while (item := await source.get()) is not None:
+            index, path = item
+            if expired():
+                feed.cancelled.set()  # Stops the discovery walk
+                note_skipped(files=1)
+                if listed_skipped < SKIPPED_FILES_LISTED:
+                    listed_skipped += 1
+                    outcomes[index] = (path, NOT_CHECKED_REASON)
+                continue
+            result = await check_file(path)
+            if scan is not None and isinstance(result, dict):
+                result = scan.add(result)
+            outcomes[index] = (path, result)
+
+    tasks = [asyncio.create_task(discovery())]
+    source = feed
+    loader_token = None
+    if preload:
+        loader = BulkLoader(feed)
+        loader_token = start_loading(loader)
+        tasks.append(asyncio.create_task(loader.run()))
+        source = loader
+    tasks += [asyncio.create_task(worker(source)) for _ in range(max(workers, 1))]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        feed.cancelled.set()  # Also stops the discovery walk
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        if loader_token is not None:
+            stop_loading(loader_token)
+    if feed.dropped:
+        note_discovery_stopped()
+    return [outcomes[i] for i in sorted(outcomes)]
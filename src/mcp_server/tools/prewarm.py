@@ -0,0 +1,154 @@
+# src/mcp_server/tools/prewarm.py
+
+"""
+Background pre-warm, started once the client has sent `initialized` (opt-in through
+MCP_SERVER_PREWARM).
+
+While the user is still typing, the server discovers the project's Markdown files,
+extracts their URLs and checks the ones without a fresh cached result, so the first
+project scan mostly reads from the status cache. It is low priority: it pauses while any
+tool call is running and checks at most PREWARM_BATCH_URLS URLs at a time, through the
+same link checker as a tool call (same transport limits, and a call asking for a URL
+the pre-warm is checking joins that check instead of starting another). It stops after
+PREWARM_MAX_URLS URLs or PREWARM_SECONDS; URLs not checked by then are left for the
+tool call, as with any call deadline.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .anchors import start_anchor_checking, stop_anchor_checking
+from .canonical import canonicalize
+from .deadline import expired, start_deadline, stop_deadline
+from .metrics import METRICS
+from .status_cache import STATUS_CACHE
+from .streaming import should_stream
+
+logger = logging.getLogger(__name__)
+
+PREWARM_ENABLED = os.environ.get("MCP_SERVER_PREWARM", "").lower() in ("1", "true", "yes")
+PREWARM_MAX_URLS = int(os.environ.get("MCP_SERVER_PREWARM_MAX_URLS", "2000"))
+PREWARM_SECONDS = float(os.environ.get("MCP_SERVER_PREWARM_SECONDS", "120"))
+PREWARM_BATCH_URLS = 16
+
+_running: "Prewarmer | None" = None
+
+
+def _extract_file_links(path: Path) -> list[str]:
+    """Runs in a worker thread: the file's HTTP(S) links, or none if it cannot be read."""
+    from .link_checker import _extract_links
+
+    if should_stream(path):
+        return []  # Left to the tool call; not worth holding in memory here
+    try:
+        return _extract_links(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+class Prewarmer:
+    """One pre-warm run; tool calls pause it through prewarm_paused()."""
+
+    def __init__(self, discover: Callable[[threading.Event], Iterable[Path]]):
+        self._discover = discover
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._active_calls = 0
+        self.cancelled = threading.Event()
+        self.files = 0
+        self.urls = 0
+
+    def call_started(self):
+        self._active_calls += 1
+        self._idle.clear()
+
+    def call_finished(self):
+        self._active_calls -= 1
+        if not self._active_calls:
+            self._idle.set()
+
+    async def _pending_urls(self) -> list[str]:
+        """Canonical URLs in the project without a fresh cached result, up to PREWARM_MAX_URLS."""
+        paths = await asyncio.to_thread(lambda: list(self._discover(self.cancelled)))
+        pending: dict[str, None] = {}
+        for path in paths:
+            await self._idle.wait()
+            links = await asyncio.to_thread(_extract_file_links, path)
+            self.files += 1
+            for link in links:
+                url = canonicalize(link)
+                if url not in pending and STATUS_CACHE.get(url) is None:
+                    pending[url] = None
+                    if len(pending) >= PREWARM_MAX_URLS:
+                        return list(pending)
+        return list(pending)
+
+    async def run(self):
+        from .link_checker import _check_extracted_links
+        from .transport import call_transports
+
+        _, deadline_token = start_deadline(PREWARM_SECONDS)
+        anchors_token = start_anchor_checking(False)  # Page downloads are left to the calls
+        try:
+            urls = await self._pending_urls()
+            async with call_transports():  # Batches share one HTTP/2 client, like a call's
+                for start in range(0, len(urls), PREWARM_BATCH_URLS):
+                    await self._idle.wait()
+                    if expired():
+                        break
+                    # Skips URLs a tool call has checked in the meantime
+                    batch = [url for url in urls[start:start + PREWARM_BATCH_URLS]
+                             if STATUS_CACHE.get(url) is None]
+                    if batch:
+                        await _check_extracted_links(batch)
+                        self.urls += len(batch)
+        finally:
+            stop_anchor_checking(anchors_token)
+            stop_deadline(deadline_token)
+            METRICS.inc("prewarm_files", self.files)
+            METRICS.inc("prewarm_urls", self.urls)
+        logger.info(f"Pre-warm done: {self.files} files read, {self.urls} URLs checked")
+
+
+def start_prewarm(discover: Callable[[threading.Event], Iterable[Path]]) -> asyncio.Task | None:
+    """
+    Starts the pre-warm in the background unless one is already running; discover(cancelled)
+    yields the files to read (in a worker thread). Returns the task.
+    """
+    global _running
+    if _running is not None:
+        return None
+    prewarmer = _running = Prewarmer(discover)
+
+    async def run():
+        global _running
+        try:
+            await prewarmer.run()
+        except asyncio.CancelledError:
+            prewarmer.cancelled.set()
+            raise
+        except Exception:
+            logger.exception("Pre-warm failed")
+        finally:
+            _running = None
+
+    return asyncio.create_task(run())
+
+
+@contextmanager
+def prewarm_paused() -> Iterator[None]:
+    """Pauses a running pre-warm for the duration of a tool call."""
+    prewarmer = _running
+    if prewarmer is None:
+        yield
+        return
+    prewarmer.call_started()
+    try:
+        yield
+    finally:
+        prewarmer.call_finished()
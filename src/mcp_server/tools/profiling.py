@@ -0,0 +1,136 @@
+# src/mcp_server/tools/profiling.py
+
+"""
+Per-call stage timing and on-demand cProfile capture.
+
+A StageTimer is bound to the current tool call through a ContextVar, so helpers deep in
+the scan path can record time with `with stage("parse"):` without threading a timer
+argument through every call. Tasks spawned during the call inherit the binding.
+"""
+
+import cProfile
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Stages reported in this order; unknown stages are appended after them
+STAGE_ORDER = ("discovery", "read", "parse", "network", "format")
+PROFILE_DIR = Path(os.environ.get(
+    "MCP_SERVER_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "mcp_server_profiles")))
+
+_current_timer: ContextVar["StageTimer | None"] = ContextVar("stage_timer", default=None)
+_profile_active = False
+
+
+class StageTimer:
+    """Accumulates time per stage for one tool call, plus the call's wall and CPU time."""
+
+    def __init__(self):
+        self.totals: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+
+    def add(self, stage_name: str, seconds: float):
+        self.totals[stage_name] = self.totals.get(stage_name, 0.0) + seconds
+        self.counts[stage_name] = self.counts.get(stage_name, 0) + 1
+
+    def finish(self):
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = time.process_time() - self._cpu_start
+
+    def ordered_stages(self) -> list[str]:
+        known = [s for s in STAGE_ORDER if s in self.totals]
+        return known + sorted(s for s in self.totals if s not in STAGE_ORDER)
+
+    def to_dict(self) -> dict:
+        return {
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "stages": {
+                s: {"seconds": round(self.totals[s], 6), "count": self.counts[s]}
+                for s in self.ordered_stages()
+            },
+        }
+
+    def format_report(self) -> str:
+        """Formats the breakdown as a text section appended to tool results."""
+        text = "Timing Breakdown\n"
+        text += f"  Wall time: {self.wall_seconds:.3f}s\n"
+        text += f"  CPU time: {self.cpu_seconds:.3f}s\n"
+        text += "  Stages (cumulative across concurrent work):\n"
+        for s in self.ordered_stages():
+            text += f"    - {s}: {self.totals[s]:.3f}s ({self.counts[s]} calls)\n"
+        return text
+
+
+def start_timing() -> tuple[StageTimer, object]:
+    """Binds a new StageTimer to the current context, returns (timer, reset_token)."""
+    timer = StageTimer()
+    return timer, _current_timer.set(timer)
+
+
+def stop_timing(timer: StageTimer, token: object):
+    timer.finish()
+    _current_timer.reset(token)
+
+
+@contextmanager
+def stage(stage_name: str, **span_args) -> Iterator[None]:
+    """
+    Records the duration of the enclosed block under stage_name, if timing is active,
+    and as a trace span (with span_args) if tracing is active.
+    """
+    timer = _current_timer.get()
+    start = time.perf_counter()
+    try:
+        with span(stage_name, "stage", **span_args):
+            yield
+    finally:
+        if timer is not None:
+            timer.add(stage_name, time.perf_counter() - start)
+
+
+@contextmanager
+def capture_profile(label: str) -> Iterator[dict]:
+    """
+    Runs cProfile around the enclosed block and dumps stats to PROFILE_DIR.
+    Yields a dict whose "path" is set once the profile is written (None if skipped).
+    The profiler sees the whole event loop thread, so concurrent calls show up too.
+    """
+    global _profile_active
+    info: dict = {"path": None, "note": None}
+    if _profile_active:
+        # Only one cProfile profiler can be active per thread
+        info["note"] = "Profile skipped: another profile capture is in progress."
+        yield info
+        return
+
+    profiler = cProfile.Profile()
+    _profile_active = True
+    profiler.enable()
+    try:
+        yield info
+    finally:
+        profiler.disable()
+        _profile_active = False
+        try:
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            path = PROFILE_DIR / f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof"
+            profiler.dump_stats(str(path))
+            info["path"] = str(path)
+            logger.info(f"Profile for {label} written to {path}")
+        except OSError as e:
+            info["note"] = f"Profile could not be written: {e}"
+            logger.warning(info["note"])
@@ -0,0 +1,216 @@
+# src/mcp_server/tools/resolver.py
+
+"""
+Process-wide DNS cache with negative entries and batched host pre-resolution.
+
+Every file in a scan gets its own aiohttp session, and each session's connector keeps
+its own short-lived DNS cache. A host linked from many files was therefore looked up
+again and again, and a host that does not exist paid the full resolver timeout for
+each of its URLs. The HostResolver here is shared by all sessions (through
+SharedCacheResolver) and remembers both addresses and NXDOMAIN answers, so each host
+is resolved at most once per TTL and URLs on unresolvable hosts fail without a socket.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from aiohttp.abc import AbstractResolver
+
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+POSITIVE_TTL_SECONDS = 300
+NEGATIVE_TTL_SECONDS = 120  # NXDOMAIN answers; shorter so a newly created host recovers
+DNS_TIMEOUT_SECONDS = 5
+DNS_CONCURRENCY = 16  # getaddrinfo runs in the default thread pool, keep it from saturating
+MAX_DNS_ENTRIES = 10_000
+
+# getaddrinfo errors that mean "this name does not exist" rather than "try again later"
+_NOT_FOUND_ERRNOS = {
+    code for code in (getattr(socket, "EAI_NONAME", None), getattr(socket, "EAI_NODATA", None))
+    if code is not None
+}
+
+
+class DnsEntry:
+    """Resolved addresses, or the failure reason for a name that does not exist."""
+
+    __slots__ = ("addresses", "failure", "expires_at")
+
+    def __init__(self, addresses: list[tuple[int, str]], failure: str | None, expires_at: float):
+        self.addresses = addresses
+        self.failure = failure
+        self.expires_at = expires_at
+
+
+async def _system_getaddrinfo(host: str) -> list[tuple[int, str]]:
+    """Resolves host with the system resolver, returns unique (family, address) pairs."""
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    addresses: list[tuple[int, str]] = []
+    for family, _, _, _, sockaddr in infos:
+        pair = (family, sockaddr[0])
+        if pair not in addresses:
+            addresses.append(pair)
+    return addresses
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return False
+    return True
+
+
+class HostResolver:
+    """Shared TTL cache of host lookups, with in-flight deduplication."""
+
+    def __init__(self, max_entries: int = MAX_DNS_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, DnsEntry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+
+    def _fresh(self, host: str) -> DnsEntry | None:
+        entry = self._entries.get(host)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[host]
+            return None
+        self._entries.move_to_end(host)
+        return entry
+
+    def _store(self, host: str, entry: DnsEntry):
+        self._entries[host] = entry
+        self._entries.move_to_end(host)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def failure_for(self, host: str) -> str | None:
+        """Returns the cached failure reason if host is known not to resolve."""
+        entry = self._fresh(host)
+        return entry.failure if entry is not None else None
+
+    async def lookup(self, host: str) -> DnsEntry | None:
+        """
+        Returns the entry for host, resolving it if needed. Concurrent lookups of the same
+        host share one query. Returns None for transient failures, which are not cached.
+        """
+        entry = self._fresh(host)
+        if entry is not None:
+            METRICS.inc("dns_cache_hits")
+            return entry
+        pending = self._inflight.get(host)
+        if pending is not None:
+            METRICS.inc("dns_cache_hits")
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[host] = future
+        try:
+            entry = await self._query(host)
+            future.set_result(entry)
+        except asyncio.CancelledError:
+            # Only this caller was cancelled; others sharing the query fall back to a
+            # normal connect, as for a transient failure
+            future.set_result(None)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so waiter-less failures do not warn
+            raise
+        finally:
+            self._inflight.pop(host, None)
+        return entry
+
+    async def _query(self, host: str) -> DnsEntry | None:
+        METRICS.inc("dns_lookups")
+        try:
+            addresses = await asyncio.wait_for(_system_getaddrinfo(host), DNS_TIMEOUT_SECONDS)
+        except socket.gaierror as e:
+            if e.errno in _NOT_FOUND_ERRNOS:
+                METRICS.inc("dns_not_found")
+                logger.warning(f"DNS: host not found, caching for {NEGATIVE_TTL_SECONDS}s: {host}")
+                entry = DnsEntry([], "DNS: host not found",
+                                 time.monotonic() + NEGATIVE_TTL_SECONDS)
+                self._store(host, entry)
+                return entry
+            METRICS.inc("dns_transient_errors")
+            logger.warning(f"DNS: lookup failed for {host}: {e}")
+            return None
+        except (asyncio.TimeoutError, OSError) as e:
+            METRICS.inc("dns_transient_errors")
+            logger.warning(f"DNS: lookup failed for {host}: {type(e).__name__}")
+            return None
+        entry = DnsEntry(addresses, None, time.monotonic() + POSITIVE_TTL_SECONDS)
+        self._store(host, entry)
+        return entry
+
+    async def prefetch(self, hosts: Iterable[str]) -> dict[str, str]:
+        """
+        Resolves the given hosts up front with bounded concurrency.
+        Returns {host: failure_reason} for hosts known not to exist.
+        """
+        unique = sorted({h for h in hosts if h and not _is_ip_literal(h)})
+        semaphore = asyncio.Semaphore(DNS_CONCURRENCY)
+
+        async def resolve_one(host: str) -> DnsEntry | None:
+            async with semaphore:
+                return await self.lookup(host)
+
+        entries = await asyncio.gather(*(resolve_one(h) for h in unique))
+        return {
+            host: entry.failure
+            for host, entry in zip(unique, entries)
+            if entry is not None and entry.failure
+        }
+
+
+class SharedCacheResolver(AbstractResolver):
+    """aiohttp resolver backed by the process-wide HostResolver."""
+
+    def __init__(self, resolver: "HostResolver | None" = None):
+        self._resolver = resolver if resolver is not None else RESOLVER
+
+    async def resolve(self, host: str, port: int = 0,
+                      family: socket.AddressFamily = socket.AF_INET) -> list[dict]:
+        entry = await self._resolver.lookup(host)
+        if entry is None:
+            # Transient failure: let the system resolver raise its own error
+            entry = DnsEntry(await _system_getaddrinfo(host), None, 0.0)
+        if entry.failure:
+            raise OSError(f"{entry.failure}: {host}")
+        addresses = [
+            (fam, addr) for fam, addr in entry.addresses
+            if family in (socket.AF_UNSPEC, fam)
+        ]
+        if not addresses:
+            raise OSError(f"DNS: no address for {host} in family {family!r}")
+        flags = socket.AI_NUMERICHOST | socket.AI_NUMERICSERV
+        return [
+            {"hostname": host, "host": addr, "port": port,
+             "family": fam, "proto": 0, "flags": flags}
+            for fam, addr in addresses
+        ]
+
+    async def close(self) -> None:
+        # The cache outlives individual sessions
+        pass
+
+
+# Shared resolver for the server process
+RESOLVER = HostResolver()
@@ -0,0 +1,133 @@
+# src/mcp_server/tools/results.py
+
+"""
+Compact storage of link check results for a whole scan.
+
+check_links_in_content returns one dict per file, with the file's URLs as strings and
+broken/errored links as {"url", "reason"} dicts. A project scan kept all of them until
+the report was formatted, and a popular URL appeared as a separate string in every file
+linking to it. ScanResults interns each URL and reason once per scan and stores every
+link occurrence in three scan-wide typed arrays (URL id, status code, reason id), 9 bytes
+each; a file is just a span of them. Files are compacted as soon as they finish, and
+reports are rendered from this model at the end.
+"""
+
+from array import array
+from collections.abc import Iterable
+from typing import Any
+
+STATUSES = ("OK", "BROKEN", "ERROR")
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+# Keys of the per-file results dict, by status code
+_RESULT_KEYS = ("valid", "broken", "errors")
+
+
+class InternTable:
+    """Maps each distinct string to a small integer id and back."""
+
+    __slots__ = ("_ids", "_values")
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._values: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, value_id: int) -> str:
+        return self._values[value_id]
+
+    def intern(self, value: str) -> int:
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = self._ids[value] = len(self._values)
+            self._values.append(value)
+        return value_id
+
+
+class FileResults:
+    """
+    One file's link occurrences: a span of the scan's arrays, plus a chained span for
+    links appended after other files were added (see ScanResults.extend).
+    """
+
+    __slots__ = ("scan", "start", "stop", "more")
+
+    def __init__(self, scan: "ScanResults", start: int):
+        self.scan = scan
+        self.start = start
+        self.stop = start
+        self.more: FileResults | None = None
+
+    def __len__(self) -> int:
+        return sum(span.stop - span.start for span in self._spans())
+
+    def count(self, status: str) -> int:
+        code = _STATUS_CODES[status]
+        statuses = self.scan.statuses
+        return sum(statuses[span.start:span.stop].count(code) for span in self._spans())
+
+    def _spans(self):
+        span: FileResults | None = self
+        while span is not None:
+            yield span
+            span = span.more
+
+
+class ScanResults:
+    """
+    Every link occurrence of one scan in three typed arrays (URL id, status code, reason
+    id), with the URL and reason tables they index.
+    """
+
+    def __init__(self):
+        self.urls = InternTable()
+        self.reasons = InternTable()
+        self.reasons.intern("")  # Id 0: no reason
+        self.url_ids = array("I")
+        self.statuses = array("B")
+        self.reason_ids = array("I")
+
+    def __len__(self) -> int:
+        return len(self.url_ids)
+
+    def add(self, link_results: dict[str, Any]) -> FileResults:
+        """Compacts a check_links_in_content result; the dict can be dropped afterwards."""
+        file = FileResults(self, len(self.url_ids))
+        for url in link_results["valid"]:
+            self._append(url, 0, None)
+        for code, key in ((1, "broken"), (2, "errors")):
+            for item in link_results[key]:
+                self._append(item["url"], code, item["reason"])
+        file.stop = len(self.url_ids)
+        return file
+
+    def extend(self, file: FileResults, links: Iterable[tuple[str, str, str | None]]):
+        """Appends (url, status, reason) occurrences, e.g. relative links resolved later."""
+        span = file
+        while span.more is not None:
+            span = span.more
+        if span.stop != len(self.url_ids):  # Other files were added since: chain a new span
+            span.more = span = FileResults(self, len(self.url_ids))
+        for url, status, reason in links:
+            self._append(url, _STATUS_CODES[status], reason)
+        span.stop = len(self.url_ids)
+
+    def _append(self, url: str, code: int, reason: str | None):
+        self.url_ids.append(self.urls.intern(url))
+        self.statuses.append(code)
+        self.reason_ids.append(self.reasons.intern(reason) if reason else 0)
+
+    def to_dict(self, file: FileResults) -> dict[str, Any]:
+        """Renders file back into the check_links_in_content result shape."""
+        rendered: dict[str, Any] = {"total": len(file), "valid": [], "broken": [], "errors": []}
+        for span in file._spans():
+            for i in range(span.start, span.stop):
+                url = self.urls[self.url_ids[i]]
+                code = self.statuses[i]
+                if code == 0:
+                    rendered["valid"].append(url)
+                else:
+                    rendered[_RESULT_KEYS[code]].append(
+                        {"url": url, "reason": self.reasons[self.reason_ids[i]]})
+        return rendered
@@ -0,0 +1,58 @@
+# src/mcp_server/tools/retry.py
+
+"""
+Retry policy for transient link check failures.
+
+Only failures that are likely to succeed on a second try are retried: timeouts, dropped
+or refused connections, and the HTTP statuses servers use for "busy, try later".
+Certificate errors, DNS failures, 404s and the like are final. Delays use exponential
+backoff with full jitter, so many URLs failing together do not retry in lockstep.
+"""
+
+import asyncio
+import os
+import random
+
+import aiohttp
+
+# HTTP statuses that signal a temporary condition on the server side
+TRANSIENT_STATUSES = frozenset({429, 502, 503, 504})
+# Connection errors that do not fix themselves (certificates, name resolution)
+_PERMANENT_ERRORS = tuple(
+    e for e in (aiohttp.ClientSSLError, getattr(aiohttp, "ClientConnectorDNSError", None)) if e)
+
+
+class RetryPolicy:
+    """How many attempts to make and how long to wait between them."""
+
+    __slots__ = ("max_attempts", "base_delay", "max_delay")
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 4.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_attempts=int(os.environ.get("MCP_SERVER_RETRY_ATTEMPTS", "3")),
+            base_delay=float(os.environ.get("MCP_SERVER_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.environ.get("MCP_SERVER_RETRY_MAX_DELAY", "4.0")),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (0-based): uniform in [0, base * 2**attempt]."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """True for request exceptions worth retrying."""
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if isinstance(error, _PERMANENT_ERRORS):
+        return False
+    return isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+# Shared policy for the server process
+RETRY_POLICY = RetryPolicy.from_env()
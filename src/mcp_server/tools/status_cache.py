@@ -0,0 +1,105 @@
+# src/mcp_server/tools/status_cache.py
+
+"""
+Process-wide TTL cache of link check results, shared by all tool calls.
+
+Alongside the results it keeps each URL's validators (ETag, Last-Modified) from its last
+2xx response. They outlive the result's TTL: when an expired URL is checked again the
+request is made conditional, and a 304 Not Modified renews the OK result.
+"""
+
+import time
+from collections import OrderedDict
+
+# How long a result stays fresh, by status. Errors are often transient, so they expire fast.
+OK_TTL_SECONDS = 3600
+BROKEN_TTL_SECONDS = 900
+ERROR_TTL_SECONDS = 60
+MAX_CACHE_ENTRIES = 50_000
+
+
+class CacheEntry:
+    """A cached (status, reason) pair and the monotonic time it expires at."""
+
+    __slots__ = ("status", "reason", "expires_at")
+
+    def __init__(self, status: str, reason: str | None, expires_at: float):
+        self.status = status
+        self.reason = reason
+        self.expires_at = expires_at
+
+
+class LinkStatusCache:
+    """LRU-bounded mapping of URL -> CacheEntry with per-status TTLs."""
+
+    def __init__(self, max_entries: int = MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        # URL -> (ETag, Last-Modified), kept after the result expires
+        self._validators: OrderedDict[str, tuple[str | None, str | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def ttl_for(status: str) -> float:
+        if status == "OK":
+            return OK_TTL_SECONDS
+        if status == "BROKEN":
+            return BROKEN_TTL_SECONDS
+        return ERROR_TTL_SECONDS
+
+    def get(self, url: str) -> tuple[str, str | None] | None:
+        """Returns the cached (status, reason) for url, or None if missing or expired."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[url]
+            return None
+        self._entries.move_to_end(url)
+        return (entry.status, entry.reason)
+
+    def set(self, url: str, status: str, reason: str | None):
+        expires_at = time.monotonic() + self.ttl_for(status)
+        self._entries[url] = CacheEntry(status, reason, expires_at)
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def remember_validators(self, url: str, etag: str | None, last_modified: str | None):
+        """Stores the validators of a 2xx response for url; forgets them if it sent none."""
+        if not (etag or last_modified):
+            self._validators.pop(url, None)
+            return
+        self._validators[url] = (etag, last_modified)
+        self._validators.move_to_end(url)
+        while len(self._validators) > self.max_entries:
+            self._validators.popitem(last=False)
+
+    def forget_validators(self, url: str):
+        self._validators.pop(url, None)
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Returns If-None-Match/If-Modified-Since headers for url, empty if it has no validators."""
+        validators = self._validators.get(url)
+        if validators is None:
+            return {}
+        etag, last_modified = validators
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def validator_count(self) -> int:
+        return len(self._validators)
+
+    def clear(self):
+        self._entries.clear()
+        self._validators.clear()
+
+
+# Shared cache for the server process
+STATUS_CACHE = LinkStatusCache()
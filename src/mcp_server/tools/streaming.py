@@ -0,0 +1,108 @@
+# src/mcp_server/tools/streaming.py
+
+"""
+Chunked reading of very large Markdown files (generated API references run to hundreds
+of MB).
+
+Files of at least STREAM_THRESHOLD_BYTES are memory-mapped instead of read into one str,
+and cut into chunks of about STREAM_CHUNK_BYTES at block boundaries that cannot change
+how the rest of the document parses: a blank line, outside fenced code and the HTML
+blocks a blank line does not end (comments, <pre>/<script>/<style>/<textarea>, <?...?>,
+<!...> and CDATA), followed by an unindented line (so indented list continuations and
+code blocks stay whole). Each chunk
+is decoded and parsed on its own; link_checker.check_links_in_file checks the links of
+one chunk while the next is being parsed.
+"""
+
+import mmap
+import os
+import re
+from collections.abc import Iterator
+from pathlib import Path
+
+STREAM_THRESHOLD_BYTES = int(os.environ.get("MCP_SERVER_STREAM_THRESHOLD_BYTES", str(16 * 1024 * 1024)))
+STREAM_CHUNK_BYTES = int(os.environ.get("MCP_SERVER_STREAM_CHUNK_BYTES", str(1024 * 1024)))
+
+# A fence line, the start of an HTML block that runs until its end marker (CommonMark
+# types 1-5), or a blank line followed by an unindented line (a safe cut after it)
+_BLOCK_EVENT = re.compile(
+    rb"^ {0,3}(?=[`~<])(?:(?P<fence>`{3,}|~{3,})"
+    rb"|(?P<html><!--|<\?|<!\[CDATA\[|<![A-Za-z]|<(?i:pre|script|style|textarea)(?=[\s>]|$)))"
+    rb"|\n[ \t\r]*\n(?=\S)", re.MULTILINE)
+# End markers of those HTML blocks, by opener; the block ends with the marker's line
+_HTML_BLOCK_ENDS = (
+    (b"<!--", re.compile(rb"-->")),
+    (b"<?", re.compile(rb"\?>")),
+    (b"<![CDATA[", re.compile(rb"\]\]>")),
+    (b"<!", re.compile(rb">")),
+    (b"<", re.compile(rb"</(?:pre|script|style|textarea)>", re.IGNORECASE)),
+)
+
+
+def should_stream(path: Path) -> bool:
+    """True for files large enough to be read in chunks; False if the size is unknown."""
+    try:
+        return os.stat(path).st_size >= STREAM_THRESHOLD_BYTES
+    except OSError:
+        return False  # Reported by the regular read
+
+
+def _safe_cut(data, start: int, end: int) -> int | None:
+    """Returns the last safe cut in data[start:end], or None if there is none."""
+    fence: bytes | None = None
+    cut = None
+    pos = start
+    while (match := _BLOCK_EVENT.search(data, pos, end)) is not None:
+        pos = match.end()
+        marker = match.group("fence")
+        opener = match.group("html")
+        if marker is not None:
+            if fence is None:
+                fence = marker
+            elif marker[:1] == fence[:1] and len(marker) >= len(fence):
+                fence = None
+        elif opener is not None:
+            if fence is not None:
+                continue  # HTML in fenced code is code
+            closing = next(end_marker for prefix, end_marker in _HTML_BLOCK_ENDS
+                           if opener.startswith(prefix)).search(data, pos, end)
+            line_end = data.find(b"\n", closing.end(), end) if closing is not None else -1
+            if line_end == -1:
+                return cut  # The block runs past the window: no cut inside it
+            pos = line_end
+        elif fence is None:
+            cut = match.end()
+    return cut
+
+
+def split_markdown(data, chunk_bytes: int | None = None) -> Iterator[tuple[int, int]]:
+    """
+    Yields (start, end) offsets covering data (bytes or an mmap) in chunks of about
+    chunk_bytes (default STREAM_CHUNK_BYTES). A chunk grows past chunk_bytes when no safe
+    cut is found in it.
+    """
+    chunk_bytes = chunk_bytes or STREAM_CHUNK_BYTES
+    start, size = 0, len(data)
+    while start < size:
+        window = chunk_bytes
+        while True:
+            end = start + window
+            if end >= size:
+                yield start, size
+                return
+            cut = _safe_cut(data, start, end)
+            if cut is not None and cut > start:
+                yield start, cut
+                start = cut
+                break
+            window *= 2
+
+
+def iter_markdown_chunks(path: Path, chunk_bytes: int | None = None) -> Iterator[str]:
+    """Memory-maps path and yields it as decoded chunks (see split_markdown). Blocking."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in split_markdown(data, chunk_bytes):
+                yield data[start:end].decode("utf-8")
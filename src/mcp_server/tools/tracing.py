@@ -0,0 +1,166 @@
+# src/mcp_server/tools/tracing.py
+
+"""
+Span recording for a single tool call, exported in Chrome trace / Perfetto JSON format.
+
+Like the stage timer, the recorder is bound through a ContextVar. Every asyncio task gets
+its own lane (Chrome "tid"), so concurrent file workers and URL checks show up as
+parallel rows in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+TRACE_DIR = Path(os.environ.get(
+    "MCP_SERVER_TRACE_DIR", os.path.join(tempfile.gettempdir(), "mcp_server_traces")))
+MAX_TRACE_EVENTS = 200_000  # Keeps a runaway scan from exhausting memory
+
+_current_recorder: ContextVar["TraceRecorder | None"] = ContextVar("trace_recorder", default=None)
+
+
+class TraceRecorder:
+    """Collects complete ("X") events with microsecond timestamps relative to call start."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.events: list[dict] = []
+        self.dropped = 0
+        self._origin = time.perf_counter()
+        self._lanes: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._next_lane = 1
+
+    def _lane(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            return 0
+        lane = self._lanes.get(task)
+        if lane is None:
+            lane = self._lanes[task] = self._next_lane
+            self._next_lane += 1
+            # Name the row after the task so lanes are recognisable in the viewer
+            self._append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lane,
+                          "args": {"name": task.get_name()}})
+        return lane
+
+    def _append(self, event: dict):
+        if len(self.events) >= MAX_TRACE_EVENTS:
+            self.dropped += 1
+            return
+        self.events.append(event)
+
+    def add_span(self, name: str, category: str, start: float, end: float, args: dict):
+        """Adds a span given perf_counter() start/end times."""
+        self._append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1_000_000, 1),
+            "dur": round((end - start) * 1_000_000, 1),
+            "pid": 1,
+            "tid": self._lane(),
+            "args": args,
+        })
+
+    def to_chrome_trace(self) -> dict:
+        return {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"label": self.label, "dropped_events": self.dropped},
+        }
+
+    def write(self, directory: Path | None = None) -> Path:
+        directory = directory or TRACE_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+        logger.info(f"Trace for {self.label} written to {path} ({len(self.events)} events)")
+        return path
+
+
+def start_tracing(label: str) -> tuple[TraceRecorder, object]:
+    """Binds a new recorder to the current context, returns (recorder, reset_token)."""
+    recorder = TraceRecorder(label)
+    return recorder, _current_recorder.set(recorder)
+
+
+def stop_tracing(token: object):
+    _current_recorder.reset(token)
+
+
+def current_recorder() -> TraceRecorder | None:
+    return _current_recorder.get()
+
+
+@contextmanager
+def span(name: str, category: str = "scan", **args) -> Iterator[dict]:
+    """
+    Records the enclosed block as a span when tracing is active.
+    Yields the span's args dict so callers can attach results (e.g. a status) before it closes.
+    """
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield args
+        return
+    start = time.perf_counter()
+    try:
+        yield args
+    finally:
+        recorder.add_span(name, category, start, time.perf_counter(), args)
+
+# --- aiohttp client tracing (connection pool waits, DNS, connect) ---
+
+
+def _on_start(ctx_key: str):
+    async def handler(session, trace_config_ctx: SimpleNamespace, params):
+        setattr(trace_config_ctx, ctx_key, time.perf_counter())
+    return handler
+
+
+def _on_end(ctx_key: str, span_name: str):
+    async def handler(session, trace_config_ctx: SimpleNamespace, params):
+        recorder = _current_recorder.get()
+        start = getattr(trace_config_ctx, ctx_key, None)
+        if recorder is None or start is None:
+            return
+        args = {}
+        host = getattr(params, "host", None)
+        if host:
+            args["host"] = host
+        recorder.add_span(span_name, "network", start, time.perf_counter(), args)
+    return handler
+
+
+def aiohttp_trace_configs() -> "list[aiohttp.TraceConfig] | None":
+    """Returns TraceConfigs recording pool waits, DNS and connects, or None if not tracing."""
+    if _current_recorder.get() is None:
+        return None
+    import aiohttp  # Only once a session is opened; keeps this module cheap to import
+
+    config = aiohttp.TraceConfig()
+    config.on_connection_queued_start.append(_on_start("queued"))
+    config.on_connection_queued_end.append(_on_end("queued", "connection_pool_wait"))
+    config.on_dns_resolvehost_start.append(_on_start("dns"))
+    config.on_dns_resolvehost_end.append(_on_end("dns", "dns_resolve"))
+    config.on_connection_create_start.append(_on_start("connect"))
+    config.on_connection_create_end.append(_on_end("connect", "connect"))
+    return [config]
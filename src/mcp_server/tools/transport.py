@@ -0,0 +1,257 @@
+# src/mcp_server/tools/transport.py
+
+"""
+Pluggable HTTP transports used by the link checker.
+
+A transport sends a single HEAD request without following redirects and returns a small
+HeadResponse; redirects, retries, breakers and timeouts stay in link_checker.py. It can
+also stream a GET response body (used to index anchors, see anchors.py). Failures
+are raised as aiohttp exception types (asyncio.TimeoutError, aiohttp.ClientError
+subclasses) whatever the backend, so retry and breaker classification is shared.
+
+Backends, selected with MCP_SERVER_TRANSPORT:
+- "aiohttp" (default): HTTP/1.1, one connection per concurrent request to a host.
+- "http2": httpx with HTTP/2, multiplexing concurrent requests to a host over one
+  connection. Optional: requires `pip install "mcp_server[http2]"` (httpx + h2); falls
+  back to aiohttp with a warning when missing. Uses its own DNS resolution, so only
+  NXDOMAIN short-circuiting from the shared resolver applies. Inside call_transports()
+  (every tool call, and the pre-warm) one client is shared by all the call's batches,
+  so a scan keeps one multiplexed connection per host instead of one per file.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator, Mapping
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+import aiohttp
+from yarl import URL
+
+from .adaptive_timeouts import TimeoutBudget, timing_trace_config
+from .resolver import SharedCacheResolver
+from .tracing import aiohttp_trace_configs
+
+try:
+    import httpx
+except ImportError:  # Optional dependency, only needed for the http2 backend
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+TRANSPORT_BACKEND = os.environ.get("MCP_SERVER_TRANSPORT", "aiohttp").lower()
+# Maximum connections the HTTP/2 client keeps, one per host; streams are multiplexed over
+# each. The client is shared by a whole tool call, so this matches aiohttp's default limit
+HTTP2_MAX_CONNECTIONS = 100
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def http2_available() -> bool:
+    return httpx is not None and importlib.util.find_spec("h2") is not None
+
+
+class HeadResponse:
+    """Status line and headers of a response; the body is never read."""
+
+    __slots__ = ("status", "reason", "headers", "url")
+
+    def __init__(self, status: int, reason: str | None, headers: Mapping[str, str], url: URL):
+        self.status = status
+        self.reason = reason
+        self.headers = headers  # Case-insensitive mapping
+        self.url = url
+
+
+class Transport(ABC):
+    """Interface for sending link check requests."""
+
+    name = "base"
+
+    @abstractmethod
+    async def head(self, url: str, *, budget: TimeoutBudget, headers: dict[str, str],
+                   timings: dict[str, float]) -> HeadResponse:
+        """
+        Sends a HEAD request for url without following redirects. Backends that can
+        measure them add "connect" and "queued" seconds to `timings`.
+        """
+
+    @abstractmethod
+    def get(self, url: str, *, budget: TimeoutBudget, headers: dict[str, str]
+            ) -> AbstractAsyncContextManager[tuple[HeadResponse, AsyncIterator[bytes]]]:
+        """
+        Sends a GET request for url, following redirects. Used as `async with`, yields the
+        final response and an iterator over its (decompressed) body chunks; leaving the
+        block early discards the rest of the body.
+        """
+
+    @abstractmethod
+    async def close(self):
+        """Closes the backend's connections."""
+
+
+class AiohttpTransport(Transport):
+    """HTTP/1.1 via an aiohttp ClientSession."""
+
+    name = "aiohttp"
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+
+    @classmethod
+    def open(cls) -> "AiohttpTransport":
+        connector = aiohttp.TCPConnector(resolver=SharedCacheResolver())
+        trace_configs = [timing_trace_config(), *(aiohttp_trace_configs() or [])]
+        return cls(aiohttp.ClientSession(connector=connector, trace_configs=trace_configs))
+
+    async def head(self, url: str, *, budget: TimeoutBudget, headers: dict[str, str],
+                   timings: dict[str, float]) -> HeadResponse:
+        async with self.session.head(
+            url,
+            timeout=budget.client_timeout(),
+            headers=headers,
+            allow_redirects=False,  # Redirects are followed by the caller
+            trace_request_ctx=timings,
+        ) as response:
+            return HeadResponse(response.status, response.reason, response.headers, response.url)
+
+    @asynccontextmanager
+    async def get(self, url: str, *, budget: TimeoutBudget, headers: dict[str, str]
+                  ) -> AsyncIterator[tuple[HeadResponse, AsyncIterator[bytes]]]:
+        async with self.session.get(url, timeout=budget.client_timeout(), headers=headers) as response:
+            yield (HeadResponse(response.status, response.reason, response.headers, response.url),
+                   response.content.iter_chunked(STREAM_CHUNK_BYTES))
+
+    async def close(self):
+        await self.session.close()
+
+
+@contextmanager
+def _httpx_errors(url: str) -> Iterator[None]:
+    """Re-raises httpx failures as the aiohttp exceptions the retry and breaker logic expects."""
+    try:
+        yield
+    except httpx.TimeoutException as e:
+        raise asyncio.TimeoutError() from e
+    except httpx.RemoteProtocolError as e:
+        raise aiohttp.ServerDisconnectedError(str(e)) from e
+    except httpx.TransportError as e:
+        raise aiohttp.ClientConnectionError(f"{type(e).__name__}: {e}") from e
+    except httpx.InvalidURL as e:
+        raise aiohttp.InvalidURL(url) from e
+
+
+class Http2Transport(Transport):
+    """HTTP/2 via httpx; concurrent requests to one host share a connection."""
+
+    name = "http2"
+
+    def __init__(self, client: "httpx.AsyncClient"):
+        self.client = client
+
+    @classmethod
+    def open(cls, prior_knowledge: bool = False) -> "Http2Transport":
+        """
+        Opens a client negotiating HTTP/2 via TLS ALPN. With prior_knowledge, plain
+        http:// URLs also use HTTP/2 (h2c), for servers known to support it.
+        """
+        limits = httpx.Limits(max_connections=HTTP2_MAX_CONNECTIONS)
+        return cls(httpx.AsyncClient(http1=not prior_knowledge, http2=True, limits=limits))
+
+    async def head(self, url: str, *, budget: TimeoutBudget, headers: dict[str, str],
+                   timings: dict[str, float]) -> HeadResponse:
+        with _httpx_errors(url):
+            response = await asyncio.wait_for(
+                self.client.head(url, headers=headers, timeout=_httpx_timeout(budget),
+                                 follow_redirects=False),
+                budget.total)
+        return _head_response(response)
+
+    @asynccontextmanager
+    async def get(self, url: str, *, budget: TimeoutBudget, headers: dict[str, str]
+                  ) -> AsyncIterator[tuple[HeadResponse, AsyncIterator[bytes]]]:
+        # httpx has no total timeout; callers bound the whole body read themselves
+        with _httpx_errors(url):
+            async with self.client.stream("GET", url, headers=headers, timeout=_httpx_timeout(budget),
+                                          follow_redirects=True) as response:
+                yield _head_response(response), response.aiter_bytes(STREAM_CHUNK_BYTES)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def _httpx_timeout(budget: TimeoutBudget) -> "httpx.Timeout":
+    return httpx.Timeout(budget.total, connect=budget.connect, read=budget.first_byte)
+
+
+def _head_response(response: "httpx.Response") -> HeadResponse:
+    return HeadResponse(response.status_code, response.reason_phrase, response.headers,
+                        URL(str(response.url), encoded=True))
+
+
+def as_transport(session: "aiohttp.ClientSession | Transport") -> Transport:
+    """Accepts a Transport or a bare aiohttp session (wrapped without taking ownership)."""
+    if isinstance(session, Transport):
+        return session
+    return AiohttpTransport(session)
+
+
+class _CallTransports:
+    """Transports shared by every batch of one tool call, opened on first use."""
+
+    def __init__(self):
+        self.http2: Transport | None = None
+
+    def http2_transport(self) -> Transport:
+        if self.http2 is None:
+            self.http2 = Http2Transport.open()
+        return self.http2
+
+    async def close(self):
+        if self.http2 is not None:
+            await self.http2.close()
+
+
+_call_transports: ContextVar[_CallTransports | None] = ContextVar("call_transports", default=None)
+
+
+@asynccontextmanager
+async def call_transports() -> AsyncIterator[None]:
+    """
+    Binds transports shared by all batches in the block (a tool call) and closes them at
+    the end. Only the HTTP/2 client is shared: it multiplexes every request to a host over
+    one connection, which only pays off if the connection outlives a single file's batch.
+    """
+    scope = _CallTransports()
+    token = _call_transports.set(scope)
+    try:
+        yield
+    finally:
+        _call_transports.reset(token)
+        await scope.close()
+
+
+@asynccontextmanager
+async def open_transport(backend: str | None = None) -> AsyncIterator[Transport]:
+    """
+    Opens the configured backend for one batch of checks and closes it afterwards. Within
+    call_transports() the call's shared HTTP/2 client is used and left open.
+    """
+    backend = backend or TRANSPORT_BACKEND
+    scope = _call_transports.get()
+    if backend == "http2" and http2_available() and scope is not None:
+        yield scope.http2_transport()
+        return
+    if backend == "http2" and http2_available():
+        transport: Transport = Http2Transport.open()
+    else:
+        if backend == "http2":
+            logger.warning("HTTP/2 transport requested but httpx[http2] is not installed, "
+                           "using aiohttp")
+        transport = AiohttpTransport.open()
+    try:
+        yield transport
+    finally:
+        await transport.close()
@@ -0,0 +1,49 @@
+# tests/conftest.py
+
+import socket
+from unittest.mock import patch
+
+import pytest
+
+from mcp_server.tools.adaptive_timeouts import ADAPTIVE_TIMEOUTS
+from mcp_server.tools.anchors import ANCHOR_INDEX
+from mcp_server.tools.circuit_breaker import CIRCUIT_BREAKERS
+from mcp_server.tools.metrics import METRICS
+from mcp_server.tools.resolver import RESOLVER
+from mcp_server.tools.retry import RETRY_POLICY
+from mcp_server.tools.status_cache import STATUS_CACHE
+
+
+async def _offline_getaddrinfo(host: str) -> list[tuple[int, str]]:
+    return [(socket.AF_INET, "127.0.0.1")]
+
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    """Clears process-wide caches and metrics so tests do not leak results into each other."""
+    STATUS_CACHE.clear()
+    RESOLVER.clear()
+    CIRCUIT_BREAKERS.clear()
+    ADAPTIVE_TIMEOUTS.clear()
+    ANCHOR_INDEX.clear()
+    METRICS.reset()
+    yield
+    STATUS_CACHE.clear()
+    RESOLVER.clear()
+    CIRCUIT_BREAKERS.clear()
+    ADAPTIVE_TIMEOUTS.clear()
+    ANCHOR_INDEX.clear()
+    METRICS.reset()
+
+
+@pytest.fixture(autouse=True)
+def offline_dns():
+    """Keeps host pre-resolution off the network; every host resolves to loopback."""
+    with patch("mcp_server.tools.resolver._system_getaddrinfo", _offline_getaddrinfo) as stub:
+        yield stub
+
+
+@pytest.fixture(autouse=True)
+def no_retries(monkeypatch):
+    """Makes one attempt per URL so failure tests are fast; retry tests raise the limit."""
+    monkeypatch.setattr(RETRY_POLICY, "max_attempts", 1)
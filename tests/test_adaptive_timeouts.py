@@ -0,0 +1,123 @@
+# tests/test_adaptive_timeouts.py
+
+from mcp_server.tools.adaptive_timeouts import (
+    CONNECT_LIMITS,
+    DEFAULT_CONNECT_SECONDS,
+    DEFAULT_FIRST_BYTE_SECONDS,
+    DEFAULT_TLS_SECONDS,
+    DEFAULT_TOTAL_SECONDS,
+    FIRST_BYTE_LIMITS,
+    MIN_SAMPLES,
+    P95_MULTIPLIER,
+    TIMEOUT_GROWTH,
+    TOTAL_LIMITS,
+    AdaptiveTimeouts,
+)
+
+
+def test_defaults_until_enough_samples():
+    """Test unknown hosts use the defaults, with a TLS allowance for https."""
+    timeouts = AdaptiveTimeouts()
+    for _ in range(MIN_SAMPLES - 1):
+        timeouts.observe("new.com", total=0.1, first_byte=0.1, connect=0.01)
+
+    https = timeouts.budget_for("new.com", "https")
+    http = timeouts.budget_for("new.com", "http")
+
+    assert not https.learned
+    assert https.connect == DEFAULT_CONNECT_SECONDS + DEFAULT_TLS_SECONDS
+    assert http.connect == DEFAULT_CONNECT_SECONDS
+    assert https.first_byte == DEFAULT_FIRST_BYTE_SECONDS
+    assert https.total == DEFAULT_TOTAL_SECONDS
+
+
+def test_fast_host_budgets_clamp_to_minimums():
+    """Test fast hosts get the tightest budgets so failures surface quickly."""
+    timeouts = AdaptiveTimeouts()
+    for _ in range(MIN_SAMPLES):
+        timeouts.observe("fast.com", total=0.02, first_byte=0.01, connect=0.005)
+
+    budget = timeouts.budget_for("fast.com")
+
+    assert budget.learned
+    assert (budget.connect, budget.first_byte, budget.total) == (
+        CONNECT_LIMITS[0], FIRST_BYTE_LIMITS[0], TOTAL_LIMITS[0])
+
+
+def test_slow_host_gets_a_longer_budget():
+    """Test a slow but healthy host is allowed a multiple of its p95, up to the limits."""
+    timeouts = AdaptiveTimeouts()
+    for seconds in (4.0, 4.5, 5.0, 5.5, 6.0):
+        timeouts.observe("slow.com", total=seconds + 0.5, first_byte=seconds, connect=None)
+
+    budget = timeouts.budget_for("slow.com")
+
+    assert budget.first_byte == P95_MULTIPLIER * 6.0
+    assert budget.total == P95_MULTIPLIER * 6.5
+    # Connections were all reused, so the connect budget is not learned yet
+    assert budget.connect == DEFAULT_CONNECT_SECONDS + DEFAULT_TLS_SECONDS
+
+    for _ in range(MIN_SAMPLES):
+        timeouts.observe("slow.com", total=30.0, first_byte=29.0)
+    assert timeouts.budget_for("slow.com").total == TOTAL_LIMITS[1]
+
+    client_timeout = budget.client_timeout()
+    assert client_timeout.sock_read == budget.first_byte
+    assert client_timeout.sock_connect == budget.connect
+
+
+def test_snapshot_lists_budgets_per_host():
+    timeouts = AdaptiveTimeouts()
+    timeouts.observe("b.com", total=0.1, first_byte=0.1)
+    timeouts.observe("a.com", total=0.1, first_byte=0.1)
+
+    snapshot = timeouts.snapshot()
+
+    assert list(snapshot) == ["a.com", "b.com"]
+    assert set(snapshot["a.com"]) == {"connect", "first_byte", "total", "learned"}
+
+
+def test_timeouts_raise_the_budget_of_a_healthy_host():
+    """Test a host too slow for the defaults gets longer budgets, up to the limits."""
+    timeouts = AdaptiveTimeouts()
+    budget = timeouts.budget_for("slow.com")
+    budgets = []
+    for _ in range(4):
+        timeouts.observe_timeout("slow.com", budget, connected=True)
+        budget = timeouts.budget_for("slow.com")
+        budgets.append((budget.first_byte, budget.total))
+
+    growth = TIMEOUT_GROWTH * DEFAULT_TOTAL_SECONDS
+    assert budgets[0] == (growth, growth)
+    assert budgets[-1] == (FIRST_BYTE_LIMITS[1], TOTAL_LIMITS[1])
+    assert budget.connect == DEFAULT_CONNECT_SECONDS + DEFAULT_TLS_SECONDS
+
+    # Once the host has answered often enough its samples decide again
+    for _ in range(MIN_SAMPLES):
+        timeouts.observe("slow.com", total=12.0, first_byte=11.0)
+    assert timeouts.budget_for("slow.com").total == P95_MULTIPLIER * 12.0
+
+
+def test_connect_timeouts_on_unknown_hosts_raise_nothing():
+    """Test a host that never accepted a connection keeps the default budgets."""
+    timeouts = AdaptiveTimeouts()
+    timeouts.observe_timeout("down.com", timeouts.budget_for("down.com"), connected=False)
+
+    assert timeouts.budget_for("down.com").total == DEFAULT_TOTAL_SECONDS
+    assert timeouts.snapshot() == {}
+
+    # A host that has answered before is healthy even if the connection was reused
+    timeouts.observe("known.com", total=0.1, first_byte=0.1)
+    timeouts.observe_timeout("known.com", timeouts.budget_for("known.com"))
+    assert timeouts.budget_for("known.com").total == TIMEOUT_GROWTH * DEFAULT_TOTAL_SECONDS
+
+
+def test_snapshot_reports_the_budget_for_the_hosts_scheme():
+    timeouts = AdaptiveTimeouts()
+    timeouts.observe("plain.com", total=0.1, first_byte=0.1, scheme="http")
+    timeouts.observe("tls.com", total=0.1, first_byte=0.1, scheme="https")
+
+    snapshot = timeouts.snapshot()
+
+    assert snapshot["plain.com"]["connect"] == DEFAULT_CONNECT_SECONDS
+    assert snapshot["tls.com"]["connect"] == DEFAULT_CONNECT_SECONDS + DEFAULT_TLS_SECONDS
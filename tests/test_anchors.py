@@ -0,0 +1,114 @@
+# tests/test_anchors.py
+
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+from yarl import URL
+
+from mcp_server.tools.anchors import (
+    ANCHOR_INDEX,
+    checkable_fragment,
+    start_anchor_checking,
+    stop_anchor_checking,
+)
+from mcp_server.tools.link_checker import check_links_in_content
+from mcp_server.tools.metrics import METRICS
+from mcp_server.tools.transport import AiohttpTransport
+
+PAGE = "https://docs.example.com/guide"
+HTML = (
+    "<html><body><h1 id='intro'>Intro</h1><a name='legacy'></a>"
+    "<h2 id='user-content-setup'>Setup</h2><p id='café'>x</p></body></html>"
+)
+
+
+@pytest.mark.parametrize("link, expected", [
+    ("https://x.com/page#intro", "intro"),
+    ("https://x.com/page#caf%C3%A9", "café"),
+    ("https://x.com/page", None),
+    ("https://x.com/page#", None),
+    ("https://x.com/page#top", None),
+    ("https://x.com/app#/settings", None),
+    ("https://x.com/app#!/settings", None),
+    ("https://x.com/page#:~:text=hello", None),
+    ("https://github.com/o/r/blob/main/a.py#L10-L20", None),
+])
+def test_checkable_fragment(link, expected):
+    assert checkable_fragment(link) == expected
+
+
+@pytest.mark.asyncio
+async def test_page_is_indexed_once_and_revalidated_when_stale():
+    """Test ids, <a name> and GitHub-prefixed ids are indexed; a stale entry gets a 304 check."""
+    with aioresponses() as m:
+        m.get(PAGE, body=HTML, content_type="text/html", headers={"ETag": '"v1"'})
+        m.get(PAGE, status=304)
+        async with aiohttp.ClientSession() as session:
+            transport = AiohttpTransport(session)
+            page = await ANCHOR_INDEX.page_anchors(transport, PAGE, {})
+            assert {"intro", "legacy", "user-content-setup", "setup", "café"} <= page.anchors
+            assert await ANCHOR_INDEX.page_anchors(transport, PAGE, {}) is page  # Cached
+
+            page.expires_at = 0.0
+            revalidated = await ANCHOR_INDEX.page_anchors(transport, PAGE, {})
+        requests = m.requests[("GET", URL(PAGE))]
+    assert len(requests) == 2
+    assert requests[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert revalidated.anchors == page.anchors
+    assert revalidated.expires_at > 0.0
+    counters = METRICS.snapshot()["counters"]
+    assert counters["anchor_pages_fetched"] == 1
+    assert counters["anchor_pages_not_modified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_large_pages_are_truncated_and_misses_unverified():
+    """Test only MAX_PAGE_BYTES are parsed; anchors past the cap are not reported broken."""
+    body = "<p id='early'></p>" + " " * 100 + "<p id='late'></p>"
+    with patch("mcp_server.tools.anchors.MAX_PAGE_BYTES", 50), aioresponses() as m:
+        m.get(PAGE, body=body, content_type="text/html")
+        async with aiohttp.ClientSession() as session:
+            page = await ANCHOR_INDEX.page_anchors(AiohttpTransport(session), PAGE, {})
+    assert page.truncated
+    assert page.check("early") is None
+    assert page.check("late")[0] == "ERROR"
+
+
+@pytest.mark.asyncio
+async def test_non_html_pages_are_not_validated():
+    with aioresponses() as m:
+        m.get(PAGE, body=b"%PDF-1.7", content_type="application/pdf")
+        async with aiohttp.ClientSession() as session:
+            page = await ANCHOR_INDEX.page_anchors(AiohttpTransport(session), PAGE, {})
+    assert page.check("page=2") is None
+
+
+@pytest.mark.asyncio
+async def test_check_links_in_content_reports_missing_anchors():
+    """Test fragments on one page are checked against a single download of it."""
+    markdown = f"[a]({PAGE}#intro) [b]({PAGE}#setup) [c]({PAGE}#missing) [d]({PAGE})"
+    token = start_anchor_checking(True)
+    try:
+        with aioresponses() as m:
+            m.head(PAGE, status=200)
+            m.get(PAGE, body=HTML, content_type="text/html")
+            result = await check_links_in_content(markdown)
+            assert len(m.requests[("GET", URL(PAGE))]) == 1
+    finally:
+        stop_anchor_checking(token)
+
+    assert sorted(result["valid"]) == sorted([f"{PAGE}#intro", f"{PAGE}#setup", PAGE])
+    assert result["broken"] == [
+        {"url": f"{PAGE}#missing", "reason": "Anchor '#missing' not found on page"}]
+    assert METRICS.snapshot()["counters"]["anchors_broken"] == 1
+
+
+@pytest.mark.asyncio
+async def test_anchor_checking_is_off_by_default():
+    with aioresponses() as m:
+        m.head(PAGE, status=200)
+        result = await check_links_in_content(f"[c]({PAGE}#missing)")
+    assert result["valid"] == [f"{PAGE}#missing"]
+    assert len(ANCHOR_INDEX) == 0
@@ -0,0 +1,28 @@
+# tests/test_canonical.py
+
+import pytest
+
+from mcp_server.tools.canonical import canonicalize
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://Example.COM/Path", "https://example.com/Path"),  # Paths stay case-sensitive
+    ("https://example.com/a#intro", "https://example.com/a"),
+    ("https://example.com:443/a", "https://example.com/a"),
+    ("http://example.com:80/a", "http://example.com/a"),
+    ("http://example.com:443/a", "http://example.com:443/a"),  # Not the default for http
+    ("https://example.com:8443/a", "https://example.com:8443/a"),
+    ("http://example.com:/a", "http://example.com/a"),
+    ("https://example.com/%7euser/a%2fb", "https://example.com/~user/a%2Fb"),
+    ("https://example.com/search?q=%41%20b", "https://example.com/search?q=A%20b"),
+    ("https://User:Pw@Example.com:443/", "https://User:Pw@example.com/"),
+    ("http://[::1]:8080/x", "http://[::1]:8080/x"),
+    ("http://example.com", "http://example.com"),
+])
+def test_canonicalize(url, expected):
+    assert canonicalize(url) == expected
+
+
+def test_canonicalize_leaves_malformed_urls_unchanged():
+    """Test an invalid port does not raise; the URL is checked (and fails) as written."""
+    assert canonicalize("http://example.com:99999x/") == "http://example.com:99999x/"
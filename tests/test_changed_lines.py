@@ -0,0 +1,145 @@
+# tests/test_changed_lines.py
+
+import shutil
+import subprocess
+
+import pytest
+
+from mcp_server.tools.changed_lines import (
+    ChangedLines,
+    changed_markdown_lines,
+    parse_diff,
+)
+from mcp_server.tools.link_checker import _scan_changed_lines, _scan_markdown
+from mcp_server.tools.metrics import METRICS
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+DOC = """# Title
+
+Intro [a](https://a.com) and
+more https://b.com text.
+
+- [multi
+  line](https://c.com)
+- see [ref][r] and [guide](./guide.md)
+
+[r]: https://d.com
+"""
+
+
+def _git(root, *args):
+    subprocess.run(["git", "-C", str(root), "-c", "user.name=Test", "-c", "user.email=test@example.com",
+                    *args], check=True, capture_output=True)
+
+
+def test_parse_diff_reads_new_side_ranges():
+    diff = "\n".join([
+        "diff --git docs/a.md docs/a.md",
+        "--- docs/a.md",
+        "+++ docs/a.md",
+        "@@ -1,0 +2,2 @@",
+        "+++ not a file header",
+        "+@@ -1 +1 @@ not a hunk header",
+        "@@ -5 +7 @@",
+        "-old\x0cpage",
+        "+new\x0cpage",
+        "\\ No newline at end of file",
+        "@@ -9,2 +10,0 @@",
+        "-gone",
+        "-gone",
+        "diff --git \"caf\\303\\251.md\" \"caf\\303\\251.md\"",
+        "+++ \"caf\\303\\251.md\"",
+        "@@ -3 +3 @@",
+        "-x",
+        "+y",
+    ])
+    assert parse_diff(diff) == {"docs/a.md": [(1, 3), (6, 7)], "café.md": [(2, 3)]}
+
+
+def test_changed_lines_overlaps():
+    changed = ChangedLines([(10, 12), (2, 3)])
+    assert changed.overlaps(2, 2) and changed.overlaps(11, 11) and changed.overlaps(0, 2)
+    assert changed.overlaps(8, 20)
+    assert not changed.overlaps(3, 9)
+    assert not changed.overlaps(12, 40)
+    assert not changed.overlaps(0, 1)
+    assert ChangedLines().overlaps(100, 100)
+
+
+def test_token_lines_attribute_links_to_their_lines():
+    link_lines = {}
+    _scan_markdown(DOC, local=True, link_lines=link_lines)
+    assert link_lines == {
+        "https://a.com": [(2, 2)],
+        "https://b.com": [(3, 3)],
+        "https://c.com": [(5, 6)],  # Link text spans two lines
+        "https://d.com": [(7, 7)],  # Where the reference is used
+        "./guide.md": [(7, 7)],
+    }
+
+
+@pytest.mark.parametrize("ranges,links,local", [
+    ([(3, 4)], ["https://b.com"], []),
+    ([(6, 7)], ["https://c.com"], []),
+    ([(7, 8)], ["https://d.com"], ["./guide.md"]),
+    ([(9, 10)], ["https://d.com"], []),  # Definition edited, its uses unchanged
+    ([(0, 2), (4, 5)], [], []),
+    (None, ["https://a.com", "https://b.com", "https://c.com", "https://d.com"], ["./guide.md"]),
+])
+def test_scan_changed_lines_keeps_links_on_changed_lines(ranges, links, local):
+    kept, kept_local, anchors = _scan_changed_lines(DOC, ChangedLines(ranges), local=True)
+    assert kept == links
+    assert kept_local == local
+    assert anchors == {"title"}
+
+
+def test_changed_reference_definition_after_a_form_feed():
+    """Test line numbers count "\n" only, so a form feed does not shift the changed lines."""
+    doc = "# T\n\nsee [x][r]\x0cmore\u2028text\n\n[r]: https://d.com\n"
+    changed = ChangedLines([(4, 5)])
+    assert changed.text(doc) == "[r]: https://d.com"
+    kept, _, _ = _scan_changed_lines(doc, changed)
+    assert kept == ["https://d.com"]
+
+
+@requires_git
+def test_changed_markdown_lines_since_the_merge_base(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "a.md").write_text("one\ntwo\nthree\n", encoding="utf-8")
+    (tmp_path / "docs" / "b.md").write_text("b\n", encoding="utf-8")
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+    _git(tmp_path, "checkout", "-q", "-b", "feature")
+    (tmp_path / "a.md").write_text("one\n2\nthree\nfour\n", encoding="utf-8")
+    _git(tmp_path, "commit", "-q", "-am", "edit")
+    _git(tmp_path, "checkout", "-q", "main")
+    (tmp_path / "docs" / "b.md").write_text("b on main\n", encoding="utf-8")
+    _git(tmp_path, "commit", "-q", "-am", "main moves on")
+    _git(tmp_path, "checkout", "-q", "feature")
+    (tmp_path / "new.md").write_text("new\n", encoding="utf-8")  # Untracked
+    (tmp_path / "notes.txt").write_text("not markdown\n", encoding="utf-8")
+
+    changed = changed_markdown_lines(tmp_path, "main")
+    # docs/b.md changed on main after the fork, not on this branch
+    assert {path.name: lines.ranges for path, lines in changed.items()} == {
+        "a.md": [(1, 2), (3, 4)], "new.md": None}
+    assert list(changed_markdown_lines(tmp_path, "main", untracked=False)) == [tmp_path / "a.md"]
+    assert changed_markdown_lines(tmp_path, "HEAD", untracked=False) == {}
+
+    with pytest.raises(ValueError, match="Unknown git ref"):
+        changed_markdown_lines(tmp_path, "no-such-branch")
+    with pytest.raises(ValueError, match="Invalid git ref"):
+        changed_markdown_lines(tmp_path, "--output=x")
+
+
+@requires_git
+def test_changed_markdown_lines_outside_git(tmp_path):
+    with pytest.raises(ValueError, match="Not a git work tree"):
+        changed_markdown_lines(tmp_path, "HEAD")
+
+
+def test_links_outside_changes_are_counted():
+    _scan_changed_lines(DOC, ChangedLines([(2, 3)]))
+    assert METRICS.snapshot()["counters"]["links_outside_changes"] == 3
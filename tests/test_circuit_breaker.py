@@ -0,0 +1,86 @@
+# tests/test_circuit_breaker.py
+
+from unittest.mock import patch
+
+from mcp_server.tools.circuit_breaker import (
+    CLOSED,
+    COOLDOWN_SECONDS,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreakerRegistry,
+)
+
+MONOTONIC = "mcp_server.tools.circuit_breaker.time.monotonic"
+
+
+def _open_breaker(breakers: CircuitBreakerRegistry, host: str, now: float = 0.0):
+    with patch(MONOTONIC, return_value=now):
+        for _ in range(breakers.threshold):
+            breakers.record_failure(host)
+
+
+def test_breaker_opens_after_consecutive_failures():
+    """Test the breaker refuses requests once the failure threshold is reached."""
+    breakers = CircuitBreakerRegistry(threshold=3)
+    breakers.record_failure("dead.com")
+    breakers.record_failure("dead.com")
+    assert breakers.before_request("dead.com") is None
+
+    _open_breaker(breakers, "dead.com")
+    assert breakers.state("dead.com") == OPEN
+    with patch(MONOTONIC, return_value=1.0):
+        reason = breakers.before_request("dead.com")
+    assert reason.startswith("Circuit open: host unreachable after")
+    assert breakers.before_request("other.com") is None
+    assert breakers.open_count() == 1
+
+
+def test_success_resets_failure_count():
+    """Test failures must be consecutive to open the breaker."""
+    breakers = CircuitBreakerRegistry(threshold=2)
+    breakers.record_failure("flaky.com")
+    breakers.record_success("flaky.com")
+    breakers.record_failure("flaky.com")
+    assert breakers.state("flaky.com") == CLOSED
+
+
+def test_half_open_allows_a_single_probe():
+    """Test after the cooldown one probe is let through and a success closes the breaker."""
+    breakers = CircuitBreakerRegistry(threshold=2)
+    _open_breaker(breakers, "slow.com")
+
+    with patch(MONOTONIC, return_value=COOLDOWN_SECONDS + 1):
+        assert breakers.before_request("slow.com") is None  # The probe
+        assert breakers.state("slow.com") == HALF_OPEN
+        assert "probe in progress" in breakers.before_request("slow.com")
+
+    breakers.record_success("slow.com")
+    assert breakers.state("slow.com") == CLOSED
+    assert breakers.before_request("slow.com") is None
+
+
+def test_failed_probe_reopens_with_longer_cooldown():
+    """Test a failed probe reopens the breaker and doubles the cooldown."""
+    breakers = CircuitBreakerRegistry(threshold=2)
+    _open_breaker(breakers, "down.com")
+
+    probe_time = COOLDOWN_SECONDS + 1
+    with patch(MONOTONIC, return_value=probe_time):
+        assert breakers.before_request("down.com") is None
+        breakers.record_failure("down.com")
+    assert breakers.state("down.com") == OPEN
+
+    with patch(MONOTONIC, return_value=probe_time + COOLDOWN_SECONDS + 1):
+        assert breakers.before_request("down.com") is not None
+    with patch(MONOTONIC, return_value=probe_time + 2 * COOLDOWN_SECONDS + 1):
+        assert breakers.before_request("down.com") is None
+
+
+def test_released_probe_frees_the_slot():
+    """Test a probe that ends without a verdict lets the next request probe instead."""
+    breakers = CircuitBreakerRegistry(threshold=1)
+    _open_breaker(breakers, "x.com")
+    with patch(MONOTONIC, return_value=COOLDOWN_SECONDS + 1):
+        assert breakers.before_request("x.com") is None
+        breakers.release_probe("x.com")
+        assert breakers.before_request("x.com") is None
@@ -0,0 +1,48 @@
+# tests/test_deadline.py
+
+from unittest.mock import patch
+
+from mcp_server.tools.deadline import (
+    expired,
+    note_skipped,
+    remaining,
+    start_deadline,
+    stop_deadline,
+)
+
+
+def test_remaining_counts_down_and_resets():
+    """Test the deadline is visible while bound and gone after it is stopped."""
+    assert remaining() is None
+    with patch("mcp_server.tools.deadline.time.monotonic", return_value=100.0):
+        _, token = start_deadline(30)
+    with patch("mcp_server.tools.deadline.time.monotonic", return_value=110.0):
+        assert remaining() == 20.0
+        assert not expired()
+    with patch("mcp_server.tools.deadline.time.monotonic", return_value=130.0):
+        assert expired()
+    stop_deadline(token)
+    assert remaining() is None
+    assert not expired()
+
+
+def test_no_deadline():
+    deadline, token = start_deadline(None)
+    assert deadline is None
+    assert remaining() is None
+    note_skipped(urls=1)  # Ignored without a deadline
+    stop_deadline(token)
+
+
+def test_skipped_work_is_reported():
+    """Test skipped URLs and files are counted into the budget note."""
+    deadline, token = start_deadline(5)
+    try:
+        assert deadline.format_note() is None
+        note_skipped(urls=3)
+        note_skipped(files=1)
+    finally:
+        stop_deadline(token)
+    assert deadline.format_note() == (
+        "Time budget of 5s exhausted: results are partial. "
+        "3 URLs and 1 files were not checked (budget).")
@@ -0,0 +1,112 @@
+# tests/test_file_loader.py
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from mcp_server.server import MAX_CONCURRENT_FILES, _check_single_file
+from mcp_server.tools.file_loader import (
+    BulkLoader,
+    current_loader,
+    start_loading,
+    stop_loading,
+)
+from mcp_server.tools.metrics import METRICS
+from mcp_server.tools.pipeline import run_file_pipeline
+
+
+class _ListSource:
+    """A pipeline source over a fixed list of paths."""
+
+    def __init__(self, paths):
+        self._items = list(enumerate(paths))
+
+    async def get(self):
+        return self.get_nowait()
+
+    def get_nowait(self):
+        return self._items.pop(0) if self._items else None
+
+
+def _write(tmp_path, count: int) -> list:
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"doc_{i:03d}.md"
+        path.write_text(f"# Doc {i}\n\nSee https://example.com/{i}\n", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+async def _drain(loader: BulkLoader) -> list:
+    items = []
+    while (item := await loader.get()) is not None:
+        items.append(item)
+    return items
+
+
+@pytest.mark.asyncio
+async def test_files_are_loaded_in_batches_with_errors_kept(tmp_path):
+    """Test small files share batch jobs, large and streamed ones are left to the checker."""
+    paths = _write(tmp_path, 5)
+    (tmp_path / "big.md").write_bytes(b"x" * 100)
+    (tmp_path / "huge.md").write_bytes(b"x" * 1000)
+    paths += [tmp_path / "big.md", tmp_path / "huge.md", tmp_path / "missing.md"]
+
+    with patch("mcp_server.tools.file_loader.LOADER_BATCH_FILES", 4), \
+            patch("mcp_server.tools.file_loader.LOADER_LARGE_FILE_BYTES", 100), \
+            patch("mcp_server.tools.file_loader.STREAM_THRESHOLD_BYTES", 1000):
+        loader = BulkLoader(_ListSource(paths))
+        token = start_loading(loader)
+        try:
+            assert current_loader() is loader
+            run = asyncio.create_task(loader.run())
+            assert await _drain(loader) == list(enumerate(paths))
+            assert await loader.get() is None  # The end is seen by every consumer
+            await run
+        finally:
+            stop_loading(token)
+    assert current_loader() is None
+
+    assert [loader.take(p).text() for p in paths[:5]] == [p.read_text(encoding="utf-8") for p in paths[:5]]
+    assert loader.take(paths[0]) is None  # Taken already
+    assert loader.take(paths[5]) is None and loader.take(paths[6]) is None
+    with pytest.raises(FileNotFoundError):
+        loader.take(paths[7]).text()
+    counters = METRICS.snapshot()["counters"]
+    assert counters["loader_batches"] == 2
+    assert counters["loader_files_deferred"] == 2
+
+
+@pytest.mark.asyncio
+async def test_read_ahead_is_bounded(tmp_path):
+    paths = _write(tmp_path, 10)
+    with patch("mcp_server.tools.file_loader.LOADER_BATCH_FILES", 1), \
+            patch("mcp_server.tools.file_loader.LOADER_READ_AHEAD_FILES", 3):
+        loader = BulkLoader(_ListSource(paths))
+        run = asyncio.create_task(loader.run())
+        try:
+            await asyncio.sleep(0.2)
+            assert METRICS.snapshot()["counters"]["loader_batches"] == 4  # 3 queued, 1 waiting
+            await loader.get()
+            await asyncio.sleep(0.2)
+            assert METRICS.snapshot()["counters"]["loader_batches"] == 5
+        finally:
+            run.cancel()
+            await asyncio.gather(run, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_project_files_are_checked_from_the_loader(tmp_path):
+    paths = _write(tmp_path, 3)
+    (tmp_path / "latin1.md").write_bytes(b"caf\xe9")
+    paths.append(tmp_path / "latin1.md")
+
+    with patch("mcp_server.tools.link_checker._check_link_status", return_value=("OK", None)), \
+            patch("aiofiles.open", side_effect=AssertionError("read through aiofiles")):
+        outcomes = await run_file_pipeline(
+            lambda cancelled: paths, _check_single_file, workers=MAX_CONCURRENT_FILES, preload=True)
+    results = [result for _, result in outcomes]
+
+    assert [r["valid"] for r in results[:3]] == [[f"https://example.com/{i}"] for i in range(3)]
+    assert results[3] == f"Error during link check for {paths[3]}: UnicodeDecodeError"
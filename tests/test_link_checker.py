@@ -2,6 +2,7 @@
 
 # from unittest.mock import MagicMock, AsyncMock # No longer needed for these tests
 import asyncio
+import socket
 
 # import re # Removed unused import
 from unittest.mock import patch
@@ -9,6 +10,17 @@ from unittest.mock import patch
 import aiohttp
 import pytest  # Re-enabled for asyncio decorator
 from aioresponses import aioresponses
+from yarl import URL
+
+from mcp_server.tools.adaptive_timeouts import MIN_SAMPLES
+from mcp_server.tools.circuit_breaker import (
+    CIRCUIT_BREAKERS,
+    CLOSED,
+    COOLDOWN_SECONDS,
+    FAILURE_THRESHOLD,
+    OPEN,
+)
+from mcp_server.tools.deadline import start_deadline, stop_deadline
 
 # Updated import path - Re-enable when tests are uncommented
 from mcp_server.tools.link_checker import (
@@ -16,6 +28,9 @@ from mcp_server.tools.link_checker import (
     _extract_links,
     check_links_in_content,
 )
+from mcp_server.tools.metrics import METRICS
+from mcp_server.tools.retry import RETRY_POLICY
+from mcp_server.tools.status_cache import STATUS_CACHE
 
 # --- Extraction Tests (Keep commented for now, focus on checking tests) ---
 
@@ -258,3 +273,384 @@ async def test_check_links_in_content_unexpected_result_type(mock_check_status,
         "errors": [{"url": "http://weird.com",
                    "reason": "Unexpected: str"}]
     }
+
+
+# --- Tests for the shared status cache and metrics ---
+
+
+@pytest.mark.asyncio
+@patch('mcp_server.tools.link_checker._check_link_status')
+async def test_check_links_in_content_uses_status_cache(mock_check_status):
+    """Test a second check of the same content is served from the cache."""
+    mock_check_status.side_effect = [("OK", None), ("BROKEN", "404 Not Found")]
+    content = "[a](http://cached-ok.com) [b](http://cached-broken.com)"
+
+    first = await check_links_in_content(content)
+    second = await check_links_in_content(content)
+
+    assert mock_check_status.call_count == 2
+    assert first == second
+    counters = METRICS.snapshot()["counters"]
+    assert counters["cache_misses"] == 2
+    assert counters["cache_hits"] == 2
+    assert counters["files_parsed"] == 2
+
+
+@pytest.mark.asyncio
+@patch('mcp_server.tools.link_checker._check_link_status')
+async def test_check_links_in_content_does_not_cache_task_exceptions(mock_check_status):
+    """Test task exceptions are reported but not cached, so the URL is retried next call."""
+    mock_check_status.side_effect = [ValueError("boom"), ("OK", None)]
+    content = "http://flaky.com"
+
+    first = await check_links_in_content(content)
+    second = await check_links_in_content(content)
+
+    assert first["errors"] == [{"url": "http://flaky.com", "reason": "Task Exception: ValueError"}]
+    assert second["valid"] == ["http://flaky.com"]
+
+
+@pytest.mark.asyncio
+async def test_check_link_status_records_metrics():
+    """Test per-host latency, redirects and timeouts are recorded."""
+    async with aiohttp.ClientSession() as session:
+        with aioresponses() as m:
+            m.head("http://metrics-start.com", status=301,
+                   headers={"Location": "http://metrics-end.com"})
+            m.head("http://metrics-end.com", status=200)
+            m.head("http://metrics-slow.com", exception=asyncio.TimeoutError())
+            await _check_link_status(session, "http://metrics-start.com")
+            await _check_link_status(session, "http://metrics-slow.com")
+
+    snapshot = METRICS.snapshot()
+    assert snapshot["counters"]["urls_checked"] == 2
+    assert snapshot["counters"]["redirects_followed"] == 1
+    assert snapshot["counters"]["timeouts"] == 1
+    assert set(snapshot["host_request_seconds"]) == {"metrics-start.com", "metrics-end.com"}
+
+
+@pytest.mark.asyncio
+@patch('mcp_server.tools.link_checker._check_link_status')
+async def test_check_links_in_content_skips_unresolvable_hosts(mock_check_status):
+    """Test URLs on hosts that do not resolve fail without a request being made."""
+    mock_check_status.return_value = ("OK", None)
+    content = "http://ok.example/a http://nope.invalid/a http://nope.invalid/b"
+
+    async def lookup(host):
+        if host == "nope.invalid":
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET, "127.0.0.1")]
+
+    with patch("mcp_server.tools.resolver._system_getaddrinfo", side_effect=lookup):
+        result = await check_links_in_content(content)
+
+    assert [c.args[1] for c in mock_check_status.call_args_list] == ["http://ok.example/a"]
+    assert result["valid"] == ["http://ok.example/a"]
+    assert result["errors"] == [
+        {"url": "http://nope.invalid/a", "reason": "DNS: host not found"},
+        {"url": "http://nope.invalid/b", "reason": "DNS: host not found"},
+    ]
+    assert METRICS.snapshot()["counters"]["dns_short_circuited"] == 2
+
+
+@pytest.mark.asyncio
+async def test_check_link_status_circuit_opens_for_hanging_host():
+    """Test repeated timeouts open the host's breaker so later URLs fail without a request."""
+    urls = [f"http://hangs.com/{i}" for i in range(FAILURE_THRESHOLD + 2)]
+    with aioresponses() as m:
+        for url in urls[:FAILURE_THRESHOLD]:
+            m.head(url, exception=asyncio.TimeoutError())
+        async with aiohttp.ClientSession() as session:
+            results = [await _check_link_status(session, url) for url in urls]
+
+    assert results[:FAILURE_THRESHOLD] == [("ERROR", "Timeout")] * FAILURE_THRESHOLD
+    for status, reason in results[FAILURE_THRESHOLD:]:
+        assert status == "ERROR"
+        assert reason.startswith("Circuit open")
+    assert METRICS.snapshot()["counters"]["circuit_rejections"] == 2
+    assert METRICS.snapshot()["gauges"]["circuits_open"] == 1
+
+
+@pytest.mark.asyncio
+async def test_check_link_status_learns_host_timeouts():
+    """Test successful requests feed the host's adaptive timeout budget."""
+    with aioresponses() as m:
+        for i in range(MIN_SAMPLES):
+            m.head(f"http://fast.com/{i}", status=200)
+        async with aiohttp.ClientSession() as session:
+            for i in range(MIN_SAMPLES):
+                assert await _check_link_status(session, f"http://fast.com/{i}") == ("OK", None)
+
+    budget = METRICS.snapshot()["host_timeout_seconds"]["fast.com"]
+    assert budget["learned"] is True
+    assert budget["first_byte"] < 10
+
+
+@pytest.mark.asyncio
+async def test_check_link_status_retries_a_slow_host_with_a_longer_budget(monkeypatch):
+    """Test a timeout on a host that has answered before gives the retry a longer budget."""
+    monkeypatch.setattr(RETRY_POLICY, "max_attempts", 2)
+    monkeypatch.setattr(RETRY_POLICY, "base_delay", 0.0)
+    url = "http://slow.com/page"
+    with aioresponses() as m:
+        m.head("http://slow.com/", status=200)
+        m.head(url, exception=asyncio.TimeoutError())
+        m.head(url, status=200)
+        async with aiohttp.ClientSession() as session:
+            assert await _check_link_status(session, "http://slow.com/") == ("OK", None)
+            assert await _check_link_status(session, url) == ("OK", None)
+        first, retry = m.requests[("HEAD", URL(url))]
+
+    assert retry.kwargs["timeout"].total > first.kwargs["timeout"].total
+    assert METRICS.snapshot()["host_timeout_seconds"]["slow.com"]["total"] == retry.kwargs["timeout"].total
+
+
+# --- Tests for retries ---
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(RETRY_POLICY, "max_attempts", 3)
+    monkeypatch.setattr(RETRY_POLICY, "base_delay", 0.0)
+
+
+@pytest.mark.asyncio
+async def test_check_link_status_retries_transient_failures(fast_retries):
+    """Test a timeout followed by a 503 and then a 200 ends up OK."""
+    url = "http://flaky.com"
+    with aioresponses() as m:
+        m.head(url, exception=asyncio.TimeoutError())
+        m.head(url, status=503)
+        m.head(url, status=200)
+        async with aiohttp.ClientSession() as session:
+            assert await _check_link_status(session, url) == ("OK", None)
+    assert METRICS.snapshot()["counters"]["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retries_count_once_for_the_host_breaker(fast_retries):
+    """Test a URL failing every attempt is one breaker failure, so a few URLs keep their own errors."""
+    urls = [f"http://refuses.com/{i}" for i in range(FAILURE_THRESHOLD - 1)]
+    with aioresponses() as m:
+        for url in urls:
+            for _ in range(RETRY_POLICY.max_attempts):
+                m.head(url, exception=aiohttp.ServerDisconnectedError())
+        async with aiohttp.ClientSession() as session:
+            results = [await _check_link_status(session, url) for url in urls]
+
+    assert results == [("ERROR", "ServerDisconnectedError")] * len(urls)
+    assert METRICS.snapshot()["counters"]["retries"] == 2 * len(urls)
+    assert CIRCUIT_BREAKERS.state("refuses.com") == CLOSED
+    assert "circuit_rejections" not in METRICS.snapshot()["counters"]
+
+
+@pytest.mark.asyncio
+async def test_retry_refused_by_the_breaker_keeps_the_last_error(fast_retries):
+    """Test a retry the breaker refuses ends the retries with the attempt's own error."""
+    url = "http://refuses.com/last"
+    for _ in range(FAILURE_THRESHOLD - 1):
+        CIRCUIT_BREAKERS.record_failure("refuses.com")
+    with aioresponses() as m:
+        m.head(url, exception=aiohttp.ServerDisconnectedError())
+        async with aiohttp.ClientSession() as session:
+            # Another URL on the host fails meanwhile and opens the breaker
+            with patch.object(CIRCUIT_BREAKERS, "before_request",
+                              side_effect=[None, "Circuit open: host unreachable"]):
+                assert await _check_link_status(session, url) == ("ERROR", "ServerDisconnectedError")
+    assert len(m.requests[("HEAD", URL(url))]) == 1
+    assert CIRCUIT_BREAKERS.state("refuses.com") == OPEN
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_is_a_single_request(monkeypatch):
+    """Test a failing half-open probe is not retried, so no other URL gets in as a probe."""
+    monkeypatch.setattr(RETRY_POLICY, "max_attempts", 3)
+    monkeypatch.setattr(RETRY_POLICY, "base_delay", 0.05)
+    for _ in range(FAILURE_THRESHOLD):
+        CIRCUIT_BREAKERS.record_failure("dead.com")
+    CIRCUIT_BREAKERS._circuits["dead.com"].opened_at -= COOLDOWN_SECONDS + 1  # Cooldown over
+
+    async def check_later(session, url):
+        await asyncio.sleep(0.01)  # While the probe would be backing off before a retry
+        return await _check_link_status(session, url)
+
+    with aioresponses() as m:
+        m.head("http://dead.com/a", exception=aiohttp.ServerDisconnectedError(), repeat=True)
+        m.head("http://dead.com/b", exception=aiohttp.ServerDisconnectedError(), repeat=True)
+        async with aiohttp.ClientSession() as session:
+            probe, other = await asyncio.gather(
+                _check_link_status(session, "http://dead.com/a"),
+                check_later(session, "http://dead.com/b"))
+        requests = sum(len(calls) for calls in m.requests.values())
+
+    assert requests == 1
+    assert probe == ("ERROR", "ServerDisconnectedError")
+    assert other[0] == "ERROR" and other[1].startswith("Circuit open")
+    assert CIRCUIT_BREAKERS.state("dead.com") == OPEN
+
+
+@pytest.mark.asyncio
+async def test_check_link_status_revalidates_with_stored_validators():
+    """Test a URL seen before is requested conditionally and a 304 counts as OK."""
+    url = "http://etag.com/page"
+    with aioresponses() as m:
+        m.head(url, status=200, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        m.head(url, status=304)
+        async with aiohttp.ClientSession() as session:
+            assert await _check_link_status(session, url) == ("OK", None)
+            assert await _check_link_status(session, url) == ("OK", None)
+        first, second = m.requests[("HEAD", URL(url))]
+    assert "If-None-Match" not in first.kwargs["headers"]
+    assert second.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert second.kwargs["headers"]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert METRICS.snapshot()["counters"]["revalidated_not_modified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_check_link_status_forgets_validators_of_broken_links():
+    """Test a 404 drops the stored validators so later checks are unconditional."""
+    url = "http://gone.com/page"
+    STATUS_CACHE.remember_validators(url, '"v1"', None)
+    with aioresponses() as m:
+        m.head(url, status=404)
+        async with aiohttp.ClientSession() as session:
+            assert (await _check_link_status(session, url))[0] == "BROKEN"
+    assert STATUS_CACHE.conditional_headers(url) == {}
+
+
+@pytest.mark.asyncio
+async def test_check_link_status_does_not_retry_permanent_failures(fast_retries):
+    """Test a 404 is final and not retried."""
+    url = "http://gone.com"
+    with aioresponses() as m:
+        m.head(url, status=404)
+        async with aiohttp.ClientSession() as session:
+            assert await _check_link_status(session, url) == ("BROKEN", "404 Not Found")
+    assert "retries" not in METRICS.snapshot()["counters"]
+
+
+@pytest.mark.asyncio
+async def test_check_link_status_skips_retry_past_deadline(fast_retries):
+    """Test no retry is started when it could not finish before the call deadline."""
+    url = "http://slow.com"
+    _, token = start_deadline(1.0)  # Less than the default 10s request budget
+    try:
+        with aioresponses() as m:
+            m.head(url, exception=asyncio.TimeoutError())
+            m.head(url, status=200)
+            async with aiohttp.ClientSession() as session:
+                assert await _check_link_status(session, url) == ("ERROR", "Timeout")
+    finally:
+        stop_deadline(token)
+    assert METRICS.snapshot()["counters"]["retries_skipped_deadline"] == 1
+
+
+@pytest.mark.asyncio
+@patch('mcp_server.tools.link_checker._check_link_status')
+async def test_check_links_in_content_stops_at_deadline(mock_check_status):
+    """Test checks still running at the deadline are cancelled, reported and not cached."""
+    async def check(session, url):
+        if "slow" in url:
+            await asyncio.sleep(10)
+        return ("OK", None)
+
+    mock_check_status.side_effect = check
+    deadline, token = start_deadline(0.05)
+    try:
+        result = await check_links_in_content("http://fast.com http://slow.com")
+    finally:
+        stop_deadline(token)
+
+    assert result["valid"] == ["http://fast.com"]
+    assert result["errors"] == [{"url": "http://slow.com", "reason": "not checked (budget)"}]
+    assert deadline.skipped_urls == 1
+    # Completed checks are cached, unfinished ones are not
+    assert STATUS_CACHE.get("http://fast.com") == ("OK", None)
+    assert STATUS_CACHE.get("http://slow.com") is None
+
+
+@pytest.mark.asyncio
+@patch('mcp_server.tools.link_checker._check_link_status')
+async def test_spellings_of_one_url_are_checked_and_cached_once(mock_check_status):
+    """Test case, default port and fragment variants share one check but are all reported."""
+    mock_check_status.return_value = ("OK", None)
+    markdown = ("[a](https://Example.com/a#intro) [b](https://example.com/a#setup) "
+                "[c](https://example.com:443/a)")
+    result = await check_links_in_content(markdown)
+
+    assert [c.args[1] for c in mock_check_status.call_args_list] == ["https://example.com/a"]
+    assert result["total"] == 3
+    assert sorted(result["valid"]) == sorted([
+        "https://Example.com/a#intro", "https://example.com/a#setup", "https://example.com:443/a"])
+    assert STATUS_CACHE.get("https://example.com/a") == ("OK", None)
+    assert METRICS.snapshot()["counters"]["canonical_duplicates"] == 2
+
+
+# --- Tests for singleflight coalescing ---
+
+
+@pytest.mark.asyncio
+@patch('mcp_server.tools.link_checker._check_link_status')
+async def test_concurrent_calls_share_one_request_per_url(mock_check_status):
+    """Test two calls checking the same URL at once make a single request."""
+    release = asyncio.Event()
+
+    async def check(session, url):
+        await release.wait()
+        return ("OK", None)
+
+    mock_check_status.side_effect = check
+    first = asyncio.create_task(check_links_in_content("http://shared.com/page"))
+    second = asyncio.create_task(check_links_in_content("http://shared.com/page"))
+    await asyncio.sleep(0.01)
+    release.set()
+
+    results = await asyncio.gather(first, second)
+
+    assert mock_check_status.call_count == 1
+    assert all(r["valid"] == ["http://shared.com/page"] for r in results)
+    assert METRICS.snapshot()["counters"]["singleflight_shared"] == 1
+
+
+@pytest.mark.asyncio
+@patch('mcp_server.tools.link_checker._check_link_status')
+async def test_normalized_duplicates_share_one_request(mock_check_status):
+    """Test URLs differing only in host case or fragment are requested once."""
+    async def check(session, url):
+        await asyncio.sleep(0.01)
+        return ("OK", None)
+
+    mock_check_status.side_effect = check
+
+    result = await check_links_in_content(
+        "http://Example.com/doc#intro http://example.com/doc")
+
+    assert mock_check_status.call_count == 1
+    assert sorted(result["valid"]) == ["http://Example.com/doc#intro", "http://example.com/doc"]
+
+
+@pytest.mark.asyncio
+@patch('mcp_server.tools.link_checker._check_link_status')
+async def test_waiter_takes_over_when_leader_is_cancelled(mock_check_status):
+    """Test cancelling the call that owns a shared check lets the other call finish it."""
+    calls = []
+
+    async def check(session, url):
+        calls.append(url)
+        if len(calls) == 1:
+            await asyncio.sleep(30)  # The leader hangs until cancelled
+        return ("OK", None)
+
+    mock_check_status.side_effect = check
+    leader = asyncio.create_task(check_links_in_content("http://takeover.com"))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(check_links_in_content("http://takeover.com"))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    result = await follower
+
+    assert result["valid"] == ["http://takeover.com"]
+    assert len(calls) == 2
+    with pytest.raises(asyncio.CancelledError):
+        await leader
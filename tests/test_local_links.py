@@ -0,0 +1,98 @@
+# tests/test_local_links.py
+
+import pytest
+from markdown_it import MarkdownIt
+
+from mcp_server.tools.link_checker import check_links_in_content
+from mcp_server.tools.local_links import (
+    collect_anchors,
+    is_local_link,
+    resolve_local_links,
+    slugify,
+    start_local_index,
+    stop_local_index,
+)
+from mcp_server.tools.metrics import METRICS
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Install", "install"),
+    ("Getting Started", "getting-started"),
+    ("API: v2 (beta)!", "api-v2-beta"),
+    ("snake_case & more", "snake_case--more"),
+    ("🚀 Launch", "-launch"),
+])
+def test_slugify_matches_github(text, expected):
+    assert slugify(text) == expected
+
+
+def test_collect_anchors_numbers_duplicates_and_reads_html_ids():
+    tokens = MarkdownIt().parse(
+        "# Usage\n\n## Usage\n\n## `code` *Title*\n\n<a name=\"legacy\"></a>\n\nText <span id='inline'>x</span>\n")
+    assert collect_anchors(tokens) == {"usage", "usage-1", "code-title", "legacy", "inline"}
+
+
+def test_collect_anchors_ignores_prefixed_attributes():
+    tokens = MarkdownIt().parse(
+        "<div data-id=\"row\" aria-name='label'\nid=\"real\"></div>\n\n"
+        "Text <span data-name=\"x\">y</span> <a\tNAME=\"tab\">z</a>\n")
+    assert collect_anchors(tokens) == {"real", "tab"}
+
+
+@pytest.mark.parametrize("href, expected", [
+    ("./guide.md", True),
+    ("../README.md#install", True),
+    ("#usage", True),
+    ("/docs/a.md", True),
+    ("https://x.com", False),
+    ("mailto:me@x.com", False),
+    ("//cdn.x.com/a.js", False),
+])
+def test_is_local_link(href, expected):
+    assert is_local_link(href) == expected
+
+
+@pytest.mark.asyncio
+async def test_relative_links_are_resolved_against_the_scan_index(tmp_path):
+    """Test files, headings and anchors are checked offline once all files are indexed."""
+    (tmp_path / "docs").mkdir()
+    readme = tmp_path / "README.md"
+    readme.write_text(
+        "# Project\n\n## Install\n\n"
+        "[guide](docs/guide.md) [setup](docs/guide.md#setup) [bad](docs/guide.md#nope) "
+        "[gone](docs/missing.md) [self](#install) [self-bad](#usage) [dir](docs/) "
+        "[notes](docs/notes.md#intro)\n",
+        encoding="utf-8")
+    guide = tmp_path / "docs" / "guide.md"
+    guide.write_text("# Guide\n\n## Setup\n\n[back](../README.md#project)\n", encoding="utf-8")
+    # Not part of the scan: looked up and parsed on demand
+    (tmp_path / "docs" / "notes.md").write_text("# Intro\n", encoding="utf-8")
+
+    index, token = start_local_index(tmp_path)
+    try:
+        readme_results = await check_links_in_content(readme.read_text(encoding="utf-8"), source=readme)
+        await check_links_in_content(guide.read_text(encoding="utf-8"), source=guide)
+        assert readme_results["total"] == 0  # Resolved only after the whole scan is parsed
+        resolved = await resolve_local_links()
+    finally:
+        stop_local_index(token)
+
+    readme_links = {href: (status, reason) for href, status, reason in resolved[readme]}
+    assert len(readme_links) == 8
+    assert sorted(h for h, (status, _) in readme_links.items() if status == "OK") == sorted([
+        "docs/guide.md", "docs/guide.md#setup", "#install", "docs/", "docs/notes.md#intro"])
+    assert sorted(reason for status, reason in readme_links.values() if status == "BROKEN") == [
+        "Anchor '#nope' not found in docs/guide.md",
+        "Anchor '#usage' not found in README.md",
+        "File not found: docs/missing.md",
+    ]
+    assert resolved[guide] == [("../README.md#project", "OK", None)]
+    counters = METRICS.snapshot()["counters"]
+    assert counters["local_links_checked"] == 9
+    assert counters["local_links_broken"] == 3
+
+
+@pytest.mark.asyncio
+async def test_relative_links_are_ignored_without_a_scan_index(tmp_path):
+    results = await check_links_in_content("[gone](missing.md)", source=tmp_path / "a.md")
+    assert results == {"total": 0, "valid": [], "broken": [], "errors": []}
@@ -0,0 +1,98 @@
+# tests/test_metrics.py
+
+import json
+import math
+
+from mcp_server.tools.metrics import Histogram, LinkCheckerMetrics
+
+
+def test_histogram_observe_buckets_and_quantiles():
+    """Test values land in the first bucket whose bound is >= value, overflow in +Inf."""
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert math.isclose(histogram.sum, 5.65)
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert histogram.quantile(1.0) == math.inf
+
+
+def test_histogram_overflow_quantiles_are_valid_json():
+    """Test a median in the overflow bucket is reported as "+Inf", which strict JSON accepts."""
+    histogram = Histogram((0.1, 1.0))
+    for value in (5.0, 6.0, 0.05):
+        histogram.observe(value)
+
+    data = histogram.to_dict()
+    assert data["p50_le"] == "+Inf"
+    assert data["p95_le"] == "+Inf"
+    json.dumps(data, allow_nan=False)
+
+
+def test_histogram_empty_quantile_is_none():
+    """Test an empty histogram has no quantile estimate."""
+    assert Histogram().quantile(0.95) is None
+    assert Histogram().to_dict()["mean"] is None
+
+
+def test_metrics_snapshot_includes_counters_gauges_and_hosts():
+    """Test snapshot exposes counters, lazily read gauges and per-host histograms."""
+    metrics = LinkCheckerMetrics()
+    metrics.inc("cache_hits")
+    metrics.inc("cache_hits", 2)
+    metrics.observe_host_latency("example.com", 0.02)
+    metrics.register_gauge("cache_entries", lambda: 7)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["counters"] == {"cache_hits": 3}
+    assert snapshot["gauges"] == {"cache_entries": 7}
+    assert snapshot["host_request_seconds"]["example.com"]["count"] == 1
+
+
+def test_metrics_reset_keeps_gauges():
+    """Test reset clears accumulated values but keeps registered gauges."""
+    metrics = LinkCheckerMetrics()
+    metrics.inc("timeouts")
+    metrics.observe("parse_seconds", 0.01)
+    metrics.register_gauge("cache_entries", lambda: 1)
+
+    metrics.reset()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {}
+    assert snapshot["histograms"] == {}
+    assert snapshot["gauges"] == {"cache_entries": 1}
+
+
+def test_render_prometheus_format():
+    """Test Prometheus output has typed counters and cumulative, labelled host buckets."""
+    metrics = LinkCheckerMetrics()
+    metrics.inc("urls_checked", 3)
+    metrics.observe_host_latency('we"ird.host', 0.004)
+    metrics.observe_host_latency('we"ird.host', 0.3)
+
+    text = metrics.render_prometheus()
+
+    assert "# TYPE mcp_link_checker_urls_checked_total counter" in text
+    assert "mcp_link_checker_urls_checked_total 3" in text
+    assert "# TYPE mcp_link_checker_host_request_seconds histogram" in text
+    assert 'mcp_link_checker_host_request_seconds_bucket{host="we\\"ird.host",le="0.005"} 1' in text
+    assert 'mcp_link_checker_host_request_seconds_bucket{host="we\\"ird.host",le="0.5"} 2' in text
+    assert 'mcp_link_checker_host_request_seconds_count{host="we\\"ird.host"} 2' in text
+
+
+def test_host_gauges_in_snapshot_and_prometheus():
+    """Test per-host gauges appear in snapshots and as labelled Prometheus gauges."""
+    metrics = LinkCheckerMetrics()
+    metrics.register_host_gauges(
+        "host_timeout_seconds", lambda: {"a.com": {"connect": 1.5, "learned": True}})
+
+    assert metrics.snapshot()["host_timeout_seconds"] == {"a.com": {"connect": 1.5, "learned": True}}
+    text = metrics.render_prometheus()
+    assert '# TYPE mcp_link_checker_host_timeout_seconds gauge' in text
+    assert 'mcp_link_checker_host_timeout_seconds{host="a.com",key="connect"} 1.5' in text
+    assert 'key="learned"' not in text
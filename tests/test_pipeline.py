@@ -0,0 +1,148 @@
+# tests/test_pipeline.py
+
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from mcp_server.tools.deadline import NOT_CHECKED_REASON, start_deadline, stop_deadline
+from mcp_server.tools.pipeline import SKIPPED_FILES_LISTED, run_file_pipeline
+from mcp_server.tools.results import FileResults, ScanResults
+
+
+def _result(path: Path) -> dict:
+    return {"total": 1, "valid": [f"https://example.com/{path.stem}"], "broken": [], "errors": []}
+
+
+@pytest.mark.asyncio
+async def test_checks_start_while_discovery_is_running():
+    """Test the first file is checked before discovery yields the last one."""
+    checked = threading.Event()
+    seen_before_end = []
+
+    def discover(cancelled):
+        yield Path("/docs/first.md")
+        seen_before_end.append(checked.wait(timeout=5))
+        yield Path("/docs/second.md")
+
+    async def check(path):
+        checked.set()
+        return _result(path)
+
+    outcomes = await run_file_pipeline(discover, check, workers=2)
+
+    assert seen_before_end == [True]
+    assert [path.name for path, _ in outcomes] == ["first.md", "second.md"]
+
+
+@pytest.mark.asyncio
+async def test_results_keep_discovery_order_and_are_compacted():
+    paths = [Path(f"/docs/{i}.md") for i in range(20)]
+
+    async def check(path):
+        await asyncio.sleep(0.001 * (20 - int(path.stem)))  # Later files finish first
+        return _result(path) if path.stem != "3" else f"Error during link check for {path}"
+
+    scan = ScanResults()
+    outcomes = await run_file_pipeline(lambda cancelled: paths, check, workers=8, scan=scan)
+
+    assert [path for path, _ in outcomes] == paths
+    assert outcomes[3][1] == "Error during link check for /docs/3.md"
+    assert all(isinstance(result, FileResults) for i, (_, result) in enumerate(outcomes) if i != 3)
+    assert len(scan) == 19
+
+
+@pytest.mark.asyncio
+async def test_discovery_waits_for_bounded_queue():
+    """Test discovery stays at most DISCOVERY_QUEUE_FILES paths ahead of the checkers."""
+    produced = []
+    release = asyncio.Event()
+
+    def discover(cancelled):
+        for i in range(10):
+            produced.append(i)
+            yield Path(f"/docs/{i}.md")
+
+    async def check(path):
+        await release.wait()
+        return _result(path)
+
+    with patch("mcp_server.tools.pipeline.DISCOVERY_QUEUE_FILES", 3):
+        run = asyncio.create_task(run_file_pipeline(discover, check, workers=1))
+        await asyncio.sleep(0.3)
+        # One file taken by the worker, three waiting, and one yielded but not yet queued
+        assert len(produced) == 5
+        release.set()
+        outcomes = await run
+    assert len(outcomes) == 10
+
+
+@pytest.mark.asyncio
+async def test_discovery_error_is_raised():
+    def discover(cancelled):
+        yield Path("/docs/a.md")
+        raise PermissionError("denied")
+
+    async def check(path):
+        return _result(path)
+
+    with pytest.raises(PermissionError, match="denied"):
+        await run_file_pipeline(discover, check, workers=2)
+
+
+@pytest.mark.asyncio
+async def test_check_error_cancels_discovery():
+    """Test an unexpected checker error stops the discovery walk and is raised."""
+    walk_stopped = threading.Event()
+
+    def discover(cancelled):
+        try:
+            i = 0
+            while not cancelled.is_set():
+                yield Path(f"/docs/{i}.md")
+                i += 1
+        finally:
+            walk_stopped.set()
+
+    async def check(path):
+        raise RuntimeError("boom")
+
+    with patch("mcp_server.tools.pipeline.DISCOVERY_QUEUE_FILES", 4):
+        with pytest.raises(RuntimeError, match="boom"):
+            await run_file_pipeline(discover, check, workers=2)
+    assert await asyncio.to_thread(walk_stopped.wait, 5)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("preload", [False, True])
+async def test_deadline_stops_discovery_and_caps_the_skipped_list(preload):
+    """Test a scan past its deadline stops the walk and lists only a few unchecked files."""
+    walk_stopped = threading.Event()
+
+    def discover(cancelled):
+        try:
+            i = 0
+            while not cancelled.is_set():  # A tree far too big for the budget
+                yield Path(f"/docs/{i}.md")
+                i += 1
+        finally:
+            walk_stopped.set()
+
+    async def check(path):
+        await asyncio.sleep(0.02)
+        return _result(path)
+
+    deadline, token = start_deadline(0.1)
+    try:
+        outcomes = await asyncio.wait_for(run_file_pipeline(discover, check, workers=2, preload=preload), 5)
+    finally:
+        stop_deadline(token)
+
+    assert walk_stopped.is_set()
+    skipped = [path for path, result in outcomes if result == NOT_CHECKED_REASON]
+    assert len(skipped) == SKIPPED_FILES_LISTED
+    assert deadline.skipped_files > SKIPPED_FILES_LISTED
+    assert deadline.discovery_stopped
+    assert "File discovery stopped at the deadline" in deadline.format_note()
@@ -0,0 +1,89 @@
+# tests/test_prewarm.py
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from mcp_server import server
+from mcp_server.tools import prewarm
+from mcp_server.tools.metrics import METRICS
+from mcp_server.tools.prewarm import prewarm_paused, start_prewarm
+from mcp_server.tools.status_cache import STATUS_CACHE
+
+
+def _write_docs(root, files: int, links: int):
+    for i in range(files):
+        body = "\n".join(f"- [ref](https://example.com/{i}/{j})" for j in range(links))
+        (root / f"doc_{i}.md").write_text(f"# Doc {i}\n\n{body}\n", encoding="utf-8")
+
+
+def _discover(root):
+    return lambda cancelled: sorted(root.glob("*.md"))
+
+
+@pytest.mark.asyncio
+async def test_prewarm_checks_project_urls_into_the_cache(tmp_path):
+    _write_docs(tmp_path, 3, 4)
+    STATUS_CACHE.set("https://example.com/0/0", "OK", None)  # Already fresh: not checked again
+
+    with patch("mcp_server.tools.link_checker._check_link_status", return_value=("OK", None)) as check:
+        await start_prewarm(_discover(tmp_path))
+
+    assert check.call_count == 11
+    assert STATUS_CACHE.get("https://example.com/2/3") == ("OK", None)
+    counters = METRICS.snapshot()["counters"]
+    assert counters["prewarm_files"] == 3
+    assert counters["prewarm_urls"] == 11
+    assert prewarm._running is None
+
+
+@pytest.mark.asyncio
+async def test_prewarm_stops_at_max_urls(tmp_path):
+    _write_docs(tmp_path, 4, 10)
+    with patch("mcp_server.tools.prewarm.PREWARM_MAX_URLS", 15), \
+            patch("mcp_server.tools.link_checker._check_link_status", return_value=("OK", None)) as check:
+        await start_prewarm(_discover(tmp_path))
+    assert check.call_count == 15
+    assert METRICS.snapshot()["counters"]["prewarm_files"] == 2
+
+
+@pytest.mark.asyncio
+async def test_prewarm_pauses_while_a_tool_call_runs(tmp_path):
+    """Test no URL is checked in the background while a tool call is in progress."""
+    _write_docs(tmp_path, 2, 3)
+    with patch("mcp_server.tools.link_checker._check_link_status", return_value=("OK", None)) as check:
+        task = start_prewarm(_discover(tmp_path))
+        assert start_prewarm(_discover(tmp_path)) is None  # One pre-warm at a time
+        with prewarm_paused():
+            await asyncio.sleep(0.3)
+            assert check.call_count == 0
+            assert not task.done()
+        await task
+    assert check.call_count == 6
+
+
+@pytest.mark.asyncio
+async def test_initialized_starts_prewarm_and_warms_the_first_scan(tmp_path):
+    """Test the first project scan after `initialized` is served from the cache."""
+    _write_docs(tmp_path, 3, 2)
+    with patch.object(server, "PROJECT_ROOT", tmp_path), \
+            patch("mcp_server.server.PREWARM_ENABLED", True), \
+            patch("mcp_server.tools.link_checker._check_link_status", return_value=("OK", None)) as check:
+        await server.handle_initialized(None)
+        await server._prewarm_task
+        assert check.call_count == 6
+
+        result = await server.handle_call_tool("check_markdown_links_project", {})
+
+    assert check.call_count == 6
+    assert "Valid Links: 6" in result[0].text
+    assert METRICS.snapshot()["counters"]["cache_hits"] == 6
+
+
+@pytest.mark.asyncio
+async def test_initialized_without_prewarm_does_nothing():
+    with patch("mcp_server.server.PREWARM_ENABLED", False), \
+            patch("mcp_server.server.start_prewarm") as start:
+        await server.handle_initialized(None)
+    start.assert_not_called()
@@ -0,0 +1,61 @@
+# tests/test_profiling.py
+
+from mcp_server.tools.profiling import (
+    StageTimer,
+    capture_profile,
+    stage,
+    start_timing,
+    stop_timing,
+)
+
+
+def test_stage_is_noop_without_active_timer():
+    """Test stage() records nothing when timing is not enabled for the call."""
+    timer = StageTimer()
+    with stage("parse"):
+        pass
+    assert timer.totals == {}
+
+
+def test_stage_accumulates_into_active_timer():
+    """Test stage() durations and counts accumulate into the bound timer."""
+    timer, token = start_timing()
+    try:
+        with stage("parse"):
+            pass
+        with stage("parse"):
+            pass
+        with stage("custom"):
+            pass
+    finally:
+        stop_timing(timer, token)
+
+    assert timer.counts == {"parse": 2, "custom": 1}
+    assert timer.ordered_stages() == ["parse", "custom"]
+    assert timer.wall_seconds >= timer.totals["parse"]
+    with stage("parse"):  # Timer is unbound after stop_timing
+        pass
+    assert timer.counts["parse"] == 2
+
+
+def test_stage_timer_to_dict_and_report():
+    """Test the breakdown lists known stages in pipeline order."""
+    timer = StageTimer()
+    timer.add("network", 0.5)
+    timer.add("discovery", 0.1)
+    timer.finish()
+
+    assert list(timer.to_dict()["stages"]) == ["discovery", "network"]
+    report = timer.format_report()
+    assert report.index("discovery") < report.index("network")
+
+
+def test_capture_profile_skips_nested_capture(tmp_path, monkeypatch):
+    """Test a second concurrent capture is skipped instead of failing."""
+    monkeypatch.setattr("mcp_server.tools.profiling.PROFILE_DIR", tmp_path)
+    with capture_profile("outer") as outer:
+        with capture_profile("inner") as inner:
+            pass
+    assert inner["path"] is None
+    assert "another profile capture" in inner["note"]
+    assert outer["path"] is not None
@@ -0,0 +1,113 @@
+# tests/test_resolver.py
+
+import asyncio
+import socket
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mcp_server.tools.metrics import METRICS
+from mcp_server.tools.resolver import HostResolver, SharedCacheResolver
+
+
+def _not_found(host):
+    raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+
+@pytest.mark.asyncio
+async def test_prefetch_caches_not_found_hosts():
+    """Test an NXDOMAIN answer is cached, so the host is only queried once."""
+    resolver = HostResolver()
+    lookup = AsyncMock(side_effect=_not_found)
+    with patch("mcp_server.tools.resolver._system_getaddrinfo", lookup):
+        first = await resolver.prefetch(["nope.invalid", "nope.invalid"])
+        second = await resolver.prefetch(["nope.invalid"])
+
+    assert first == second == {"nope.invalid": "DNS: host not found"}
+    assert lookup.await_count == 1
+    assert resolver.failure_for("nope.invalid") == "DNS: host not found"
+    assert METRICS.snapshot()["counters"]["dns_not_found"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_does_not_cache_transient_failures():
+    """Test temporary resolver failures are retried and not reported as unresolvable."""
+    resolver = HostResolver()
+    lookup = AsyncMock(side_effect=socket.gaierror(socket.EAI_AGAIN, "Temporary failure"))
+    with patch("mcp_server.tools.resolver._system_getaddrinfo", lookup):
+        assert await resolver.prefetch(["flaky.example"]) == {}
+        assert await resolver.prefetch(["flaky.example"]) == {}
+
+    assert lookup.await_count == 2
+    assert len(resolver) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_query():
+    """Test lookups of the same host issued at once result in a single query."""
+    resolver = HostResolver()
+    release = asyncio.Event()
+
+    async def slow_lookup(host):
+        await release.wait()
+        return [(socket.AF_INET, "10.0.0.1")]
+
+    lookup = AsyncMock(side_effect=slow_lookup)
+    with patch("mcp_server.tools.resolver._system_getaddrinfo", lookup):
+        tasks = [asyncio.create_task(resolver.lookup("example.com")) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        entries = await asyncio.gather(*tasks)
+
+    assert lookup.await_count == 1
+    assert all(e.addresses == [(socket.AF_INET, "10.0.0.1")] for e in entries)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_skips_ip_literals():
+    """Test IP address hosts are never sent to the resolver."""
+    resolver = HostResolver()
+    lookup = AsyncMock()
+    with patch("mcp_server.tools.resolver._system_getaddrinfo", lookup):
+        assert await resolver.prefetch(["127.0.0.1", "[::1]", ""]) == {}
+    lookup.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_resolver_serves_aiohttp_from_cache():
+    """Test the aiohttp adapter returns cached addresses and raises for unknown hosts."""
+    resolver = HostResolver()
+    adapter = SharedCacheResolver(resolver)
+    lookup = AsyncMock(return_value=[(socket.AF_INET, "10.0.0.1"), (socket.AF_INET6, "::2")])
+    with patch("mcp_server.tools.resolver._system_getaddrinfo", lookup):
+        results = await adapter.resolve("example.com", 443, socket.AF_INET)
+        await adapter.resolve("example.com", 80, socket.AF_UNSPEC)
+
+    assert lookup.await_count == 1
+    assert [(r["host"], r["port"]) for r in results] == [("10.0.0.1", 443)]
+
+    with patch("mcp_server.tools.resolver._system_getaddrinfo", AsyncMock(side_effect=_not_found)):
+        with pytest.raises(OSError, match="host not found"):
+            await adapter.resolve("nope.invalid", 443)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lookup_does_not_cancel_other_waiters():
+    """Test cancelling the caller that owns a query leaves callers sharing it unaffected."""
+    resolver = HostResolver()
+    release = asyncio.Event()
+
+    async def slow_lookup(host):
+        await release.wait()
+        return [(socket.AF_INET, "10.0.0.1")]
+
+    with patch("mcp_server.tools.resolver._system_getaddrinfo", side_effect=slow_lookup):
+        owner = asyncio.create_task(resolver.lookup("example.com"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(resolver.lookup("example.com"))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        assert await waiter is None  # Treated like a transient failure
+        with pytest.raises(asyncio.CancelledError):
+            await owner
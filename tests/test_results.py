@@ -0,0 +1,52 @@
+# tests/test_results.py
+
+from mcp_server.tools.results import InternTable, ScanResults
+
+
+def _results(valid=(), broken=(), errors=()):
+    return {
+        "total": len(valid) + len(broken) + len(errors),
+        "valid": list(valid),
+        "broken": [{"url": u, "reason": r} for u, r in broken],
+        "errors": [{"url": u, "reason": r} for u, r in errors],
+    }
+
+
+def test_intern_table_returns_one_id_per_distinct_string():
+    table = InternTable()
+    first = table.intern("https://a.com")
+    assert table.intern("".join(["https://", "a.com"])) == first
+    assert table.intern("https://b.com") != first
+    assert len(table) == 2
+    assert table[first] == "https://a.com"
+
+
+def test_add_round_trips_and_shares_urls_across_files():
+    scan = ScanResults()
+    a = _results(valid=["https://a.com", "https://b.com"],
+                 broken=[("https://c.com", "HTTP Status 404")],
+                 errors=[("https://d.com", "Timeout")])
+    b = _results(valid=["https://a.com"], broken=[("https://c.com", "HTTP Status 404")])
+    file_a, file_b = scan.add(a), scan.add(b)
+
+    assert scan.to_dict(file_a) == a
+    assert scan.to_dict(file_b) == b
+    assert len(scan.urls) == 4  # a.com and c.com are stored once
+    assert len(scan.reasons) == 3  # "", "HTTP Status 404", "Timeout"
+    assert (len(file_a), file_a.count("OK"), file_a.count("BROKEN"), file_a.count("ERROR")) == (4, 2, 1, 1)
+
+
+def test_extend_appends_to_a_file_after_later_files_were_added():
+    scan = ScanResults()
+    file_a = scan.add(_results(valid=["https://a.com"]))
+    file_b = scan.add(_results(valid=["https://b.com"]))
+
+    scan.extend(file_a, [("guide.md", "OK", None), ("#nope", "BROKEN", "Anchor '#nope' not found")])
+    scan.extend(file_a, [("other.md", "OK", None)])
+    scan.extend(file_b, [])
+
+    assert scan.to_dict(file_a) == _results(valid=["https://a.com", "guide.md", "other.md"],
+                                            broken=[("#nope", "Anchor '#nope' not found")])
+    assert scan.to_dict(file_b) == _results(valid=["https://b.com"])
+    assert (len(file_a), file_a.count("BROKEN")) == (4, 1)
+    assert len(scan) == 5
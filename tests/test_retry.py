@@ -0,0 +1,34 @@
+# tests/test_retry.py
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+
+from mcp_server.tools.retry import RetryPolicy, is_transient_error
+
+
+def test_backoff_is_jittered_and_capped():
+    """Test delays stay within [0, min(max_delay, base * 2**attempt)]."""
+    policy = RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=2.0)
+    with patch("mcp_server.tools.retry.random.uniform", side_effect=lambda a, b: b) as uniform:
+        assert [policy.backoff(n) for n in range(4)] == [0.5, 1.0, 2.0, 2.0]
+    assert all(c.args[0] == 0 for c in uniform.call_args_list)
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv("MCP_SERVER_RETRY_ATTEMPTS", "5")
+    monkeypatch.setenv("MCP_SERVER_RETRY_BASE_DELAY", "0.1")
+    policy = RetryPolicy.from_env()
+    assert (policy.max_attempts, policy.base_delay, policy.max_delay) == (5, 0.1, 4.0)
+
+
+def test_transient_error_classes():
+    """Test only timeouts and connection-level errors are treated as transient."""
+    connection_key = MagicMock()
+    assert is_transient_error(asyncio.TimeoutError())
+    assert is_transient_error(aiohttp.ServerDisconnectedError())
+    assert is_transient_error(aiohttp.ClientConnectorError(connection_key, OSError("refused")))
+    assert not is_transient_error(aiohttp.ClientSSLError(connection_key, OSError("bad cert")))
+    assert not is_transient_error(aiohttp.InvalidURL("nope"))
+    assert not is_transient_error(ValueError("boom"))
@@ -1,4 +1,10 @@
+import asyncio
+import json
+import os
+import shutil
+import subprocess
 import sys
+import threading
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -6,7 +12,21 @@ import mcp.types as types
 import pathspec  # Import pathspec for mocking
 import pytest
 
-from mcp_server.server import _check_single_file, handle_call_tool, handle_list_tools
+from mcp_server.server import (
+    _ANCHOR_PROPERTY,
+    _DIAGNOSTIC_PROPERTIES,
+    _TIME_BUDGET_PROPERTY,
+    _check_changed_file,
+    _check_single_file,
+    _git_markdown_files,
+    _iter_markdown_files,
+    _iter_project_files,
+    handle_call_tool,
+    handle_list_tools,
+)
+from mcp_server.tools.changed_lines import ChangedLines
+from mcp_server.tools.metrics import METRICS
+from mcp_server.tools.status_cache import STATUS_CACHE
 
 # Ensure src directory is in path for imports if running tests directly
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
@@ -22,21 +42,24 @@ async def test_handle_list_tools_returns_correct_tool():
     """Verify that handle_list_tools returns the expected tool definitions."""
     tools = await handle_list_tools()
     assert isinstance(tools, list)
-    # Expect 4 tools now
-    assert len(tools) == 4
+    # Expect 6 tools now
+    assert len(tools) == 6
 
     # Verify Tool 1: check_markdown_link_file
     tool1 = tools[0]
     assert isinstance(tool1, types.Tool)
     assert tool1.name == "check_markdown_link_file"
-    assert tool1.description == "Checks HTTP/HTTPS links in a single Markdown file."
+    assert tool1.description == "Checks the links (URLs, relative paths and #anchors) in a single Markdown file."
     assert tool1.inputSchema == {
         "type": "object",
         "properties": {
             "file_path": {
                 "type": "string",
                 "description": "Path to the single Markdown file."
-            }
+            },
+            **_TIME_BUDGET_PROPERTY,
+            **_ANCHOR_PROPERTY,
+            **_DIAGNOSTIC_PROPERTIES,
         },
         "required": ["file_path"],
     }
@@ -45,7 +68,7 @@ async def test_handle_list_tools_returns_correct_tool():
     tool2 = tools[1]
     assert isinstance(tool2, types.Tool)
     assert tool2.name == "check_markdown_link_files"
-    assert tool2.description == "Checks HTTP/HTTPS links in a list of Markdown files."
+    assert tool2.description == "Checks the links (URLs, relative paths and #anchors) in a list of Markdown files."
     assert tool2.inputSchema == {
         "type": "object",
         "properties": {
@@ -53,7 +76,10 @@ async def test_handle_list_tools_returns_correct_tool():
                 "type": "array",
                 "items": {"type": "string"},
                 "description": "List of paths to specific Markdown files."
-            }
+            },
+            **_TIME_BUDGET_PROPERTY,
+            **_ANCHOR_PROPERTY,
+            **_DIAGNOSTIC_PROPERTIES,
         },
         "required": ["file_paths"],
     }
@@ -62,14 +88,17 @@ async def test_handle_list_tools_returns_correct_tool():
     tool3 = tools[2]
     assert isinstance(tool3, types.Tool)
     assert tool3.name == "check_markdown_link_directory"
-    assert tool3.description == "Checks HTTP/HTTPS links in all *.md files within a directory (recursively)."
+    assert tool3.description == "Checks the links (URLs, relative paths and #anchors) in all *.md files within a directory (recursively)."
     assert tool3.inputSchema == {
         "type": "object",
         "properties": {
             "directory_path": {
                 "type": "string",
                 "description": "Path to the directory to scan."
-            }
+            },
+            **_TIME_BUDGET_PROPERTY,
+            **_ANCHOR_PROPERTY,
+            **_DIAGNOSTIC_PROPERTIES,
         },
         "required": ["directory_path"],
     }
@@ -78,13 +107,31 @@ async def test_handle_list_tools_returns_correct_tool():
     tool4 = tools[3]
     assert isinstance(tool4, types.Tool)
     assert tool4.name == "check_markdown_links_project"
-    assert tool4.description == "Checks HTTP/HTTPS links in all project *.md files, respecting .gitignore."
+    assert tool4.description == "Checks the links (URLs, relative paths and #anchors) in all project *.md files, respecting .gitignore."
     assert tool4.inputSchema == {
         "type": "object",
-        "properties": {},
+        "properties": {**_TIME_BUDGET_PROPERTY, **_ANCHOR_PROPERTY, **_DIAGNOSTIC_PROPERTIES},
         # No arguments required
     }
 
+    # Diagnostics are optional booleans on every link checking tool
+    assert set(_DIAGNOSTIC_PROPERTIES) == {"include_timing", "profile", "trace"}
+    assert all(p["type"] == "boolean" for p in _DIAGNOSTIC_PROPERTIES.values())
+
+    # Verify Tool 5: check_markdown_links_changed
+    tool5 = tools[4]
+    assert isinstance(tool5, types.Tool)
+    assert tool5.name == "check_markdown_links_changed"
+    assert tool5.inputSchema["properties"]["base_ref"]["type"] == "string"
+    assert "required" not in tool5.inputSchema
+
+    # Verify Tool 6: get_link_checker_stats
+    tool6 = tools[5]
+    assert isinstance(tool6, types.Tool)
+    assert tool6.name == "get_link_checker_stats"
+    assert tool6.inputSchema["properties"]["format"]["enum"] == ["json", "prometheus"]
+    assert "required" not in tool6.inputSchema
+
 
 # --- Tests for handle_call_tool ---
 
@@ -94,6 +141,48 @@ async def test_handle_call_tool_unknown_tool_raises_error():
         await handle_call_tool(name="unknown-tool-name", arguments={})
 
 
+# --- Tests for get_link_checker_stats ---
+
+async def test_handle_call_tool_stats_json():
+    """Test the stats tool returns the metrics snapshot as JSON."""
+    METRICS.inc("cache_hits", 4)
+
+    result = await handle_call_tool(name="get_link_checker_stats", arguments={})
+
+    stats = json.loads(result[0].text)
+    assert stats["counters"]["cache_hits"] == 4
+    assert "cache_entries" in stats["gauges"]
+
+
+async def test_handle_call_tool_stats_before_any_check():
+    """Test a fresh server reports the gauges before the link checker has been used."""
+    code = ("import asyncio, json; from mcp_server.server import handle_call_tool; "
+            "result = asyncio.run(handle_call_tool('get_link_checker_stats', {})); "
+            "print(json.dumps(sorted(json.loads(result[0].text)['gauges'])))")
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).parents[1] / "src")}
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                               env=env, check=True, timeout=60)
+
+    gauges = json.loads(completed.stdout.splitlines()[-1])
+    assert {"cache_entries", "circuits_open", "dns_cache_entries"} <= set(gauges)
+
+
+async def test_handle_call_tool_stats_prometheus():
+    """Test the stats tool can render Prometheus text."""
+    METRICS.inc("urls_checked", 2)
+
+    result = await handle_call_tool(
+        name="get_link_checker_stats", arguments={"format": "prometheus"})
+
+    assert "mcp_link_checker_urls_checked_total 2" in result[0].text
+
+
+async def test_handle_call_tool_stats_invalid_format():
+    """Test an unsupported stats format raises ValueError."""
+    with pytest.raises(ValueError, match="Invalid format: xml"):
+        await handle_call_tool(name="get_link_checker_stats", arguments={"format": "xml"})
+
+
 # Helper to create an async mock for aiofiles.open
 # Note: This helper might need adjustments if tests require different mock behaviors per call
 def async_mock_open(read_data):
@@ -136,7 +225,7 @@ async def test_handle_call_tool_file_success(mock_check_links, mock_aio_open):
     # Assert
     mock_aio_open.assert_called_once_with(
         str(absolute_path.resolve()), encoding='utf-8')
-    mock_check_links.assert_called_once_with(mock_content)
+    mock_check_links.assert_called_once_with(mock_content, source=absolute_path.resolve())
     assert isinstance(result, list)
     assert len(result) == 1
     assert isinstance(result[0], types.TextContent)
@@ -267,7 +356,7 @@ async def test_handle_call_tool_files_success(mock_check_links, mock_aio_open):
     mock_aio_open.side_effect = open_side_effect
 
     # Mock check_links_in_content based on content
-    def check_links_side_effect(content):
+    def check_links_side_effect(content, source=None):
         if content == content1:
             return results1
         elif content == content2:
@@ -287,8 +376,8 @@ async def test_handle_call_tool_files_success(mock_check_links, mock_aio_open):
     mock_aio_open.assert_any_call(str(abs_path1.resolve()), encoding='utf-8')
     mock_aio_open.assert_any_call(str(abs_path2.resolve()), encoding='utf-8')
     assert mock_check_links.call_count == 2
-    mock_check_links.assert_any_call(content1)
-    mock_check_links.assert_any_call(content2)
+    mock_check_links.assert_any_call(content1, source=abs_path1.resolve())
+    mock_check_links.assert_any_call(content2, source=abs_path2.resolve())
 
     assert isinstance(result, list)
     assert len(result) == 1
@@ -379,7 +468,7 @@ async def test_handle_call_tool_directory_success(mock_exists, mock_is_dir, mock
     mock_aio_open.side_effect = open_side_effect
 
     # Mock check_links_in_content based on content
-    def check_links_side_effect(content):
+    def check_links_side_effect(content, source=None):
         if content == file1_content:
             return results1
         elif content == file2_content:
@@ -409,8 +498,8 @@ async def test_handle_call_tool_directory_success(mock_exists, mock_is_dir, mock
     mock_aio_open.assert_any_call(str(abs_mock_path2), encoding='utf-8')
 
     assert mock_check_links.call_count == 2
-    mock_check_links.assert_any_call(file1_content)
-    mock_check_links.assert_any_call(file2_content)
+    mock_check_links.assert_any_call(file1_content, source=mock_returned_path1)
+    mock_check_links.assert_any_call(file2_content, source=mock_returned_path2)
 
     assert isinstance(result, list)
     assert len(result) == 1
@@ -496,6 +585,7 @@ async def test_handle_call_tool_directory_empty(mock_exists, mock_is_dir, mock_r
 @patch('pathlib.Path.rglob')
 @patch('pathlib.Path.is_file', autospec=True)
 @patch('mcp_server.server._check_single_file', new_callable=AsyncMock)
+@patch('mcp_server.server._git_markdown_files', new=lambda *args: None)  # Not a git checkout
 async def test_handle_call_tool_project_with_ignore_pathspec(
     mock_check_single, mock_is_file, mock_rglob, mock_builtin_open, mock_from_lines
 ):
@@ -560,7 +650,7 @@ async def test_handle_call_tool_project_with_ignore_pathspec(
 
     # Assert open was called for .gitignore
     mock_builtin_open.assert_called_once_with(
-        gitignore_path, 'r', encoding='utf-8')
+        gitignore_path, encoding='utf-8')
     mock_from_lines.assert_called_once_with(
         pathspec.patterns.GitWildMatchPattern, gitignore_content.splitlines()
     )
@@ -593,6 +683,7 @@ async def test_handle_call_tool_project_with_ignore_pathspec(
 @patch('pathlib.Path.rglob', return_value=[])  # Mock rglob to find nothing
 # Assume .gitignore exists check (though not used)
 @patch('pathlib.Path.is_file', return_value=True)
+@patch('mcp_server.server._git_markdown_files', new=lambda *args: None)  # Not a git checkout
 async def test_handle_call_tool_project_no_md_files_found(
     mock_path_is_file, mock_rglob
 ):
@@ -661,6 +752,7 @@ async def test_handle_call_tool_directory_target_does_not_exist(mock_exists):
 @patch("pathlib.Path.rglob")  # Mock rglob method
 # Mock is_file method WITH AUTOSPEC
 @patch("pathlib.Path.is_file", autospec=True)
+@patch('mcp_server.server._git_markdown_files', new=lambda *args: None)  # Not a git checkout
 async def test_handle_call_tool_project_no_gitignore(
     mock_is_file,
     mock_rglob,
@@ -831,7 +923,7 @@ async def test_handle_call_tool_project_gitignore_parse_error_pathspec(
     # Verify gitignore check happened (implicitly via side_effect)
     # Assert builtins.open was called for .gitignore
     mock_builtin_open.assert_called_once_with(
-        gitignore_path, 'r', encoding='utf-8')
+        gitignore_path, encoding='utf-8')
     # Assert from_lines was called (and raised error)
     mock_pathspec_from_lines.assert_called_once()
 
@@ -890,7 +982,7 @@ async def test__check_single_file_success(mock_check_links, mock_aio_open):
     result = await _check_single_file(mock_path)
 
     mock_aio_open.assert_called_once_with(mock_path, encoding='utf-8')
-    mock_check_links.assert_called_once_with(read_data)
+    mock_check_links.assert_called_once_with(read_data, source=mock_path)
     assert result == expected_results
 
 
@@ -921,5 +1013,365 @@ async def test__check_single_file_returns_error_results(mock_check_links, mock_a
     result = await _check_single_file(mock_path)
 
     mock_aio_open.assert_called_once_with(mock_path, encoding='utf-8')
-    mock_check_links.assert_called_once_with(read_data)
+    mock_check_links.assert_called_once_with(read_data, source=mock_path)
     assert result == error_results
+
+
+# --- Tests for bounded project scan concurrency ---
+
+@pytest.mark.anyio
+async def test_handle_call_tool_project_limits_concurrency_and_keeps_order():
+    """Test a project scan never exceeds MAX_CONCURRENT_FILES and reports files in discovery order."""
+    files = [Path(f"/fake/file{i}.md") for i in range(7)]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def check_single_side_effect(file_path_arg):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01 * (7 - int(file_path_arg.stem[4:])))  # Later files finish first
+        in_flight -= 1
+        return {"total": 0, "valid": [], "broken": [], "errors": []}
+
+    with patch("mcp_server.server.PROJECT_ROOT", Path("/fake")), \
+            patch("mcp_server.server._iter_project_files", lambda root, cancelled=None: iter(files)), \
+            patch("mcp_server.server.MAX_CONCURRENT_FILES", 3), \
+            patch("mcp_server.server._check_single_file", side_effect=check_single_side_effect):
+        result = await handle_call_tool(name="check_markdown_links_project", arguments={})
+
+    assert max_in_flight == 3
+    report = result[0].text
+    positions = [report.index(f"- file{i}.md") for i in range(7)]
+    assert positions == sorted(positions)
+
+
+# --- Tests for per-call diagnostics ---
+
+@pytest.mark.anyio
+@patch('aiofiles.open')
+@patch('mcp_server.server.check_links_in_content')
+async def test_handle_call_tool_include_timing_appends_breakdown(mock_check_links, mock_aio_open):
+    """Test include_timing appends a stage breakdown after the report."""
+    mock_aio_open.return_value.__aenter__.return_value.read.return_value = "no links"
+    mock_check_links.return_value = {'total': 0, 'valid': [], 'broken': [], 'errors': []}
+
+    result = await handle_call_tool(
+        name="check_markdown_link_file",
+        arguments={"file_path": "dummy/timed.md", "include_timing": True}
+    )
+
+    assert len(result) == 2
+    assert "Link Check Report for: dummy/timed.md" in result[0].text
+    timing_text = result[1].text
+    assert "Timing Breakdown" in timing_text
+    assert "- read:" in timing_text
+    assert "- format:" in timing_text
+
+
+@pytest.mark.anyio
+@patch('aiofiles.open')
+@patch('mcp_server.server.check_links_in_content')
+async def test_handle_call_tool_profile_writes_file(mock_check_links, mock_aio_open, tmp_path):
+    """Test the profile flag dumps cProfile stats and reports the file path."""
+    mock_aio_open.return_value.__aenter__.return_value.read.return_value = "no links"
+    mock_check_links.return_value = {'total': 0, 'valid': [], 'broken': [], 'errors': []}
+
+    with patch("mcp_server.tools.profiling.PROFILE_DIR", tmp_path):
+        result = await handle_call_tool(
+            name="check_markdown_link_file",
+            arguments={"file_path": "dummy/profiled.md", "profile": True}
+        )
+
+    assert len(result) == 2
+    profiles = list(tmp_path.glob("check_markdown_link_file-*.prof"))
+    assert len(profiles) == 1
+    assert result[1].text == f"Profile written to: {profiles[0]}"
+
+
+@pytest.mark.anyio
+@patch('aiofiles.open')
+@patch('mcp_server.server.check_links_in_content')
+async def test_handle_call_tool_trace_writes_chrome_trace(mock_check_links, mock_aio_open, tmp_path):
+    """Test the trace flag writes a Chrome trace containing the read and format spans."""
+    mock_aio_open.return_value.__aenter__.return_value.read.return_value = "no links"
+    mock_check_links.return_value = {'total': 0, 'valid': [], 'broken': [], 'errors': []}
+
+    with patch("mcp_server.tools.tracing.TRACE_DIR", tmp_path):
+        result = await handle_call_tool(
+            name="check_markdown_link_file",
+            arguments={"file_path": "dummy/traced.md", "trace": True}
+        )
+
+    traces = list(tmp_path.glob("check_markdown_link_file-*.json"))
+    assert len(traces) == 1
+    assert result[1].text == f"Trace written to: {traces[0]}"
+    events = json.loads(traces[0].read_text())["traceEvents"]
+    span_names = {e["name"] for e in events if e["ph"] == "X"}
+    assert {"read", "format"} <= span_names
+
+
+# --- Tests for time budgets ---
+
+@pytest.mark.anyio
+@patch('aiofiles.open')
+@patch('mcp_server.server.check_links_in_content')
+async def test_handle_call_tool_time_budget_returns_partial_report(mock_check_links, mock_aio_open):
+    """Test files not started before the budget runs out are reported as not checked."""
+    mock_aio_open.return_value.__aenter__.return_value.read.return_value = "content"
+
+    async def slow_check(content, source=None):
+        await asyncio.sleep(0.1)
+        return {'total': 1, 'valid': ["http://a.com"], 'broken': [], 'errors': []}
+
+    mock_check_links.side_effect = slow_check
+
+    # One file at a time, so b.md and c.md are still queued when the budget runs out
+    with patch("mcp_server.server.MAX_CONCURRENT_FILES", 1):
+        result = await handle_call_tool(
+            name="check_markdown_link_files",
+            arguments={"file_paths": ["a.md", "b.md", "c.md"], "time_budget_seconds": 0.05}
+        )
+
+    assert mock_check_links.call_count == 1
+    report = result[0].text
+    assert "Files with Errors (2):" in report
+    assert "b.md (Reason: not checked (budget))" in report
+    assert "Valid Links: 1" in report
+    assert result[1].text == (
+        "Time budget of 0.05s exhausted: results are partial. "
+        "0 URLs and 2 files were not checked (budget).")
+
+
+@pytest.mark.anyio
+async def test_handle_call_tool_project_stops_at_deadline():
+    """Test queued project files are skipped once the call's deadline has passed."""
+    files = [Path(f"/fake/file{i}.md") for i in range(4)]
+
+    async def check_single_side_effect(file_path_arg):
+        await asyncio.sleep(0.05)
+        return {"total": 0, "valid": [], "broken": [], "errors": []}
+
+    with patch("mcp_server.server.PROJECT_ROOT", Path("/fake")), \
+            patch("mcp_server.server._iter_project_files", lambda root, cancelled=None: iter(files)), \
+            patch("mcp_server.server.MAX_CONCURRENT_FILES", 1), \
+            patch("mcp_server.server._check_single_file", side_effect=check_single_side_effect):
+        result = await handle_call_tool(
+            name="check_markdown_links_project", arguments={"time_budget_seconds": 0.01})
+
+    report = result[0].text
+    assert "Files with Errors (3):" in report
+    assert "file1.md (Reason: not checked (budget))" in report
+    assert result[1].text.endswith("0 URLs and 3 files were not checked (budget).")
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("budget", [0, -1, "10", True])
+async def test_handle_call_tool_rejects_invalid_time_budget(budget):
+    with pytest.raises(ValueError, match="time_budget_seconds"):
+        await handle_call_tool(
+            name="check_markdown_link_file",
+            arguments={"file_path": "dummy.md", "time_budget_seconds": budget}
+        )
+
+
+# --- Tests for client cancellation ---
+
+@pytest.mark.anyio
+@patch('aiofiles.open')
+@patch('mcp_server.tools.link_checker._check_link_status')
+async def test_handle_call_tool_cancellation_stops_checks_and_keeps_cache(mock_check_status, mock_aio_open):
+    """Test cancelling a call cancels in-flight URL checks but keeps finished results cached."""
+    mock_aio_open.return_value.__aenter__.return_value.read.return_value = (
+        "http://fast.com http://hangs.com")
+    hanging = asyncio.Event()
+    cancelled_checks = []
+
+    async def check(session, url):
+        if url == "http://fast.com":
+            return ("OK", None)
+        hanging.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled_checks.append(url)
+            raise
+
+    mock_check_status.side_effect = check
+
+    task = asyncio.create_task(handle_call_tool(
+        name="check_markdown_link_file", arguments={"file_path": "dummy/cancel.md"}))
+    await hanging.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)  # Let the cancelled checks unwind
+
+    assert cancelled_checks == ["http://hangs.com"]
+    assert STATUS_CACHE.get("http://fast.com") == ("OK", None)
+    assert STATUS_CACHE.get("http://hangs.com") is None
+    assert METRICS.snapshot()["counters"]["calls_cancelled"] == 1
+
+
+@pytest.mark.anyio
+async def test__iter_markdown_files_stops_when_cancelled(tmp_path):
+    """Test the discovery walk returns early once its cancel flag is set."""
+    (tmp_path / "a.md").write_text("a")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.md").write_text("b")
+
+    assert sorted(p.name for p in _iter_markdown_files(tmp_path)) == ["a.md", "b.md"]
+
+    cancelled = threading.Event()
+    cancelled.set()
+    assert list(_iter_markdown_files(tmp_path, cancelled)) == []
+
+
+async def test_handle_call_tool_directory_reports_broken_relative_links(tmp_path):
+    """Test relative links between scanned files are checked offline and reported per file."""
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "a.md").write_text("# A\n\n[b](b.md#usage) [c](c.md)\n", encoding="utf-8")
+    (tmp_path / "docs" / "b.md").write_text("# B\n\n## Usage\n\n[a](a.md#missing)\n", encoding="utf-8")
+
+    with patch("mcp_server.server.PROJECT_ROOT", tmp_path):
+        result = await handle_call_tool(
+            name="check_markdown_link_directory", arguments={"directory_path": "docs"})
+
+    report = result[0].text
+    assert "File not found: c.md" in report
+    assert "Anchor '#missing' not found in a.md" in report
+    assert "    - b.md#usage\n" in report  # Listed as valid
+
+
+async def test_server_import_is_light_and_side_effect_free(tmp_path):
+    """Test importing the server neither loads the link checker's HTTP/parser stack nor logs."""
+    log_file = tmp_path / "startup.log"
+    code = ("import sys, mcp_server.server; "
+            "print(sorted(m for m in ('aiohttp', 'markdown_it', 'pathspec', 'aiofiles') if m in sys.modules))")
+    env = {**os.environ, "MCP_SERVER_LOG_FILE": str(log_file),
+           "PYTHONPATH": str(Path(__file__).parent.parent / "src")}
+    out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                         capture_output=True, text=True)
+
+    assert out.stdout.strip() == "[]"
+    assert not log_file.exists()
+
+
+async def test_calls_that_check_no_links_do_not_load_the_http_stack():
+    """Test only the link checking branches open the call's transports (and import aiohttp)."""
+    code = ("import asyncio, sys; from mcp_server.server import handle_call_tool\n"
+            "for name, arguments in (('unknown-tool', {}), ('check_markdown_link_file', {})):\n"
+            "    try:\n"
+            "        asyncio.run(handle_call_tool(name, arguments))\n"
+            "    except ValueError:\n"
+            "        pass\n"
+            "print('aiohttp' in sys.modules)")
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).parent.parent / "src")}
+    out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                         capture_output=True, text=True)
+
+    assert out.stdout.strip() == "False"
+
+
+def _git_checkout(root: Path) -> Path:
+    """A work tree with tracked, untracked, ignored (at two levels) and deleted Markdown files."""
+    for name, text in {
+        ".gitignore": "build/\n", "a.md": "a", "docs/b.md": "b", "docs/.gitignore": "private.md\n",
+        "docs/private.md": "p", "build/c.md": "c", "d.md": "d", "gone.md": "g", "notes.txt": "n",
+    }.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(text, encoding="utf-8")
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    subprocess.run(["git", "-C", str(root), "add", ".gitignore", "a.md", "docs/b.md", "docs/.gitignore",
+                    "gone.md"], check=True)
+    (root / "gone.md").unlink()
+    return root
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+async def test_project_discovery_uses_git_in_a_checkout(tmp_path):
+    """Test git lists tracked files (and untracked ones it does not ignore) with its own ignore rules."""
+    root = _git_checkout(tmp_path)
+
+    def names(paths):
+        return sorted(str(p.relative_to(root)) for p in paths)
+
+    assert names(_git_markdown_files(root, untracked=False)) == ["a.md", "docs/b.md"]
+    assert names(_git_markdown_files(root, untracked=True)) == ["a.md", "d.md", "docs/b.md"]
+    assert names(_iter_project_files(root)) == ["a.md", "d.md", "docs/b.md"]
+    assert METRICS.snapshot()["counters"]["discovery_git"] == 1
+
+    cancelled = threading.Event()
+    cancelled.set()
+    assert list(_iter_project_files(root, cancelled)) == []
+
+
+async def test_project_discovery_walks_the_tree_outside_git(tmp_path):
+    (tmp_path / ".gitignore").write_text("build/\n", encoding="utf-8")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "c.md").write_text("c", encoding="utf-8")
+    (tmp_path / "a.md").write_text("a", encoding="utf-8")
+
+    assert _git_markdown_files(tmp_path) is None
+    assert list(_iter_project_files(tmp_path)) == [tmp_path / "a.md"]
+    assert METRICS.snapshot()["counters"]["discovery_walk"] == 1
+
+
+# --- Tests for check_markdown_links_changed ---
+
+def _commit_all(root: Path, message: str):
+    subprocess.run(["git", "-C", str(root), "-c", "user.name=Test", "-c", "user.email=test@example.com",
+                    "commit", "-q", "-am", message], check=True)
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+async def test_changed_tool_checks_only_links_on_changed_lines(tmp_path):
+    """Test only URLs on lines changed since the base ref are checked, in changed files only."""
+    old_links = "\n".join(f"- [old {i}](https://example.com/old/{i})" for i in range(20))
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "guide.md").write_text(f"# Guide\n\n{old_links}\n", encoding="utf-8")
+    (tmp_path / "README.md").write_text("# Readme\n\n[home](https://example.com/home)\n", encoding="utf-8")
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "add", "."], check=True)
+    _commit_all(tmp_path, "docs")
+    (tmp_path / "docs" / "guide.md").write_text(
+        f"# Guide\n\n{old_links}\n- [new](https://example.com/new) and [broken](./missing.md)\n",
+        encoding="utf-8")
+
+    with patch("mcp_server.server.PROJECT_ROOT", tmp_path), \
+            patch("mcp_server.tools.link_checker._check_link_status", return_value=("OK", None)) as check:
+        result = await handle_call_tool("check_markdown_links_changed", {"base_ref": "HEAD"})
+
+    assert [c.args[1] for c in check.call_args_list] == ["https://example.com/new"]
+    report = result[0].text
+    assert "Lines Changed Since: HEAD" in report
+    assert "docs/guide.md" in report and "README.md" not in report
+    assert "Valid Links: 1" in report
+    assert "./missing.md" in report  # Relative links on changed lines are checked too
+    assert METRICS.snapshot()["counters"]["links_outside_changes"] == 20
+
+    _commit_all(tmp_path, "new link")
+    with patch("mcp_server.server.PROJECT_ROOT", tmp_path):
+        result = await handle_call_tool("check_markdown_links_changed", {})
+    assert result[0].text == "No Markdown files changed since HEAD."
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+async def test_changed_tool_rejects_unknown_refs(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    with patch("mcp_server.server.PROJECT_ROOT", tmp_path):
+        with pytest.raises(ValueError, match="Unknown git ref: origin/nope"):
+            await handle_call_tool("check_markdown_links_changed", {"base_ref": "origin/nope"})
+        with pytest.raises(ValueError, match="base_ref"):
+            await handle_call_tool("check_markdown_links_changed", {"base_ref": 3})
+
+
+async def test__check_changed_file_reports_missing_and_unreadable_files(tmp_path):
+    """Test a changed file that cannot be read becomes an error string, like the other tools."""
+    missing = tmp_path / "gone.md"
+    assert await _check_changed_file(missing, ChangedLines()) == f"File not found at {missing}"
+
+    latin1 = tmp_path / "latin1.md"
+    latin1.write_bytes(b"caf\xe9")
+    assert await _check_changed_file(latin1, ChangedLines([(0, 1)])) == (
+        f"Error during link check for {latin1}: UnicodeDecodeError")
@@ -0,0 +1,68 @@
+# tests/test_status_cache.py
+
+from unittest.mock import patch
+
+from mcp_server.tools.status_cache import (
+    ERROR_TTL_SECONDS,
+    OK_TTL_SECONDS,
+    LinkStatusCache,
+)
+
+
+def test_cache_returns_fresh_entries():
+    """Test a stored result is returned until it expires."""
+    cache = LinkStatusCache()
+    with patch("mcp_server.tools.status_cache.time.monotonic", return_value=100.0):
+        cache.set("https://a.com", "OK", None)
+    with patch("mcp_server.tools.status_cache.time.monotonic", return_value=100.0 + OK_TTL_SECONDS - 1):
+        assert cache.get("https://a.com") == ("OK", None)
+    with patch("mcp_server.tools.status_cache.time.monotonic", return_value=100.0 + OK_TTL_SECONDS):
+        assert cache.get("https://a.com") is None
+    assert len(cache) == 0  # Expired entries are dropped on access
+
+
+def test_cache_errors_expire_sooner_than_ok():
+    """Test ERROR results use the short TTL."""
+    cache = LinkStatusCache()
+    with patch("mcp_server.tools.status_cache.time.monotonic", return_value=0.0):
+        cache.set("https://err.com", "ERROR", "Timeout")
+    with patch("mcp_server.tools.status_cache.time.monotonic", return_value=float(ERROR_TTL_SECONDS)):
+        assert cache.get("https://err.com") is None
+
+
+def test_cache_evicts_least_recently_used():
+    """Test the cache stays within max_entries by evicting the LRU entry."""
+    cache = LinkStatusCache(max_entries=2)
+    cache.set("https://a.com", "OK", None)
+    cache.set("https://b.com", "OK", None)
+    cache.get("https://a.com")  # a is now most recently used
+    cache.set("https://c.com", "BROKEN", "404 Not Found")
+
+    assert cache.get("https://b.com") is None
+    assert cache.get("https://a.com") == ("OK", None)
+    assert cache.get("https://c.com") == ("BROKEN", "404 Not Found")
+
+
+def test_validators_outlive_results_and_build_conditional_headers():
+    """Test validators survive expiry of the result and turn into conditional headers."""
+    cache = LinkStatusCache()
+    with patch("mcp_server.tools.status_cache.time.monotonic", return_value=0.0):
+        cache.set("https://a.com", "OK", None)
+    cache.remember_validators("https://a.com", '"abc"', "Mon, 01 Jan 2024 00:00:00 GMT")
+    with patch("mcp_server.tools.status_cache.time.monotonic", return_value=float(OK_TTL_SECONDS)):
+        assert cache.get("https://a.com") is None
+    assert cache.conditional_headers("https://a.com") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    cache.remember_validators("https://a.com", None, None)  # New response without validators
+    assert cache.conditional_headers("https://a.com") == {}
+
+
+def test_validators_are_bounded():
+    """Test stored validators are LRU-evicted at max_entries."""
+    cache = LinkStatusCache(max_entries=1)
+    cache.remember_validators("https://a.com", '"a"', None)
+    cache.remember_validators("https://b.com", '"b"', None)
+    assert cache.conditional_headers("https://a.com") == {}
+    assert cache.validator_count() == 1
@@ -0,0 +1,124 @@
+# tests/test_streaming.py
+
+from unittest.mock import patch
+
+import pytest
+
+from mcp_server.tools.link_checker import check_links_in_content, check_links_in_file
+from mcp_server.tools.local_links import start_local_index, stop_local_index
+from mcp_server.tools.metrics import METRICS
+from mcp_server.tools.streaming import (
+    iter_markdown_chunks,
+    should_stream,
+    split_markdown,
+)
+
+FENCED = b"# Title\n\n```\ncode\n\nhttps://in-fence.com\n```\n\nAfter [x](https://a.com)\n"
+
+
+def _document(sections: int) -> str:
+    """Headings, links, fences with blank lines, list continuations and late reference definitions."""
+    parts = []
+    for i in range(sections):
+        parts.append(
+            f"## Section\n\nSee [docs](https://example.com/{i % 7}) and https://bare.example.com/{i}.\n\n"
+            f"```text\nhttps://not-a-link.example.com/{i}\n\n[nope](https://fenced.example.com)\n```\n\n"
+            f"- item [ref {i}][ref{i % 3}]\n\n  continued [guide](https://guide.example.com/{i})\n\n"
+        )
+    parts.append("".join(f"[ref{j}]: https://reference.example.com/{j}\n" for j in range(3)))
+    return "".join(parts)
+
+
+async def _status(session, url):
+    return ("BROKEN", "HTTP Status 404") if url.endswith("/3") else ("OK", None)
+
+
+@pytest.mark.parametrize("chunk_bytes", [8, 20, 4096])
+def test_split_markdown_cuts_only_outside_fences(chunk_bytes):
+    spans = list(split_markdown(FENCED, chunk_bytes))
+    assert spans[0][0] == 0 and spans[-1][1] == len(FENCED)
+    assert all(a[1] == b[0] for a, b in zip(spans, spans[1:]))
+    for start, end in spans:
+        assert FENCED[start:end].count(b"```") % 2 == 0
+
+
+def test_split_markdown_keeps_indented_continuations():
+    data = b"- item\n\n  continued\n\n    code\n\nNext\n"
+    assert list(split_markdown(data, 4)) == [(0, len(data) - 5), (len(data) - 5, len(data))]
+
+
+def test_should_stream_uses_the_size_threshold(tmp_path):
+    path = tmp_path / "big.md"
+    path.write_bytes(b"x" * 100)
+    with patch("mcp_server.tools.streaming.STREAM_THRESHOLD_BYTES", 100):
+        assert should_stream(path)
+        assert not should_stream(tmp_path / "missing.md")
+    assert not should_stream(path)
+
+
+@pytest.mark.asyncio
+async def test_streamed_file_matches_whole_content(tmp_path):
+    """Test chunked extraction finds the same links, results and anchors as one parse."""
+    text = _document(40)
+    path = tmp_path / "api.md"
+    path.write_text(text, encoding="utf-8")
+
+    with patch("mcp_server.tools.link_checker._check_link_status", side_effect=_status), \
+            patch("mcp_server.tools.streaming.STREAM_CHUNK_BYTES", 512):
+        assert len(list(iter_markdown_chunks(path))) > 10
+        whole_index, token = start_local_index(tmp_path)
+        try:
+            whole = await check_links_in_content(text, source=path)
+        finally:
+            stop_local_index(token)
+        streamed_index, token = start_local_index(tmp_path)
+        try:
+            streamed = await check_links_in_file(path, source=path)
+        finally:
+            stop_local_index(token)
+
+    assert streamed == whole
+    assert streamed["total"] == 7 + 40 + 40 + 3
+    assert {item["url"] for item in streamed["broken"]} == {
+        "https://example.com/3", "https://bare.example.com/3", "https://guide.example.com/3"}
+    assert streamed_index.anchors == whole_index.anchors
+    counters = METRICS.snapshot()["counters"]
+    assert counters["files_streamed"] == 1
+    assert counters["stream_chunks"] > 10
+
+
+def test_split_markdown_cuts_only_outside_html_blocks():
+    data = (b"<!-- a\n\nhttps://x.com\n\n-->\n\n<PRE class=x>\n\nNot\n\n</pre>\n\n"
+            b"<!-- one line -->\n\n" + b"End\n" * 10)
+    spans = list(split_markdown(data, 4))
+    assert [data[start:end].split(b"\n")[0] for start, end in spans] == [
+        b"<!-- a", b"<PRE class=x>", b"<!-- one line -->", b"End"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_file_with_html_blocks_matches_whole_content(tmp_path):
+    """Test links in multi-line comments and <pre> blocks are handled as in one parse."""
+    text = "".join(
+        f"# Part {i}\n\n<!--\nTODO: [hidden](https://hidden.example.com/{i})\n\n"
+        f"https://also-hidden.example.com/{i}\n-->\n\n"
+        f"<pre>\n\n[in pre](https://pre.example.com/{i})\n</pre>\n\n"
+        f"Shown [link](https://example.com/{i})\n\n" for i in range(20))
+    path = tmp_path / "html.md"
+    path.write_text(text, encoding="utf-8")
+
+    with patch("mcp_server.tools.link_checker._check_link_status", side_effect=_status), \
+            patch("mcp_server.tools.streaming.STREAM_CHUNK_BYTES", 64):
+        assert len(list(iter_markdown_chunks(path))) > 10
+        whole = await check_links_in_content(text, source=path)
+        streamed = await check_links_in_file(path, source=path)
+
+    assert streamed == whole
+    assert not any("hidden" in url for url in streamed["valid"])
+
+
+@pytest.mark.asyncio
+async def test_streamed_file_with_invalid_utf8_raises(tmp_path):
+    path = tmp_path / "bad.md"
+    path.write_bytes(b"[a](https://a.com)\n\n\xff\xfe\n")
+    with pytest.raises(UnicodeDecodeError):
+        await check_links_in_file(path)
@@ -0,0 +1,94 @@
+# tests/test_tracing.py
+
+import asyncio
+
+import pytest
+from aioresponses import aioresponses
+
+from mcp_server.tools.link_checker import check_links_in_content
+from mcp_server.tools.tracing import (
+    MAX_TRACE_EVENTS,
+    TraceRecorder,
+    aiohttp_trace_configs,
+    span,
+    start_tracing,
+    stop_tracing,
+)
+
+
+def test_span_is_noop_without_recorder():
+    """Test span() yields its args and records nothing when tracing is off."""
+    with span("parse", "stage", file="a.md") as args:
+        args["extra"] = 1
+    assert args == {"file": "a.md", "extra": 1}
+    assert aiohttp_trace_configs() is None
+
+
+def test_span_records_complete_event_with_mutable_args():
+    """Test spans become Chrome 'X' events carrying args set inside the block."""
+    recorder, token = start_tracing("unit")
+    try:
+        with span("check_url", "network", url="http://a.com") as args:
+            args["status"] = 200
+    finally:
+        stop_tracing(token)
+
+    (event,) = recorder.to_chrome_trace()["traceEvents"]
+    assert event["ph"] == "X"
+    assert event["name"] == "check_url"
+    assert event["cat"] == "network"
+    assert event["args"] == {"url": "http://a.com", "status": 200}
+    assert event["dur"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_spans_from_concurrent_tasks_get_separate_lanes():
+    """Test each asyncio task is assigned its own trace lane (tid) with a name."""
+    recorder, token = start_tracing("lanes")
+
+    async def work():
+        with span("unit_of_work"):
+            await asyncio.sleep(0)
+
+    try:
+        await asyncio.gather(asyncio.create_task(work(), name="w1"),
+                             asyncio.create_task(work(), name="w2"))
+    finally:
+        stop_tracing(token)
+
+    events = recorder.to_chrome_trace()["traceEvents"]
+    lanes = {e["tid"] for e in events if e["ph"] == "X"}
+    names = {e["args"]["name"] for e in events if e["ph"] == "M"}
+    assert len(lanes) == 2
+    assert {"w1", "w2"} <= names
+
+
+def test_recorder_caps_event_count(monkeypatch):
+    """Test events beyond MAX_TRACE_EVENTS are dropped and counted."""
+    monkeypatch.setattr("mcp_server.tools.tracing.MAX_TRACE_EVENTS", 2)
+    recorder = TraceRecorder("cap")
+    for _ in range(3):
+        recorder.add_span("s", "c", 0.0, 0.0, {})
+    trace = recorder.to_chrome_trace()
+    assert len(trace["traceEvents"]) == 2
+    assert trace["otherData"]["dropped_events"] == 1
+    assert MAX_TRACE_EVENTS > 2
+
+
+@pytest.mark.asyncio
+async def test_check_links_in_content_records_cache_and_url_spans():
+    """Test a traced check records cache lookup and per-hop URL spans."""
+    recorder, token = start_tracing("content")
+    try:
+        with aioresponses() as m:
+            m.head("http://trace-start.com", status=302, headers={"Location": "http://trace-end.com"})
+            m.head("http://trace-end.com", status=200)
+            await check_links_in_content("http://trace-start.com")
+    finally:
+        stop_tracing(token)
+
+    events = [e for e in recorder.to_chrome_trace()["traceEvents"] if e["ph"] == "X"]
+    url_spans = [e for e in events if e["name"] == "check_url"]
+    assert [(e["args"]["hop"], e["args"]["status"]) for e in url_spans] == [(1, 200), (0, 302)]
+    cache_span = next(e for e in events if e["name"] == "cache_lookup")
+    assert cache_span["args"] == {"links": 1, "hits": 0}
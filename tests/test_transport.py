@@ -0,0 +1,122 @@
+# tests/test_transport.py
+
+import asyncio
+from unittest.mock import patch
+
+import aiohttp
+import httpx
+import pytest
+from aioresponses import aioresponses
+
+from mcp_server.tools.adaptive_timeouts import TimeoutBudget
+from mcp_server.tools.link_checker import _check_link_status
+from mcp_server.tools.transport import (
+    AiohttpTransport,
+    Http2Transport,
+    Transport,
+    as_transport,
+    call_transports,
+    open_transport,
+)
+
+BUDGET = TimeoutBudget(connect=1.0, first_byte=1.0, total=2.0, learned=False)
+
+
+def _http2_transport(handler) -> Http2Transport:
+    return Http2Transport(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_transport_returns_status_without_following_redirects():
+    with aioresponses() as m:
+        m.head("http://example.com/old", status=301, headers={"Location": "/new"})
+        async with aiohttp.ClientSession() as session:
+            response = await AiohttpTransport(session).head(
+                "http://example.com/old", budget=BUDGET, headers={}, timings={})
+    assert response.status == 301
+    assert response.headers["location"] == "/new"
+
+
+@pytest.mark.asyncio
+async def test_as_transport_wraps_sessions_and_passes_transports_through():
+    async with aiohttp.ClientSession() as session:
+        wrapped = as_transport(session)
+        assert isinstance(wrapped, AiohttpTransport)
+        assert wrapped.session is session
+        assert as_transport(wrapped) is wrapped
+
+
+@pytest.mark.asyncio
+async def test_http2_transport_ok_and_redirect_through_checker():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "HEAD"
+        seen.append(request.url.path)
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"Location": "/new"})
+        return httpx.Response(200)
+
+    transport = _http2_transport(handler)
+    try:
+        assert await _check_link_status(transport, "https://example.com/new") == ("OK", None)
+        assert await _check_link_status(transport, "https://example.com/old") == ("OK", None)
+    finally:
+        await transport.close()
+    assert seen == ["/new", "/old", "/new"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error, expected", [
+    (httpx.ConnectError("refused"), aiohttp.ClientConnectionError),
+    (httpx.ReadTimeout("slow"), asyncio.TimeoutError),
+    (httpx.RemoteProtocolError("reset"), aiohttp.ServerDisconnectedError),
+])
+async def test_http2_transport_maps_errors_to_aiohttp_types(error, expected):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise error
+
+    transport = _http2_transport(handler)
+    try:
+        with pytest.raises(expected):
+            await transport.head("https://example.com/", budget=BUDGET, headers={}, timings={})
+    finally:
+        await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_open_transport_falls_back_to_aiohttp_without_http2_extra():
+    with patch("mcp_server.tools.transport.http2_available", return_value=False), \
+            patch("mcp_server.tools.transport.logger") as logger:
+        async with open_transport("http2") as transport:
+            assert transport.name == "aiohttp"
+    logger.warning.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_open_transport_uses_http2_when_available():
+    async with open_transport("http2") as transport:
+        assert transport.name == "http2"
+
+
+@pytest.mark.asyncio
+async def test_call_transports_share_one_http2_client_across_batches():
+    """Test every batch of a call reuses one HTTP/2 client, closed when the call ends."""
+    async with call_transports():
+        async with open_transport("http2") as first, open_transport("http2") as second:
+            assert first is second
+        async with open_transport("http2") as later:
+            assert later is first
+            assert not later.client.is_closed  # Batches do not close the shared client
+        async with open_transport("aiohttp") as batch:
+            assert batch.name == "aiohttp"  # HTTP/1.1 sessions stay per batch
+    assert first.client.is_closed
+
+    async with open_transport("http2") as outside:
+        assert outside is not first
+    assert outside.client.is_closed
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        Transport()